@@ -26,6 +26,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     POW_BITS: int = 8
     ENABLE_MAINTENANCE_API: bool = False
+    # pickle | orjson | msgpack; pickle сохраняет time/date/bytes как есть,
+    # orjson и msgpack отдают их строками/байтами — только для JSON-совместимых значений
+    CACHE_SERIALIZER: str = "pickle"
+    # zlib | lz4 | zstd | none; lz4, zstd, orjson, msgpack — extra cache-codecs
+    CACHE_COMPRESSION: str = "zlib"
 
     model_config = SettingsConfigDict(
         env_file=".env",
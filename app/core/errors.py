@@ -122,6 +122,9 @@ class ErrorCode(Enum):
     # 4xxx — Внутренние ошибки / внешние сервисы
     REVIEW_SESSION_NOT_FOUND = ErrorInfo(3017, "Review-сессия не найдена", 404)
     REVIEW_ITEM_NOT_FOUND = ErrorInfo(3018, "Элемент review не найден", 404)
+    INVALID_CURSOR = ErrorInfo(3019, "Некорректный курсор пагинации", 400)
+    TOP_CURSOR_NEEDS_PARTITION = ErrorInfo(
+        3020, "Курсор топа работает только с заданными дисциплиной, дистанцией и полом", 400)
     SEND_EMAIL_EXCEPTION = ErrorInfo(
         4001, "Не удалось отправить электронное письмо", 500
     )
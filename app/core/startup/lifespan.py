@@ -6,6 +6,12 @@ from fastapi import FastAPI
 
 from app.jobs.manager import shutdown_scheduler, start_scheduler
 from app.jobs.init_postgres import init_postgres
+from app.repositories.autocomplete import ensure_autocomplete
+from app.repositories.athlete_index import (schedule_athlete_index_build,
+                                           stop_athlete_index)
+from app.shared.cache.codecs import default_codec
+from app.shared.cache.invalidation import (start_invalidation_listener,
+                                           stop_invalidation_listener)
 from app.shared.clients import session
 from app.shared.clients import redis, mongodb
 
@@ -16,12 +22,20 @@ _log = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     _log.info("Starting application lifespan...")
 
+    # неизвестный CACHE_SERIALIZER / CACHE_COMPRESSION — ошибка старта
+    _log.info("Cache codec: %r", default_codec())
+
     _log.info('Create db column...')
     await init_postgres()
 
     await redis.client.ping()
     app.state.redis = redis.client
     _log.info("Connected to Redis.")
+    start_invalidation_listener(redis.client)
+    await ensure_autocomplete(redis.client)
+
+    _log.debug("Building athlete name index...")
+    schedule_athlete_index_build()
 
     _log.debug("Creating aiohttp session...")
     session.session = aiohttp.ClientSession()
@@ -39,6 +53,8 @@ async def lifespan(app: FastAPI):
     _log.info("Shutting down application...")
 
     _log.debug("Closing Redis...")
+    await stop_invalidation_listener()
+    await stop_athlete_index()
     await redis.client.aclose()
 
     _log.debug("Closing MongoDB...")
@@ -4,6 +4,7 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
 
 from app.core.config import middleware_settings, settings
+from app.shared.utils.pagination import NEXT_CURSOR_HEADER
 
 
 def add_middleware(app: FastAPI, mode: str):
@@ -22,6 +23,7 @@ def add_middleware(app: FastAPI, mode: str):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     app.add_middleware(
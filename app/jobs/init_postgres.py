@@ -1,6 +1,14 @@
 from tortoise.transactions import in_transaction
 from tortoise.backends.base.client import BaseDBAsyncClient
 
+from app.repositories.sa.athlete_stats import build_insert_athlete_stats_query
+from app.repositories.sa.best_results import build_insert_best_results_query
+from app.repositories.sa.content_last_modified import (ATHLETE, COMPETITION,
+                                                       build_insert_last_modified_query)
+from app.repositories.sa.search_coach import COACH_SEARCH_VECTOR_SQL
+from app.repositories.sa.utils import compile_query_with_dollar_params
+from app.shared.utils.name_keys import name_search_key_function_sql
+
 
 async def ensure_resolved_time_column(conn: BaseDBAsyncClient):
     search_sql = """
@@ -48,6 +56,82 @@ async def ensure_indexes(conn: BaseDBAsyncClient):
         await conn.execute_script(sql)
 
 
+async def ensure_coach_search_vector(conn: BaseDBAsyncClient):
+    search_sql = """
+    SELECT 1
+    FROM information_schema.columns
+    WHERE table_name = 'coach' AND column_name = 'search_vector';
+    """
+    result = await conn.execute_query_dict(search_sql)
+    if not result:
+        await conn.execute_script(
+            "ALTER TABLE coach ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({COACH_SEARCH_VECTOR_SQL}) STORED;"
+        )
+    await conn.execute_script(
+        "CREATE INDEX IF NOT EXISTS idx_coach_search_vector ON coach USING gin (search_vector);"
+    )
+
+
+async def ensure_name_search_keys(conn: BaseDBAsyncClient):
+    await conn.execute_script(name_search_key_function_sql())
+
+    for column, source in (("last_name_key", "last_name"), ("first_name_key", "first_name")):
+        search_sql = f"""
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_name = 'athletes' AND column_name = '{column}';
+        """
+        result = await conn.execute_query_dict(search_sql)
+        if not result:
+            # COLLATE "C": префикс ищется диапазоном по обычному btree-индексу
+            await conn.execute_script(
+                f'ALTER TABLE athletes ADD COLUMN {column} text COLLATE "C" '
+                f"GENERATED ALWAYS AS (name_search_key({source})) STORED;"
+            )
+
+    indexes = [
+        "CREATE INDEX IF NOT EXISTS idx_athletes_name_keys ON athletes (last_name_key, first_name_key, birth_year);",
+        "CREATE INDEX IF NOT EXISTS idx_athletes_first_name_key ON athletes (first_name_key);",
+    ]
+    for sql in indexes:
+        await conn.execute_script(sql)
+
+
+async def ensure_best_results(conn: BaseDBAsyncClient):
+    search_sql = "SELECT EXISTS (SELECT 1 FROM best_results) AS filled;"
+    result = await conn.execute_query_dict(search_sql)
+    if result and result[0].get('filled'):
+        return
+
+    sql, params = compile_query_with_dollar_params(
+        build_insert_best_results_query())
+    await conn.execute_query(sql, params)
+
+
+async def ensure_athlete_stats(conn: BaseDBAsyncClient):
+    search_sql = "SELECT EXISTS (SELECT 1 FROM athlete_stats) AS filled;"
+    result = await conn.execute_query_dict(search_sql)
+    if result and result[0].get('filled'):
+        return
+
+    sql, params = compile_query_with_dollar_params(
+        build_insert_athlete_stats_query())
+    await conn.execute_query(sql, params)
+
+
+async def ensure_content_last_modified(conn: BaseDBAsyncClient):
+    search_sql = "SELECT EXISTS (SELECT 1 FROM content_last_modified) AS filled;"
+    result = await conn.execute_query_dict(search_sql)
+    if result and result[0].get('filled'):
+        return
+
+    for entity_type in (ATHLETE, COMPETITION):
+        sql, params = compile_query_with_dollar_params(
+            build_insert_last_modified_query(entity_type))
+        await conn.execute_query(sql, params)
+
+
 async def init_postgres():
     async with in_transaction() as conn:
         await ensure_resolved_time_column(conn)
@@ -55,3 +139,13 @@ async def init_postgres():
         await ensure_pg_trgm_extension(conn)
 
         await ensure_indexes(conn)
+
+        await ensure_coach_search_vector(conn)
+
+        await ensure_name_search_keys(conn)
+
+        await ensure_best_results(conn)
+
+        await ensure_athlete_stats(conn)
+
+        await ensure_content_last_modified(conn)
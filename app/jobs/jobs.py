@@ -1,14 +1,31 @@
 import logging
 from app.models.user.user import User
-from app.repositories.ratings import update_ratings
+from app.repositories.autocomplete import rebuild_all_autocomplete
+from app.repositories.performances import warm_queued_performances
+from app.repositories.ratings import (clear_ratings_dirty, update_ratings,
+                                     update_ratings_delta)
 from app.shared.clients.mongodb import db
+from app.shared.clients.redis import client
 
 logger = logging.getLogger(__name__)
 
 
 async def daily_task():
+    # полный пересчёт покрывает всё, что накопилось для инкрементального
+    await clear_ratings_dirty(client)
     await update_ratings(db['ranking'])
     logger.info("Daily ratings task completed")
+    # правки мимо on_*_changed (скрипты, ручной SQL) доезжают до подсказок здесь
+    await rebuild_all_autocomplete(client)
+
+
+async def ratings_delta_task():
+    await update_ratings_delta(db['ranking'], client)
+    logger.info("Ratings delta task completed")
+
+
+async def performances_warm_task():
+    await warm_queued_performances(client)
 
 
 async def delete_unverified_user(user_id: int):
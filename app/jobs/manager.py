@@ -3,7 +3,8 @@ import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from app.core.config import settings
-from app.jobs.jobs import daily_task, delete_unverified_user
+from app.jobs.jobs import (daily_task, delete_unverified_user, performances_warm_task,
+                           ratings_delta_task)
 
 _log = logging.getLogger(__name__)
 
@@ -13,6 +14,9 @@ jobstores = {
 
 scheduler = AsyncIOScheduler(jobstores=jobstores, timezone="Europe/Moscow")
 
+# job id -> run_date of the debounced job this process has already stored
+_pending_runs: dict[str, datetime] = {}
+
 
 def start_scheduler():
     """Start scheduler and add static jobs."""
@@ -46,3 +50,38 @@ def schedule_user_deletion(user_id: int, hours_delay: int | float = 24):
     )
     _log.debug("Scheduled deletion of user %s in %s hours",
                user_id, hours_delay)
+
+
+def _schedule_pending_once(func, job_id: str, seconds_delay: int | float) -> bool:
+    """Schedule a date job unless this process already has one pending.
+
+    The pending run is kept rather than moved later, so a steady stream of
+    calls can't postpone it, and repeated calls skip the synchronous jobstore write.
+    """
+    now = datetime.now()
+    pending = _pending_runs.get(job_id)
+    if pending is not None and pending > now:
+        return False
+
+    run_date = now + timedelta(seconds=seconds_delay)
+    scheduler.add_job(
+        func,
+        trigger="date",
+        run_date=run_date,
+        id=job_id,
+        replace_existing=True,
+    )
+    _pending_runs[job_id] = run_date
+    return True
+
+
+def schedule_ratings_refresh(seconds_delay: int | float = 30):
+    """Schedule incremental ratings refresh at most seconds_delay after the first pending change."""
+    if _schedule_pending_once(ratings_delta_task, "ratings_delta_task", seconds_delay):
+        _log.debug("Scheduled ratings refresh in %s seconds", seconds_delay)
+
+
+def schedule_performances_warmup(seconds_delay: int | float = 5):
+    """Schedule warming of queued athlete performances, pending run is not postponed."""
+    if _schedule_pending_once(performances_warm_task, "performances_warm_task", seconds_delay):
+        _log.debug("Scheduled performances warm-up in %s seconds", seconds_delay)
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "best_results" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "stroke" VARCHAR(50) NOT NULL,
+    "distance" INT NOT NULL,
+    "season" INT NOT NULL,
+    "course" VARCHAR(10),
+    "status" VARCHAR(100),
+    "resolved_time" TIMETZ NOT NULL,
+    "athlete_id" INT NOT NULL REFERENCES "athletes" ("id") ON DELETE CASCADE,
+    "result_id" INT NOT NULL REFERENCES "results" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_best_result_athlete_event" UNIQUE ("athlete_id", "stroke", "distance", "season", "course", "status")
+);
+CREATE INDEX IF NOT EXISTS "idx_best_result_stroke_distance_season" ON "best_results" ("stroke", "distance", "season");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "best_results";"""
@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "athlete_stats" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "competitions_count" INT NOT NULL DEFAULT 0,
+    "podiums_count" INT NOT NULL DEFAULT 0,
+    "results_count" INT NOT NULL DEFAULT 0,
+    "personal_bests_count" INT NOT NULL DEFAULT 0,
+    "last_competition_date" DATE,
+    "athlete_id" INT NOT NULL UNIQUE REFERENCES "athletes" ("id") ON DELETE CASCADE
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "athlete_stats";"""
@@ -0,0 +1,17 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "content_last_modified" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "entity_type" VARCHAR(16) NOT NULL,
+    "entity_id" INT NOT NULL,
+    "last_update" DATE NOT NULL,
+    CONSTRAINT "uid_content_last_modified_entity" UNIQUE ("entity_type", "entity_id")
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "content_last_modified";"""
@@ -1,13 +1,16 @@
 from app.models.tokens.sessions import Session
 from app.models.tokens.refresh_tokens import RefreshToken
 from .athlete.athlete import Athlete
+from .athlete.athlete_stats import AthleteStats
 from .athlete.record import Record
 from .athlete.top_athlete import TopAthlete
 from .base import TimestampedModel
+from .competition.best_result import BestResult
 from .competition.competition import Competition
 from .competition.distance import Distance
 from .competition.recent_event import RecentEvent
 from .competition.result import Result
+from .misc.content_last_modified import ContentLastModified
 from .misc.region import Region
 from .misc.standard_category import StandardCategory
 from .misc.bot import Bot
@@ -0,0 +1,18 @@
+from tortoise import fields
+from tortoise.models import Model
+
+from app.models.athlete.athlete import Athlete
+
+
+class AthleteStats(Model):
+    id = fields.IntField(primary_key=True)
+    athlete: Athlete = fields.OneToOneField(
+        "models.Athlete", related_name="stats", on_delete=fields.CASCADE)
+    competitions_count = fields.IntField(default=0)
+    podiums_count = fields.IntField(default=0)
+    results_count = fields.IntField(default=0)
+    personal_bests_count = fields.IntField(default=0)
+    last_competition_date = fields.DateField(null=True)
+
+    class Meta:
+        table = "athlete_stats"
@@ -0,0 +1,27 @@
+from tortoise import fields
+from tortoise.models import Model
+
+from app.models.athlete.athlete import Athlete
+from app.models.competition.result import Result
+from app.shared.utils.flexible_time import FlexibleTimeField
+
+
+class BestResult(Model):
+    id = fields.IntField(primary_key=True)
+    athlete: Athlete = fields.ForeignKeyField(
+        "models.Athlete", related_name="best_results", on_delete=fields.CASCADE)
+    result: Result = fields.ForeignKeyField(
+        "models.Result", related_name="best_mentions", on_delete=fields.CASCADE)
+    stroke = fields.CharField(max_length=50)
+    distance = fields.IntField()
+    season = fields.IntField()
+    course = fields.CharField(max_length=10, null=True)
+    status = fields.CharField(max_length=100, null=True)
+    resolved_time = FlexibleTimeField(max_length=20)
+
+    class Meta:
+        table = "best_results"
+        unique_together = (
+            ("athlete_id", "stroke", "distance", "season", "course", "status"),
+        )
+        indexes = (("stroke", "distance", "season"),)
@@ -0,0 +1,14 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class ContentLastModified(Model):
+    """Дата последнего изменения страницы спортсмена или соревнования (с учётом результатов)."""
+    id = fields.IntField(primary_key=True)
+    entity_type = fields.CharField(max_length=16)
+    entity_id = fields.IntField()
+    last_update = fields.DateField()
+
+    class Meta:
+        table = "content_last_modified"
+        unique_together = (("entity_type", "entity_id"),)
@@ -10,3 +10,6 @@ class Coach(TimestampedModel):
     middle_name = fields.CharField(max_length=100)
     club = fields.CharField(max_length=255)
     city = fields.CharField(max_length=255, null=True)
+
+    class Meta:
+        table = "coach"
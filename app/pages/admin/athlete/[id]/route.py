@@ -5,6 +5,8 @@ from app.core.errors import APIError, ErrorCode
 
 from app.models.athlete.athlete import Athlete
 from app.schemas.athlete.athlete import Athlete_Pydantic, AthleteIn_Pydantic
+from app.services.data_changes import (athlete_profile, collect_athlete_removal,
+                                       on_athletes_changed, on_results_changed)
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -20,8 +22,10 @@ async def update_athlete(id: int, athlete: AthleteIn_Pydantic):
     if not db_athlete:
         raise APIError(ErrorCode.ATHLETE_NOT_FOUND)
 
+    previous = athlete_profile(db_athlete)
     db_athlete.update_from_dict(athlete.model_dump())
     await db_athlete.save()
+    await on_athletes_changed([id], {id: previous})
 
     return db_athlete
 
@@ -35,4 +39,6 @@ async def delete_athlete(id: int):
     db_athlete = await Athlete.get_or_none(id=id)
     if not db_athlete:
         raise APIError(ErrorCode.ATHLETE_NOT_FOUND)
+    changes = await collect_athlete_removal([id])
     await db_athlete.delete()
+    await on_results_changed(changes)
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 
-from app.models.athlete.athlete import Athlete
 from app.schemas.athlete.review import (
     BulkAthleteCreateRequest,
     BulkAthleteCreateResponse,
     BulkAthleteCreateResultItem,
 )
+from app.services.athlete_bulk import create_athletes
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -17,21 +17,7 @@ router = APIRouter()
 )
 @require_scope("athlete:create")
 async def bulk_create_athletes(payload: BulkAthleteCreateRequest):
-    created_models = [
-        Athlete(
-            last_name=item.last_name,
-            first_name=item.first_name,
-            birth_year=str(item.birth_year),
-            gender=item.gender.upper(),
-            city=item.city,
-            club=item.club,
-            license=item.license,
-        )
-        for item in payload.items
-    ]
-
-    if created_models:
-        await Athlete.bulk_create(created_models)
+    created_models = await create_athletes(payload.items)
 
     response_items = [
         BulkAthleteCreateResultItem(
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Request
+
+from app.schemas.athlete.review import BulkAthleteCreateItem
+from app.services.athlete_bulk import create_athletes
+from app.shared.utils.ndjson import (NDJSON_OPENAPI_BODY, Batch, NDJSONResponse,
+                                     require_ndjson, stream_ingest)
+from app.shared.utils.scopes.request import require_scope
+
+router = APIRouter()
+
+
+@router.post("/", response_class=NDJSONResponse, openapi_extra=NDJSON_OPENAPI_BODY)
+@require_scope("athlete:create")
+async def stream_bulk_create_athletes(request: Request):
+    """Строки BulkAthleteCreateItem в NDJSON; в ответе id созданных по номерам строк."""
+    require_ndjson(request)
+
+    async def handle_batch(rows: Batch[BulkAthleteCreateItem]) -> dict:
+        created = await create_athletes([item for _, item in rows])
+        return {
+            "created": [
+                {"line": line_no, "external_id": item.external_id, "id": athlete.id}
+                for (line_no, item), athlete in zip(rows, created)
+            ],
+        }
+
+    return NDJSONResponse(stream_ingest(request, BulkAthleteCreateItem, handle_batch))
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Request
+
+from app.schemas.athlete.review import BulkAthleteUpdateItem
+from app.services.athlete_bulk import update_athletes
+from app.shared.utils.ndjson import (NDJSON_OPENAPI_BODY, Batch, NDJSONResponse,
+                                     require_ndjson, stream_ingest)
+from app.shared.utils.scopes.request import require_scope
+
+router = APIRouter()
+
+
+@router.post("/", response_class=NDJSONResponse, openapi_extra=NDJSON_OPENAPI_BODY)
+@require_scope("athlete:write")
+async def stream_bulk_update_athletes(request: Request):
+    """Строки BulkAthleteUpdateItem в NDJSON; пачка с неизвестным id не применяется."""
+    require_ndjson(request)
+
+    async def handle_batch(rows: Batch[BulkAthleteUpdateItem]) -> dict:
+        updated = await update_athletes([item for _, item in rows])
+        return {"updated": [athlete.id for athlete in updated]}
+
+    return NDJSONResponse(stream_ingest(request, BulkAthleteUpdateItem, handle_batch))
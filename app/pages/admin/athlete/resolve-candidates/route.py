@@ -5,7 +5,7 @@ from app.schemas.athlete.review import (
     ResolveCandidatesResponse,
     ResolveCandidatesResponseItem,
 )
-from app.services.athlete_identity import resolve_source_candidates, source_cache_key
+from app.services.athlete_identity import resolve_sources_candidates
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -17,16 +17,10 @@ router = APIRouter()
 )
 @require_scope("athlete:read")
 async def resolve_candidates(payload: ResolveCandidatesRequest):
-    cache = {}
+    resolutions = await resolve_sources_candidates(payload.items)
     response_items: list[ResolveCandidatesResponseItem] = []
 
-    for item in payload.items:
-        key = source_cache_key(item)
-        cached = cache.get(key)
-        if cached is None:
-            cached = await resolve_source_candidates(item)
-            cache[key] = cached
-
+    for item, cached in zip(payload.items, resolutions):
         response_items.append(
             ResolveCandidatesResponseItem(
                 external_id=item.external_id,
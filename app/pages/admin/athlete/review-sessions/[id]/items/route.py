@@ -9,7 +9,7 @@ from app.schemas.athlete.review import (
     ReviewSessionItemsListResponse,
     ReviewSessionLoadItemsResponse,
 )
-from app.services.athlete_identity import resolve_source_candidates
+from app.services.athlete_identity import resolve_sources_candidates
 from app.services.athlete_identity.apply import (
     get_review_item_context,
     is_review_item_resolved,
@@ -68,8 +68,8 @@ async def load_review_session_items(id: int, payload: ResolveCandidatesRequest):
 
     created = 0
     updated = 0
-    for source in payload.items:
-        resolution = await resolve_source_candidates(source)
+    resolutions = await resolve_sources_candidates(payload.items)
+    for source, resolution in zip(payload.items, resolutions):
         status = (
             ReviewItemStatusEnum.AUTO_MATCH_CANDIDATE
             if resolution.auto_match
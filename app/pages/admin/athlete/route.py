@@ -1,12 +1,13 @@
 
-from typing import List
-
-from fastapi import APIRouter, Depends
-from tortoise.expressions import Q
+from typing import List, Optional
 
+from fastapi import APIRouter, Response
 
 from app.models.athlete.athlete import Athlete
+from app.repositories.search_athletes import ADMIN_SEARCH_LIMIT, search_athletes_admin
 from app.schemas.athlete.athlete import Athlete_Pydantic, AthleteIn_Pydantic
+from app.services.data_changes import on_athletes_changed
+from app.shared.utils.pagination import NEXT_CURSOR_HEADER
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter(tags=['Admin/Athlete'])
@@ -18,62 +19,28 @@ router = APIRouter(tags=['Admin/Athlete'])
 )
 @require_scope('athlete:read')
 async def get_athletes_admin(
-    query: str = None,
-    last_name: str = None,
-    first_name: str = None,
-    birth_year: int = None,
-    club: str = None,
-    gender: str = None,
-    limit: int = None
+    response: Response,
+    query: Optional[str] = None,
+    last_name: Optional[str] = None,
+    first_name: Optional[str] = None,
+    birth_year: Optional[int] = None,
+    club: Optional[str] = None,
+    gender: Optional[str] = None,
+    limit: int = ADMIN_SEARCH_LIMIT,
+    after: Optional[str] = None,
 ):
-    q_filter = Q()
-
-    if query:
-        limit = limit if limit is not None else 15
-
-        parts = query.strip().split()
-        if len(parts) == 1:
-            term = parts[0]
-            q_filter |= Q(last_name__icontains=term)
-            q_filter |= Q(first_name__icontains=term)
-            if term.isdigit():
-                q_filter |= Q(birth_year=int(term))
-
-        elif len(parts) == 2:
-            a, b = parts
-            q_filter |= (Q(last_name__icontains=a) &
-                         Q(first_name__icontains=b))
-            q_filter |= (Q(last_name__icontains=b) &
-                         Q(first_name__icontains=a))
-
-        elif len(parts) == 3:
-            a, b, c = parts
-            if c.isdigit():
-                q_filter |= (Q(last_name__icontains=a) & Q(
-                    first_name__icontains=b) & Q(birth_year=int(c)))
-                q_filter |= (Q(last_name__icontains=b) & Q(
-                    first_name__icontains=a) & Q(birth_year=int(c)))
-            else:
-                q_filter |= (Q(last_name__icontains=a) & Q(
-                    first_name__icontains=f"{b} {c}"))
-                q_filter |= (Q(last_name__icontains=b) & Q(
-                    first_name__icontains=f"{a} {c}"))
-
-    if last_name:
-        q_filter &= Q(last_name__icontains=last_name)
-    if first_name:
-        q_filter &= Q(first_name__icontains=first_name)
-    if birth_year:
-        q_filter &= Q(birth_year=birth_year)
-    if club:
-        q_filter &= Q(club__icontains=club)
-    if gender:
-        q_filter &= Q(gender=gender)
-
-    if limit is None:
-        athletes = await Athlete.filter(q_filter)
-    else:
-        athletes = await Athlete.filter(q_filter).limit(limit)
+    athletes, next_cursor = await search_athletes_admin(
+        query=query,
+        last_name=last_name,
+        first_name=first_name,
+        birth_year=birth_year,
+        club=club,
+        gender=gender,
+        limit=limit,
+        after=after,
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return athletes
 
 
@@ -84,4 +51,5 @@ async def get_athletes_admin(
 @require_scope('athlete:create')
 async def create_athlete(athlete: AthleteIn_Pydantic):
     db_athlete = await Athlete.create(**athlete.model_dump())
+    await on_athletes_changed([db_athlete.id])
     return db_athlete
@@ -12,6 +12,8 @@ from app.models.competition.competition import Competition
 from app.schemas.athlete.athlete import Athlete_Pydantic, AthleteIn_Pydantic
 from app.schemas.competition.competition import (Competition_Pydantic,
                                                  CompetitionIn_Pydantic)
+from app.services.data_changes import (collect_competition_changes, on_competitions_changed,
+                                       on_results_changed)
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -27,6 +29,9 @@ async def update_competition(id: int, competition: CompetitionIn_Pydantic):
     if not comp:
         raise APIError(ErrorCode.COMPETITION_NOT_FOUND)
     await comp.update_from_dict(competition.dict()).save()
+    # сезон, бассейн и статус соревнования входят в ключ best_results
+    await on_results_changed(await collect_competition_changes(id))
+    await on_competitions_changed([id])
     return comp
 
 
@@ -38,5 +43,8 @@ async def delete_competition(id: int):
     competition = await Competition.get_or_none(id=id)
     if not competition:
         raise APIError(ErrorCode.COMPETITION_NOT_FOUND)
+    changes = await collect_competition_changes(id)
     await competition.delete()
+    await on_results_changed(changes)
+    await on_competitions_changed([id])
     return
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends
 from app.models.competition.competition import Competition
 from app.schemas.competition.competition import (Competition_Pydantic,
                                                  CompetitionIn_Pydantic)
+from app.services.data_changes import on_competitions_changed
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter(tags=['Admin/Competition'])
@@ -18,4 +19,5 @@ router = APIRouter(tags=['Admin/Competition'])
 @require_scope('competition:create')
 async def create_competition(data: CompetitionIn_Pydantic):
     competition = await Competition.create(**data.dict())
+    await on_competitions_changed([competition.id])
     return competition
@@ -8,6 +8,7 @@ from app.models.athlete.athlete import Athlete
 from app.models.competition.competition import Competition
 from app.models.competition.result import Result
 from app.schemas.results.result import Result_Pydantic, ResultIn_Pydantic
+from app.services.data_changes import ResultChangeSet, on_results_changed
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -26,9 +27,12 @@ async def update_result(
     if not db_result:
         raise APIError(ErrorCode.RESULT_NOT_FOUND)
 
+    changes = ResultChangeSet.from_results([db_result])
     data = result.model_dump()
     db_result.update_from_dict(data)
     await db_result.save(update_fields=list(data.keys()))
+    changes.add_result(db_result)
+    await on_results_changed(changes)
 
     return await Result_Pydantic.from_tortoise_orm(db_result)
 
@@ -42,4 +46,6 @@ async def delete_result(id: int):
     db_result = await Result.get(id=id)
     if not db_result:
         raise APIError(ErrorCode.RESULT_NOT_FOUND)
+    changes = ResultChangeSet.from_results([db_result])
     await db_result.delete()
+    await on_results_changed(changes)
@@ -1,18 +1,13 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends
-from tortoise.exceptions import DoesNotExist
+from fastapi import APIRouter
 
-from app.core.deps.redis import get_redis
-from app.core.errors import APIError, ErrorCode
-
-from app.models.athlete.athlete import Athlete
-from app.models.competition.competition import Competition
-from app.models.competition.result import Result
 from app.schemas.results.result import (BulkCreateResult,
                                         BulkCreateResultResponse)
 from app.services.athlete_identity.apply import validate_result_upload_resolution
+from app.services.data_changes import ResultChangeSet, on_results_changed
+from app.services.result_ingestion import ingest_results
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -29,54 +24,12 @@ async def bulk_create_results(
     resolution_session_id: Optional[int] = None,
     require_resolution: bool = True,
 ):
-    results = []
-    errors = []
-    competitions = {}
-
     if require_resolution:
         await validate_result_upload_resolution(
             results_data,
             resolution_session_id,
         )
 
-    print("Start parsing", len(results_data), "athletes")
-    count = len(results_data)
-    for index, bulk_request in enumerate(results_data):
-        print(f"[{index}/{count}] Athlete start process")
-        try:
-            if bulk_request.competition_id not in competitions:
-                try:
-                    competition = await Competition.get(id=bulk_request.competition_id)
-                except DoesNotExist as exc:
-                    raise APIError(ErrorCode.COMPETITION_NOT_FOUND) from exc
-                competitions[bulk_request.competition_id] = competition
-            else:
-                competition = competitions[bulk_request.competition_id]
-
-            try:
-                athlete = await Athlete.get(id=bulk_request.athlete_id)
-            except DoesNotExist as exc:
-                raise APIError(ErrorCode.ATHLETE_NOT_FOUND) from exc
-
-            for result in bulk_request.results:
-                db_result = Result(
-                    athlete=athlete,
-                    competition=competition,
-                    **result.model_dump()
-                )
-                results.append(db_result)
-        except Exception as exc:
-            if not ignore_exception:
-                raise
-            else:
-                errors.append(
-                    {
-                        "exception": True,
-                        "name": type(exc).__name__,
-                        "description": str(exc),
-                        "input": bulk_request,
-                    }
-                )
-
-    response = await Result.bulk_create(results)
-    return {"results": response, "errors": errors}
+    report = await ingest_results(results_data, ignore_exception)
+    await on_results_changed(ResultChangeSet.from_results(report.results))
+    return {"results": report.results, "errors": report.errors}
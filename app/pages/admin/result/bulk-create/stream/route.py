@@ -0,0 +1,43 @@
+from typing import Optional
+
+from fastapi import APIRouter, Request
+
+from app.schemas.results.result import BulkCreateResult
+from app.services.athlete_identity.apply import validate_result_upload_resolution
+from app.services.data_changes import ResultChangeSet, on_results_changed
+from app.services.result_ingestion import ingest_results
+from app.shared.utils.ndjson import (NDJSON_OPENAPI_BODY, Batch, NDJSONResponse,
+                                     require_ndjson, stream_ingest)
+from app.shared.utils.scopes.request import require_scope
+
+router = APIRouter()
+
+
+@router.post("/", response_class=NDJSONResponse, openapi_extra=NDJSON_OPENAPI_BODY)
+@require_scope('result:create')
+async def stream_bulk_create_results(
+    request: Request,
+    resolution_session_id: Optional[int] = None,
+    require_resolution: bool = True,
+):
+    """Тот же bulk-create, но строки BulkCreateResult в NDJSON и прогресс по пачкам."""
+    require_ndjson(request)
+
+    async def handle_batch(rows: Batch[BulkCreateResult]) -> dict:
+        items = [item for _, item in rows]
+        if require_resolution:
+            await validate_result_upload_resolution(items, resolution_session_id)
+
+        report = await ingest_results(items, ignore_exception=True)
+        await on_results_changed(ResultChangeSet.from_results(report.results))
+
+        line_by_item = {id(item): line_no for line_no, item in rows}
+        return {
+            "inserted": len(report.results),
+            "errors": [
+                {"line": line_by_item[id(item)], "error": exc.error_name, "message": exc.message}
+                for item, exc in report.rejected
+            ],
+        }
+
+    return NDJSONResponse(stream_ingest(request, BulkCreateResult, handle_batch))
@@ -8,6 +8,7 @@ from app.models.athlete.athlete import Athlete
 from app.models.competition.competition import Competition
 from app.models.competition.result import Result
 from app.schemas.results.result import Result_Pydantic, ResultIn_Pydantic
+from app.services.data_changes import ResultChangeSet, on_results_changed
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter(tags=['Admin/Result'])
@@ -48,4 +49,5 @@ async def create_result(
         dsq=result.dsq,
         dsq_final=result.dsq_final,
     )
+    await on_results_changed(ResultChangeSet.from_results([db_result]))
     return await Result_Pydantic.from_tortoise_orm(db_result)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 from app.models.misc.standard_category import StandardCategory
 from app.schemas.results.standards import StandardIn, StandardOut
+from app.shared.cache.tags import STANDARDS_TAG, bump_tags
+from app.shared.clients.redis import client
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter(tags=['Admin/Standard'])
@@ -19,4 +21,5 @@ async def create_standard(data: StandardIn):
     ).update(is_active=False)
 
     standard = await StandardCategory.create(**data.model_dump())
+    await bump_tags(client, [STANDARDS_TAG])
     return await StandardOut.from_tortoise_orm(standard)
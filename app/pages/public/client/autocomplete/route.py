@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+
+from app.core.deps.redis import get_redis
+from app.repositories.autocomplete import AUTOCOMPLETE_LIMIT, autocomplete
+from app.schemas.misc.autocomplete import AutocompleteOut
+from app.shared.utils.scopes.request import require_scope
+
+router = APIRouter(tags=['Public/Client/Autocomplete'])
+
+
+@router.get("/", response_model=AutocompleteOut)
+@require_scope('client.autocomplete:read')
+async def get_autocomplete(q: str, limit: int = AUTOCOMPLETE_LIMIT, redis=Depends(get_redis)):
+    return await autocomplete(redis, q, limit)
@@ -1,11 +1,9 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
-from tortoise.expressions import Q
+from fastapi import APIRouter
 
-
-from app.models.roles.coach import Coach
+from app.repositories.search_coaches import COACH_SEARCH_LIMIT, search_coaches
 from app.schemas.users.coach import CoachOut
 from app.shared.utils.scopes.request import require_scope
 
@@ -14,22 +12,5 @@ router = APIRouter(tags=['Public/Client/Coach'])
 
 @router.get("/", response_model=List[CoachOut])
 @require_scope('client.coach:read')
-async def search_coach(q: str):
-    if not q.strip():
-        return []
-
-    words = q.strip().split()
-
-    query = Q()
-    for word in words:
-        part = (
-            Q(last_name__icontains=word)
-            | Q(first_name__icontains=word)
-            | Q(middle_name__icontains=word)
-            | Q(city__icontains=word)
-            | Q(club__icontains=word)
-        )
-        query &= part
-
-    coaches = Coach.filter(query)
-    return await CoachOut.from_queryset(coaches)
+async def search_coach(q: str, limit: int = COACH_SEARCH_LIMIT):
+    return await search_coaches(q, limit)
@@ -7,7 +7,8 @@ from fastapi import APIRouter, Query
 
 
 from app.repositories.get_top_results import get_top_results
-from app.schemas.results.top import TopResponse, parse_best_full_result
+from app.repositories.sa.top_results import supports_top_cursor
+from app.schemas.results.top import TopResponse, build_top_response, decode_top_cursor
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -35,6 +36,8 @@ class TopRequest(BaseModel):
     courses: Optional[List[str]] = None
     statuses: Optional[List[str]] = None
 
+    after: Optional[str] = None
+
 
 @router.post("/", response_model=TopResponse)
 @require_scope("client.result.top:read")
@@ -42,5 +45,9 @@ async def get_top(payload: TopRequest):
     data = payload.model_dump()
     print(data)  # теперь все параметры приходят в теле
 
-    results = await get_top_results(**data)
-    return {"results": [parse_best_full_result(res) for res in results]}
+    after = data.pop("after")
+    results = await get_top_results(
+        **data, after=decode_top_cursor(after) if after else None)
+    return build_top_response(
+        results, payload.limit,
+        cursor=supports_top_cursor(payload.stroke, payload.distance, payload.gender))
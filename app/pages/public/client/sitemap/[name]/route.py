@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response
+
+from app.core.errors import APIError, ErrorCode
+from app.shared.utils.scopes.request import require_scope
+from app.shared.utils.sitemap import generate_sitemap_shard
+
+router = APIRouter(tags=['Public/Client/Sitemap'])
+
+
+@router.get("/", response_class=Response)
+@require_scope('sitemap:read')
+async def get_sitemap_shard(name: str):
+    xml_bytes = await generate_sitemap_shard(name.removesuffix(".xml"))
+    if xml_bytes is None:
+        raise APIError(ErrorCode.NOT_FOUND)
+
+    return Response(
+        content=xml_bytes,
+        media_type="application/xml; charset=utf-8",
+        headers={
+            "Cache-Control": "public, s-maxage=3600, stale-while-revalidate=59"
+        },
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Response
 from app.shared.utils.scopes.request import require_scope
-from app.shared.utils.sitemap import generate_sitemap
+from app.shared.utils.sitemap import generate_sitemap_index
 
 router = APIRouter(tags=['Public/Client/Sitemap'])
 
@@ -8,7 +8,7 @@ router = APIRouter(tags=['Public/Client/Sitemap'])
 @router.get("/", response_class=Response)
 @require_scope('sitemap:read')
 async def get_sitemap():
-    xml_bytes = await generate_sitemap()
+    xml_bytes = await generate_sitemap_index()
 
     return Response(
         content=xml_bytes,
@@ -1,10 +1,8 @@
 from fastapi import APIRouter
-from tortoise.exceptions import DoesNotExist
 
 from app.core.errors import APIError, ErrorCode
-from app.models.athlete.athlete import Athlete
-from app.models.competition.result import Result
-from app.schemas.athlete.athlete import Athlete_Pydantic, AthleteDetailed_Pydantic
+from app.repositories.athlete_stats import get_athlete_detail
+from app.schemas.athlete.athlete import AthleteDetailed_Pydantic
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter()
@@ -13,18 +11,9 @@ router = APIRouter()
 @router.get("/", response_model=AthleteDetailed_Pydantic)
 @require_scope('athlete:read')
 async def get_athlete(id: int):
-    try:
-        athlete = await Athlete.get(id=id)
-        athlete_data = await Athlete_Pydantic.from_tortoise_orm(athlete)
-
-        competition_ids = await Result.filter(athlete__id=id).distinct().values_list("competition_id", flat=True)
-        competitions_count = len(competition_ids)
-        occupied_places_count = await Result.filter(athlete__id=id, place__in={'1', '2', '3'}).count()
-
-        return AthleteDetailed_Pydantic(
-            **athlete_data.model_dump(),
-            competitions_count=competitions_count,
-            occupied_places_count=occupied_places_count
-        )
-    except DoesNotExist:
+    athlete = await get_athlete_detail(id)
+    if athlete is None:
         raise APIError(ErrorCode.ATHLETE_NOT_FOUND)
+
+    athlete["occupied_places_count"] = athlete.pop("podiums_count")
+    return AthleteDetailed_Pydantic(**athlete)
@@ -1,9 +1,13 @@
 
 from typing import Optional
 
-from fastapi import APIRouter
-from app.repositories.get_top_results import get_top_results
-from app.schemas.results.top import TopResponse, parse_best_full_result
+from fastapi import APIRouter, Depends
+from app.core.deps.redis import get_redis
+from app.repositories.get_top_results import (TOP_RESULTS_STALE_TTL, TOP_RESULTS_TTL,
+                                              get_top_results, top_results_cache_key)
+from app.repositories.sa.top_results import supports_top_cursor
+from app.schemas.results.top import TopResponse, build_top_response, decode_top_cursor
+from app.shared.cache.responses import cached_json_response
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter(tags=['Public/Server/Result'])
@@ -23,16 +27,34 @@ async def get_top(
     max_age: int = None,
     season: Optional[int] = None,
     current_season: Optional[bool] = False,
+    after: Optional[str] = None,
+    redis=Depends(get_redis),
 ):
-    results = await get_top_results(
-        distance,
-        stroke,
-        gender,
-        limit,
-        offset,
-        min_age,
-        max_age,
-        season,
-        current_season,
+    params = dict(
+        distance=distance,
+        stroke=stroke,
+        gender=gender,
+        limit=limit,
+        offset=offset,
+        min_age=min_age,
+        max_age=max_age,
+        season=season,
+        current_season=current_season,
+        after=decode_top_cursor(after) if after else None,
+    )
+
+    async def compute():
+        return build_top_response(
+            await get_top_results(**params), limit,
+            cursor=supports_top_cursor(stroke, distance, gender))
+
+    cache_key, tags = top_results_cache_key(**params)
+    return await cached_json_response(
+        redis,
+        cache_key,
+        tags,
+        compute,
+        None,  # build_top_response уже отдаёт JSON-форму TopResponse
+        expire_seconds=TOP_RESULTS_TTL,
+        stale_seconds=TOP_RESULTS_STALE_TTL,
     )
-    return {"results": [parse_best_full_result(res) for res in results]}
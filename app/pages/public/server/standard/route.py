@@ -4,9 +4,12 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends
 
+from app.core.deps.redis import get_redis
 
 from app.models.misc.standard_category import StandardCategory
 from app.schemas.results.standards import StandardIn, StandardOut
+from app.shared.cache.tags import STANDARDS_TAG
+from app.shared.cache.tiered import get_or_compute_tagged
 from app.shared.utils.scopes.request import require_scope
 
 router = APIRouter(tags=['Public/Server/Standards'])
@@ -20,6 +23,7 @@ async def list_standards(
     gender: Optional[str] = None,
     type: Optional[str] = None,
     code: Optional[str] = None,
+    redis=Depends(get_redis),
 ):
     filters = {"is_active": True}
     if stroke:
@@ -33,5 +37,15 @@ async def list_standards(
     if code:
         filters["code"] = code
 
-    query = StandardCategory.filter(**filters)
-    return await StandardOut.from_queryset(query)
+    async def compute():
+        standards = await StandardOut.from_queryset(StandardCategory.filter(**filters))
+        return [standard.model_dump() for standard in standards]
+
+    cache_key = "standards:" + ":".join(f"{k}={v}" for k, v in sorted(filters.items()))
+    return await get_or_compute_tagged(
+        redis,
+        cache_key,
+        [STANDARDS_TAG],
+        compute,
+        expire_seconds=60 * 60 * 24 * 7,
+    )
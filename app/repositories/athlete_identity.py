@@ -0,0 +1,106 @@
+from typing import Iterable, Optional
+
+from app.models.athlete.athlete import Athlete
+from app.repositories.sa.models import athlete_first_name_key, athlete_last_name_key, athletes
+from app.repositories.sa.utils import execute_query
+from app.shared.utils.name_keys import name_search_key
+from sqlalchemy import Integer, String, column, func, or_, select, values
+
+# (фамилия, имя, год рождения, пол или None/"")
+NameKeyLookup = tuple[str, str, str, Optional[str]]
+
+# пять параметров на ключ: пачка заметно ниже предела asyncpg в 32767
+NAME_KEY_CHUNK_SIZE = 500
+
+
+def build_name_key_candidates_query(
+    last_name: str,
+    first_name: str,
+    birth_year: str,
+    gender: Optional[str],
+    limit: int,
+):
+    filters = [
+        athlete_last_name_key == name_search_key(last_name),
+        athlete_first_name_key == name_search_key(first_name),
+        athletes.c.birth_year == birth_year,
+    ]
+    if gender:
+        filters.append(athletes.c.gender == gender)
+    return select(athletes).where(*filters).order_by(athletes.c.id).limit(limit)
+
+
+def name_key_lookup_key(lookup: NameKeyLookup) -> NameKeyLookup:
+    last_name, first_name, birth_year, gender = lookup
+    # пустая строка вместо None: иначе VALUES рендерит NULL литералом и текст запроса
+    # зависел бы от того, у каких источников нет пола
+    return name_search_key(last_name), name_search_key(first_name), birth_year, gender or ""
+
+
+def build_name_key_batch_query(keys: list[NameKeyLookup], limit: int):
+    """Кандидаты для списка ключей одним запросом: join с VALUES.
+
+    key_no — индекс ключа в keys; на каждый ключ не больше limit строк по возрастанию id,
+    как у build_name_key_candidates_query.
+    """
+    lookup = values(
+        column("key_no", Integer),
+        column("last_name_key", String),
+        column("first_name_key", String),
+        column("birth_year", String),
+        column("gender", String),
+        name="lookup",
+    ).data([(key_no, *key) for key_no, key in enumerate(keys)])
+
+    ranked = (
+        select(
+            lookup.c.key_no,
+            func.row_number().over(partition_by=lookup.c.key_no, order_by=athletes.c.id).label("key_rank"),
+            *athletes.c,
+        )
+        .select_from(lookup)
+        .join(
+            athletes,
+            (athlete_last_name_key == lookup.c.last_name_key)
+            & (athlete_first_name_key == lookup.c.first_name_key)
+            & (athletes.c.birth_year == lookup.c.birth_year)
+            & or_(lookup.c.gender == "", athletes.c.gender == lookup.c.gender),
+        )
+        .subquery("ranked")
+    )
+    return (
+        select(ranked)
+        .where(ranked.c.key_rank <= limit)
+        .order_by(ranked.c.key_no, ranked.c.id)
+    )
+
+
+async def find_athletes_by_name_key(
+    last_name: str,
+    first_name: str,
+    birth_year: str,
+    gender: Optional[str] = None,
+    limit: int = 50,
+) -> list[Athlete]:
+    """Кандидаты по ключам имён: ё/е, регистр и транслитерация не мешают совпадению."""
+    query = build_name_key_candidates_query(last_name, first_name, birth_year, gender, limit)
+    return [Athlete._init_from_db(**row) for row in await execute_query(query)]
+
+
+async def find_athletes_by_name_keys(
+    lookups: Iterable[NameKeyLookup],
+    limit: int = 50,
+) -> dict[NameKeyLookup, list[Athlete]]:
+    """find_athletes_by_name_key для многих источников: запрос на пачку ключей, а не на источник."""
+    lookups = list(lookups)
+    keys = list(dict.fromkeys(name_key_lookup_key(lookup) for lookup in lookups))
+    found: dict[NameKeyLookup, list[Athlete]] = {key: [] for key in keys}
+
+    for start in range(0, len(keys), NAME_KEY_CHUNK_SIZE):
+        chunk = keys[start:start + NAME_KEY_CHUNK_SIZE]
+        for row in await execute_query(build_name_key_batch_query(chunk, limit)):
+            key = chunk[row.pop("key_no")]
+            row.pop("key_rank")
+            found[key].append(Athlete._init_from_db(**row))
+
+    return {lookup: found[name_key_lookup_key(lookup)] for lookup in lookups}
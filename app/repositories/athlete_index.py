@@ -0,0 +1,335 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+from typing import Iterable, Optional
+
+from sqlalchemy import Integer, select
+
+from app.repositories.sa.models import athletes
+from app.repositories.sa.utils import any_of, execute_query
+from app.shared.cache.invalidation import on_invalidation
+from app.shared.cache.tags import athlete_tag
+from app.shared.utils.name_keys import (KEY_PREFIX_MIN_LENGTH, KEY_PREFIX_UPPER,
+                                        name_search_key, query_name_keys)
+from app.shared.utils.trigrams import Trigrams, similarity, trigrams
+
+_log = logging.getLogger(__name__)
+
+SIMILARITY_THRESHOLD = 0.3
+# запас для отсечений: similarity — float4, ровно threshold после округления
+# оказывается чуть больше порога и проходит сравнение, как в Postgres
+_PRUNE_EPSILON = 1e-6
+BUILD_BATCH_SIZE = 200
+_ATHLETE_TAG_PREFIX = athlete_tag("")
+
+
+class _FieldPostings:
+    """Триграмма -> размер набора триграмм поля -> id спортсменов.
+
+    Размер нужен для отсечения по длине: similarity <= min(|A|, |B|) / max(|A|, |B|).
+    """
+
+    def __init__(self):
+        self.grams: dict[int, Trigrams] = {}
+        self._postings: dict[str, dict[int, set[int]]] = {}
+        # ключи name_search_key, отсортированные для поиска по префиксу
+        self.keys: dict[int, str] = {}
+        self._sorted_keys: list[tuple[str, int]] = []
+
+    def add(self, athlete_id: int, value: str) -> None:
+        key = name_search_key(value)
+        self.keys[athlete_id] = key
+        bisect.insort(self._sorted_keys, (key, athlete_id))
+
+        grams = trigrams(value)
+        self.grams[athlete_id] = grams
+        size = len(grams)
+        for trigram in grams:
+            self._postings.setdefault(trigram, {}).setdefault(size, set()).add(athlete_id)
+
+    def discard(self, athlete_id: int) -> None:
+        grams = self.grams.pop(athlete_id, None)
+        if grams is None:
+            return
+        entry = (self.keys.pop(athlete_id), athlete_id)
+        del self._sorted_keys[bisect.bisect_left(self._sorted_keys, entry)]
+
+        size = len(grams)
+        for trigram in grams:
+            by_size = self._postings[trigram]
+            ids = by_size[size]
+            ids.discard(athlete_id)
+            if not ids:
+                del by_size[size]
+                if not by_size:
+                    del self._postings[trigram]
+
+    def key_matches(self, key: str) -> set[int]:
+        """id с ключом, равным key (или начинающимся с него, если key не короткий)."""
+        upper = key + KEY_PREFIX_UPPER if len(key) >= KEY_PREFIX_MIN_LENGTH else key + "\0"
+        start = bisect.bisect_left(self._sorted_keys, (key,))
+        end = bisect.bisect_left(self._sorted_keys, (upper,), lo=start)
+        return {athlete_id for _, athlete_id in self._sorted_keys[start:end]}
+
+    def matches(self, word: Trigrams, threshold: float) -> set[int]:
+        """id, у которых similarity(поле, word) > threshold.
+
+        threshold — double, как $n::FLOAT в build_athlete_search_query: similarity
+        (real) сравнивается с ним без округления порога.
+        """
+        found = set()
+        word_size = len(word)
+        if not word_size:
+            return found
+
+        sizes = set()
+        postings = []
+        for trigram in word:
+            by_size = self._postings.get(trigram)
+            if by_size:
+                postings.append(by_size)
+                sizes.update(by_size)
+
+        for size in sizes:
+            low = threshold - _PRUNE_EPSILON
+            if not low * word_size <= size <= word_size / low:
+                continue
+            # общих триграмм s нужно столько, что s / (size + |word| - s) >= threshold;
+            # кандидат с s общими есть хотя бы в одном из |word| - s + 1 самых редких списков
+            min_shared = math.ceil(low * (size + word_size) / (1 + low))
+            lists = sorted(
+                (by_size.get(size, ()) for by_size in postings), key=len
+            )[:max(word_size - min_shared + 1, 0)]
+            for ids in lists:
+                for athlete_id in ids:
+                    if athlete_id not in found and similarity(self.grams[athlete_id], word) > threshold:
+                        found.add(athlete_id)
+        return found
+
+
+class AthleteNameIndex:
+    """Индекс имён спортсменов в памяти процесса.
+
+    Сначала совпадения по ключам имён (build_athlete_key_search_query), затем
+    триграммные: отбор и порядок как у build_athlete_search_query (pg_trgm
+    similarity), при равной близости выше спортсмен с меньшим id.
+    """
+
+    def __init__(self):
+        self.rows: dict[int, dict] = {}
+        self._first = _FieldPostings()
+        self._last = _FieldPostings()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def upsert(self, row: dict) -> None:
+        athlete_id = row["id"]
+        self.remove(athlete_id)
+
+        self.rows[athlete_id] = row
+        self._first.add(athlete_id, row["first_name"] or "")
+        self._last.add(athlete_id, row["last_name"] or "")
+
+    def remove(self, athlete_id: int) -> None:
+        if self.rows.pop(athlete_id, None) is None:
+            return
+        self._first.discard(athlete_id)
+        self._last.discard(athlete_id)
+
+    def search_keys(self, keys: list[str], limit: Optional[int]) -> list[int]:
+        first, last = self._first, self._last
+        if len(keys) == 1:
+            ids = last.key_matches(keys[0]) | first.key_matches(keys[0])
+        else:
+            k1, k2 = keys
+            ids = (
+                last.key_matches(k1) & first.key_matches(k2)
+            ) | (
+                last.key_matches(k2) & first.key_matches(k1)
+            )
+
+        scored = (
+            (
+                -((last.keys[athlete_id] in keys) + (first.keys[athlete_id] in keys)),
+                last.keys[athlete_id],
+                first.keys[athlete_id],
+                athlete_id,
+            )
+            for athlete_id in ids
+        )
+        best = sorted(scored) if limit is None else heapq.nsmallest(limit, scored)
+        return [item[-1] for item in best]
+
+    def search_similar(
+        self,
+        words: list[str],
+        limit: Optional[int],
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> list[int]:
+        grams = [trigrams(word) for word in words]
+        first, last = self._first, self._last
+
+        if len(grams) == 1:
+            ids = first.matches(grams[0], threshold) | last.matches(grams[0], threshold)
+        else:
+            w1, w2 = grams
+            ids = (
+                last.matches(w1, threshold) & first.matches(w2, threshold)
+            ) | (
+                last.matches(w2, threshold) & first.matches(w1, threshold)
+            )
+
+        second = grams[1] if len(grams) > 1 else frozenset()
+        scored = (
+            (
+                -max(
+                    similarity(first.grams[athlete_id], grams[0]),
+                    similarity(last.grams[athlete_id], grams[0]),
+                    similarity(first.grams[athlete_id], second),
+                    similarity(last.grams[athlete_id], second),
+                ),
+                athlete_id,
+            )
+            for athlete_id in ids
+        )
+        best = sorted(scored) if limit is None else heapq.nsmallest(limit, scored)
+        return [athlete_id for _, athlete_id in best]
+
+    def search(self, text: str, limit: Optional[int]) -> Optional[list[dict]]:
+        """Строки athletes в порядке выдачи или None, если запрос нужно отдать SQL."""
+        words = text.split()
+        if len(words) not in (1, 2):
+            return None
+
+        keys = query_name_keys(text)
+        ids = self.search_keys(keys, limit) if keys else []
+        ids = merge_ranked(ids, self.search_similar(words, limit), limit)
+        return [self.rows[athlete_id] for athlete_id in ids]
+
+
+def merge_ranked(first: list, second: list, limit: Optional[int], key=lambda item: item) -> list:
+    """first, затем ещё не встречавшиеся элементы second; не больше limit."""
+    seen = {key(item) for item in first}
+    merged = list(first)
+    for item in second:
+        if limit is not None and len(merged) >= limit:
+            break
+        if key(item) not in seen:
+            seen.add(key(item))
+            merged.append(item)
+    return merged[:limit] if limit is not None else merged
+
+
+# None — индекс ещё не построен, поиск идёт через SQL
+athlete_index: Optional[AthleteNameIndex] = None
+
+_build_task: Optional[asyncio.Task] = None
+_rebuild_requested = False
+_pending_ids: set[int] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+async def _fetch_athletes(athlete_ids: Optional[Iterable[int]] = None) -> list[dict]:
+    query = select(athletes)
+    if athlete_ids is not None:
+        query = query.where(any_of(athletes.c.id, athlete_ids, Integer))
+    return await execute_query(query)
+
+
+def _is_building() -> bool:
+    return _build_task is not None and not _build_task.done()
+
+
+async def build_athlete_index() -> None:
+    global athlete_index
+    index = AthleteNameIndex()
+    for position, row in enumerate(await _fetch_athletes(), 1):
+        index.upsert(row)
+        if position % BUILD_BATCH_SIZE == 0:
+            await asyncio.sleep(0)  # не держим цикл событий всю сборку
+    athlete_index = index
+    _log.info("Athlete name index built: %d athletes", len(index))
+
+    # изменения, пришедшие во время сборки, могли не попасть в снимок
+    if _pending_ids:
+        pending = set(_pending_ids)
+        _pending_ids.clear()
+        await refresh_athletes(pending)
+
+
+async def refresh_athletes(athlete_ids: Iterable[int]) -> None:
+    athlete_ids = set(athlete_ids)
+    if _is_building():
+        _pending_ids.update(athlete_ids)
+    if athlete_index is None:
+        return
+
+    rows = await _fetch_athletes(sorted(athlete_ids))
+    index = athlete_index
+    for row in rows:
+        index.upsert(row)
+    for athlete_id in athlete_ids - {row["id"] for row in rows}:
+        index.remove(athlete_id)
+
+
+async def _build_loop() -> None:
+    global _rebuild_requested
+    while True:
+        _rebuild_requested = False
+        try:
+            await build_athlete_index()
+        except Exception:
+            _log.exception("Failed to build athlete name index")
+        if not _rebuild_requested:
+            return
+
+
+def schedule_athlete_index_build() -> None:
+    global _build_task, _rebuild_requested
+    if _is_building():
+        _rebuild_requested = True
+        return
+    _build_task = asyncio.create_task(_build_loop())
+
+
+def _spawn_refresh(athlete_ids: set[int]) -> None:
+    async def refresh():
+        try:
+            await refresh_athletes(athlete_ids)
+        except Exception:
+            _log.exception("Failed to refresh athlete name index")
+
+    task = asyncio.create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+@on_invalidation
+def _on_athletes_invalidated(tags: Optional[list[str]]) -> None:
+    if athlete_index is None and not _is_building():
+        return  # холодный индекс построится целиком при старте
+    if tags is None:
+        schedule_athlete_index_build()
+        return
+
+    athlete_ids = {
+        int(tag[len(_ATHLETE_TAG_PREFIX):])
+        for tag in tags
+        if tag.startswith(_ATHLETE_TAG_PREFIX) and tag[len(_ATHLETE_TAG_PREFIX):].isdigit()
+    }
+    if athlete_ids:
+        _spawn_refresh(athlete_ids)
+
+
+async def stop_athlete_index() -> None:
+    global _build_task
+    tasks = [*_refresh_tasks]
+    if _build_task is not None:
+        tasks.append(_build_task)
+        _build_task = None
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,53 @@
+import logging
+from typing import Iterable, Optional
+
+from tortoise.transactions import in_transaction
+
+from app.repositories.sa.athlete_stats import (build_athlete_detail_query,
+                                               build_delete_athlete_stats_query,
+                                               build_insert_athlete_stats_query,
+                                               build_lock_athlete_stats_query)
+from app.repositories.sa.utils import compile_query_cached, execute_query
+
+_log = logging.getLogger(__name__)
+
+
+async def refresh_athlete_stats(athlete_ids: Iterable[int]) -> None:
+    """Пересчитывает статистику только для указанных спортсменов."""
+    ids = sorted(set(athlete_ids))
+    if not ids:
+        return
+
+    lock_sql, lock_params = compile_query_cached(
+        build_lock_athlete_stats_query(ids))
+    delete_sql, delete_params = compile_query_cached(
+        build_delete_athlete_stats_query(ids))
+    insert_sql, insert_params = compile_query_cached(
+        build_insert_athlete_stats_query(ids))
+
+    async with in_transaction() as conn:
+        # athlete_id уникален: без блокировки вторая из параллельных записей упала бы на вставке
+        await conn.execute_query(lock_sql, lock_params)
+        await conn.execute_query(delete_sql, delete_params)
+        await conn.execute_query(insert_sql, insert_params)
+    _log.debug("Refreshed stats for %d athletes", len(ids))
+
+
+async def rebuild_athlete_stats() -> None:
+    """Полностью перестраивает таблицу athlete_stats из results."""
+    delete_sql, delete_params = compile_query_cached(
+        build_delete_athlete_stats_query())
+    insert_sql, insert_params = compile_query_cached(
+        build_insert_athlete_stats_query())
+
+    async with in_transaction() as conn:
+        # EXCLUSIVE пропускает чтение, но ждёт и задерживает refresh_athlete_stats
+        await conn.execute_script("LOCK TABLE athlete_stats IN EXCLUSIVE MODE")
+        await conn.execute_query(delete_sql, delete_params)
+        await conn.execute_query(insert_sql, insert_params)
+    _log.info("Rebuilt athlete stats table")
+
+
+async def get_athlete_detail(athlete_id: int) -> Optional[dict]:
+    rows = await execute_query(build_athlete_detail_query(athlete_id))
+    return rows[0] if rows else None
@@ -0,0 +1,230 @@
+import json
+import logging
+from typing import Iterable, Optional
+
+from redis.asyncio import Redis
+
+from app.models.athlete.athlete import Athlete
+from app.models.competition.competition import Competition
+from app.shared.utils.name_keys import KEY_PREFIX_UPPER, name_search_key
+
+_log = logging.getLogger(__name__)
+
+# Подсказки лежат в sorted set с нулевыми весами, член — "терм\0id\0подпись".
+# Термы состоят из [a-z0-9 ], поэтому ZRANGEBYLEX [prefix .. (prefix{ отдаёт
+# все термы с этим префиксом вместе с id и подписью за один запрос.
+
+ATHLETES = "athletes"
+COMPETITIONS = "competitions"
+AUTOCOMPLETE_KINDS = (ATHLETES, COMPETITIONS)
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+# у спортсмена два терма, у соревнования до COMPETITION_MAX_TERMS
+FETCH_FACTOR = 3
+COMPETITION_MAX_TERMS = 6
+REBUILD_BATCH_SIZE = 1000
+
+SEPARATOR = "\x00"
+
+
+def index_name(kind: str) -> str:
+    return f"autocomplete:{kind}"
+
+
+def members_name(kind: str) -> str:
+    """id -> JSON-список членов: по нему убираются старые термы при изменении."""
+    return f"autocomplete:{kind}:members"
+
+
+def normalize_query(user_input: str) -> str:
+    keys = [name_search_key(word) for word in user_input.split()]
+    return " ".join(key for key in keys if key)
+
+
+def make_member(term: str, item_id: int, label: str) -> str:
+    return f"{term}{SEPARATOR}{item_id}{SEPARATOR}{label}"
+
+
+def parse_member(member: bytes | str) -> tuple[int, str]:
+    if isinstance(member, bytes):
+        member = member.decode()
+    _, item_id, label = member.split(SEPARATOR, 2)
+    return int(item_id), label
+
+
+def athlete_members(row: dict) -> list[str]:
+    last_name = name_search_key(row["last_name"])
+    first_name = name_search_key(row["first_name"])
+    label = f"{row['last_name']} {row['first_name']}"
+    if row.get("birth_year"):
+        label = f"{label}, {row['birth_year']}"
+
+    terms = {" ".join(filter(None, (last_name, first_name))),
+             " ".join(filter(None, (first_name, last_name)))}
+    return sorted(make_member(term, row["id"], label) for term in terms if term)
+
+
+def competition_members(row: dict) -> list[str]:
+    words = [key for key in map(name_search_key, row["name"].split()) if key]
+    label = row["name"]
+    if row.get("date"):
+        label = f"{label}, {row['date']}"
+
+    # суффиксы названия: "открытое первенство города" ищется и по "первенство", и по "город"
+    terms = {" ".join(words[i:]) for i in range(min(len(words), COMPETITION_MAX_TERMS))}
+    return sorted(make_member(term, row["id"], label) for term in terms)
+
+
+_MEMBER_BUILDERS = {
+    ATHLETES: athlete_members,
+    COMPETITIONS: competition_members,
+}
+
+
+async def _fetch_athletes(ids: Optional[set[int]] = None) -> list[dict]:
+    query = Athlete.all() if ids is None else Athlete.filter(id__in=ids)
+    return await query.values("id", "last_name", "first_name", "birth_year")
+
+
+async def _fetch_competitions(ids: Optional[set[int]] = None) -> list[dict]:
+    query = Competition.all() if ids is None else Competition.filter(id__in=ids)
+    return await query.values("id", "name", "date")
+
+
+_FETCHERS = {
+    ATHLETES: _fetch_athletes,
+    COMPETITIONS: _fetch_competitions,
+}
+
+
+async def sync_autocomplete(redis: Redis, kind: str, ids: Iterable[int]) -> None:
+    """Пересобирает подсказки для ids; отсутствующие в базе записи удаляются."""
+    ids = set(ids)
+    if not ids:
+        return
+
+    rows = {row["id"]: row for row in await _FETCHERS[kind](ids)}
+    ordered_ids = sorted(ids)
+    previous = await redis.hmget(members_name(kind), ordered_ids)
+
+    stale: list[str] = []
+    fresh: dict[str, int] = {}
+    members: dict[int, str] = {}
+    removed: list[int] = []
+    for item_id, raw in zip(ordered_ids, previous):
+        old = set(json.loads(raw)) if raw else set()
+        row = rows.get(item_id)
+        new = set(_MEMBER_BUILDERS[kind](row)) if row is not None else set()
+
+        stale.extend(old - new)
+        fresh.update(dict.fromkeys(new - old, 0))
+        if new:
+            members[item_id] = json.dumps(sorted(new))
+        else:
+            removed.append(item_id)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        if stale:
+            pipe.zrem(index_name(kind), *stale)
+        if fresh:
+            pipe.zadd(index_name(kind), fresh)
+        if members:
+            pipe.hset(members_name(kind), mapping=members)
+        if removed:
+            pipe.hdel(members_name(kind), *removed)
+        await pipe.execute()
+
+
+async def sync_athlete_autocomplete(redis: Redis, athlete_ids: Iterable[int]) -> None:
+    await sync_autocomplete(redis, ATHLETES, athlete_ids)
+
+
+async def sync_competition_autocomplete(redis: Redis, competition_ids: Iterable[int]) -> None:
+    await sync_autocomplete(redis, COMPETITIONS, competition_ids)
+
+
+async def rebuild_autocomplete(redis: Redis, kind: str) -> int:
+    """Полная сборка во временные ключи и атомарная подмена через RENAME."""
+    build_index = f"{index_name(kind)}:build"
+    build_members = f"{members_name(kind)}:build"
+    await redis.delete(build_index, build_members)
+
+    rows = await _FETCHERS[kind]()
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        batch = rows[start:start + REBUILD_BATCH_SIZE]
+        scores: dict[str, int] = {}
+        members: dict[int, str] = {}
+        for row in batch:
+            item_members = _MEMBER_BUILDERS[kind](row)
+            if not item_members:
+                continue
+            scores.update(dict.fromkeys(item_members, 0))
+            members[row["id"]] = json.dumps(item_members)
+
+        if not scores:
+            continue
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(build_index, scores)
+            pipe.hset(build_members, mapping=members)
+            await pipe.execute()
+
+    async with redis.pipeline(transaction=True) as pipe:
+        if rows:
+            pipe.rename(build_index, index_name(kind))
+            pipe.rename(build_members, members_name(kind))
+        else:
+            pipe.delete(index_name(kind), members_name(kind))
+        await pipe.execute()
+
+    _log.info("Rebuilt %s autocomplete: %d items", kind, len(rows))
+    return len(rows)
+
+
+async def rebuild_all_autocomplete(redis: Redis) -> None:
+    for kind in AUTOCOMPLETE_KINDS:
+        await rebuild_autocomplete(redis, kind)
+
+
+async def ensure_autocomplete(redis: Redis) -> None:
+    """Собирает подсказки при первом запуске; дальше их поддерживают записи и daily_task."""
+    for kind in AUTOCOMPLETE_KINDS:
+        if not await redis.exists(members_name(kind)):
+            await rebuild_autocomplete(redis, kind)
+
+
+def collect_suggestions(members: Iterable[bytes | str], limit: int) -> list[dict]:
+    suggestions: dict[int, str] = {}
+    for member in members:
+        item_id, label = parse_member(member)
+        suggestions.setdefault(item_id, label)
+        if len(suggestions) >= limit:
+            break
+    return [{"id": item_id, "label": label} for item_id, label in suggestions.items()]
+
+
+async def autocomplete(
+    redis: Redis,
+    user_input: str,
+    limit: int = AUTOCOMPLETE_LIMIT,
+) -> dict[str, list[dict]]:
+    prefix = normalize_query(user_input)
+    if not prefix:
+        return {kind: [] for kind in AUTOCOMPLETE_KINDS}
+
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+    async with redis.pipeline(transaction=False) as pipe:
+        for kind in AUTOCOMPLETE_KINDS:
+            pipe.zrangebylex(
+                index_name(kind),
+                f"[{prefix}",
+                f"({prefix}{KEY_PREFIX_UPPER}",
+                start=0,
+                num=limit * FETCH_FACTOR,
+            )
+        results = await pipe.execute()
+
+    return {
+        kind: collect_suggestions(members, limit)
+        for kind, members in zip(AUTOCOMPLETE_KINDS, results)
+    }
@@ -0,0 +1,47 @@
+import logging
+from typing import Iterable
+
+from tortoise.transactions import in_transaction
+
+from app.repositories.sa.best_results import (build_delete_best_results_query,
+                                              build_insert_best_results_query,
+                                              build_lock_best_results_query)
+from app.repositories.sa.utils import compile_query_cached
+
+_log = logging.getLogger(__name__)
+
+
+async def refresh_best_results(athlete_ids: Iterable[int]) -> None:
+    """Пересчитывает лучшие результаты только для указанных спортсменов."""
+    ids = sorted(set(athlete_ids))
+    if not ids:
+        return
+
+    lock_sql, lock_params = compile_query_cached(
+        build_lock_best_results_query(ids))
+    delete_sql, delete_params = compile_query_cached(
+        build_delete_best_results_query(ids))
+    insert_sql, insert_params = compile_query_cached(
+        build_insert_best_results_query(ids))
+
+    async with in_transaction() as conn:
+        # без блокировки две записи одного спортсмена вставили бы один ключ дважды
+        await conn.execute_query(lock_sql, lock_params)
+        await conn.execute_query(delete_sql, delete_params)
+        await conn.execute_query(insert_sql, insert_params)
+    _log.debug("Refreshed best results for %d athletes", len(ids))
+
+
+async def rebuild_best_results() -> None:
+    """Полностью перестраивает таблицу best_results из results."""
+    delete_sql, delete_params = compile_query_cached(
+        build_delete_best_results_query())
+    insert_sql, insert_params = compile_query_cached(
+        build_insert_best_results_query())
+
+    async with in_transaction() as conn:
+        # EXCLUSIVE пропускает чтение, но ждёт и задерживает refresh_best_results
+        await conn.execute_script("LOCK TABLE best_results IN EXCLUSIVE MODE")
+        await conn.execute_query(delete_sql, delete_params)
+        await conn.execute_query(insert_sql, insert_params)
+    _log.info("Rebuilt best results table")
@@ -0,0 +1,41 @@
+import logging
+from typing import Iterable
+
+from tortoise.transactions import in_transaction
+
+from app.repositories.sa.content_last_modified import (
+    ATHLETE, COMPETITION, build_delete_vanished_last_modified_query,
+    build_insert_last_modified_query)
+from app.repositories.sa.utils import compile_query_cached
+
+_log = logging.getLogger(__name__)
+
+
+async def _refresh(entity_type: str, entity_ids=None) -> None:
+    upsert_sql, upsert_params = compile_query_cached(
+        build_insert_last_modified_query(entity_type, entity_ids))
+    delete_sql, delete_params = compile_query_cached(
+        build_delete_vanished_last_modified_query(entity_type, entity_ids))
+
+    async with in_transaction() as conn:
+        await conn.execute_query(upsert_sql, upsert_params)
+        await conn.execute_query(delete_sql, delete_params)
+
+
+async def refresh_last_modified(
+    athlete_ids: Iterable[int] = (),
+    competition_ids: Iterable[int] = (),
+) -> None:
+    """Пересчитывает даты изменения указанных спортсменов и соревнований."""
+    for entity_type, ids in ((ATHLETE, athlete_ids), (COMPETITION, competition_ids)):
+        ids = sorted(set(ids))
+        if ids:
+            await _refresh(entity_type, ids)
+            _log.debug("Refreshed last-modified for %d %s rows", len(ids), entity_type)
+
+
+async def rebuild_last_modified() -> None:
+    """Полностью перестраивает content_last_modified."""
+    for entity_type in (ATHLETE, COMPETITION):
+        await _refresh(entity_type)
+    _log.info("Rebuilt content_last_modified table")
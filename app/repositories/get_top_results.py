@@ -2,13 +2,54 @@ import hashlib
 from datetime import date
 from typing import List, Optional
 
-from tortoise import Tortoise
-
-from app.repositories.sa.top_results import build_top_results_query
-from app.repositories.sa.utils import compile_query_with_dollar_params, compile_query_with_literals
+from app.repositories.leaderboards import match_leaderboard, read_leaderboard
+from app.core.errors import APIError, ErrorCode
+from app.repositories.sa.top_results import (TopCursor, build_top_results_query,
+                                             get_current_season, supports_top_cursor)
+from app.repositories.sa.utils import execute_query
+from app.shared.cache.local import MISSING, local_cache
 from app.shared.cache.redis_compressed import RedisCachePickleCompressed
+from app.shared.cache.tags import ALL_EVENTS_TAG, event_tag, tagged_key
 from app.shared.clients.redis import client
 
+TOP_RESULTS_TTL = 60 * 60 * 24 * 3
+TOP_RESULTS_STALE_TTL = 60 * 60
+
+
+def top_results_cache_key(
+    distance: Optional[int] = None,
+    stroke: Optional[str] = None,
+    gender: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    categories: Optional[List[str]] = None,
+    year: Optional[int] = None,
+    season: Optional[int] = None,
+    current_season: Optional[bool] = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    courses: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    after: Optional[TopCursor] = None,
+) -> tuple[str, list[str]]:
+    """Ключ кеша топа (без поколений) и его теги."""
+    if after is not None:
+        offset = None
+
+    cache_key_raw = (
+        f"{stroke}:{distance}:{gender}:"
+        f"{limit}:{offset}:"
+        f"{min_age}:{max_age}:{categories}:"
+        f"{year}:{season}:{current_season and get_current_season()}:"
+        f"{start_date}:{end_date}:"
+        f"{courses}:{statuses}:{after}"
+    )
+    base_key = "top_results:" + hashlib.sha256(cache_key_raw.encode()).hexdigest()
+    tags = [event_tag(stroke, distance)] if stroke and distance else [ALL_EVENTS_TAG]
+    return base_key, tags
+
 
 async def get_top_results(
     distance: Optional[int] = None,
@@ -30,26 +71,40 @@ async def get_top_results(
 
     courses: Optional[List[str]] = None,
     statuses: Optional[List[str]] = None,
+
+    after: Optional[TopCursor] = None,
 ):
-    cache = RedisCachePickleCompressed(client)
+    if after is not None:
+        if not supports_top_cursor(stroke, distance, gender):
+            raise APIError(ErrorCode.TOP_CURSOR_NEEDS_PARTITION)
+        offset = None
 
-    cache_key_raw = (
-        f"{stroke}:{distance}:{gender}:"
-        f"{limit}:{offset}:"
-        f"{min_age}:{max_age}:{categories}:"
-        f"{year}:{season}:{current_season}:"
-        f"{start_date}:{end_date}:"
-        f"{courses}:{statuses}"
+    base_key, tags = top_results_cache_key(
+        distance=distance,
+        stroke=stroke,
+        gender=gender,
+        limit=limit,
+        offset=offset,
+        min_age=min_age,
+        max_age=max_age,
+        categories=categories,
+        year=year,
+        season=season,
+        current_season=current_season,
+        start_date=start_date,
+        end_date=end_date,
+        courses=courses,
+        statuses=statuses,
+        after=after,
     )
-    cache_key = "top_results:" + hashlib.sha256(
-        cache_key_raw.encode()
-    ).hexdigest()
 
-    cached = await cache.get(cache_key)
-    if cached:
-        return cached
+    # снимки лидербордов тоже читаются из Redis, поэтому память процесса стоит перед ними
+    results = local_cache.get(base_key)
+    if results is not MISSING:
+        return results
+    versions = local_cache.versions(tags)
 
-    query = build_top_results_query(
+    leaderboard = match_leaderboard(
         stroke=stroke,
         distance=distance,
         gender=gender,
@@ -63,13 +118,36 @@ async def get_top_results(
         end_date=end_date,
         courses=courses,
         statuses=statuses,
-        offset=offset,
-        limit=limit,
     )
+    results = None
+    if leaderboard is not None:
+        results = await read_leaderboard(client, leaderboard, limit, offset, after)
 
-    sql = compile_query_with_literals(query)
-    print(sql)
-    results = await Tortoise.get_connection("default").execute_query_dict(sql)
+    if results is None:
+        query = build_top_results_query(
+            stroke=stroke,
+            distance=distance,
+            gender=gender,
+            min_age=min_age,
+            max_age=max_age,
+            categories=categories,
+            year=year,
+            season=season,
+            current_season=current_season,
+            start_date=start_date,
+            end_date=end_date,
+            courses=courses,
+            statuses=statuses,
+            offset=offset,
+            limit=limit,
+            after=after,
+        )
+        results = await RedisCachePickleCompressed(client).get_or_compute(
+            await tagged_key(client, base_key, tags),
+            lambda: execute_query(query),
+            expire_seconds=TOP_RESULTS_TTL,
+            stale_seconds=TOP_RESULTS_STALE_TTL,
+        )
 
-    await cache.set(cache_key, results, expire_seconds=60 * 60)
+    local_cache.set(base_key, results, tags, versions)
     return results
@@ -0,0 +1,215 @@
+import logging
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Iterable, List, Optional
+
+from redis.asyncio import Redis
+
+from app.repositories.sa.top_results import (CATEGORY_INDEX, TopCursor,
+                                             build_top_results_query, get_current_season)
+from app.repositories.sa.utils import execute_query
+from app.shared.cache.redis_compressed import RedisCachePickleCompressed
+from app.shared.utils.metadata import categories as CATEGORY_CONFIG
+from app.shared.utils.metadata import genders as GENDERS
+
+_log = logging.getLogger(__name__)
+
+LEADERBOARD_TTL = 60 * 60 * 24
+BUILD_LOCK_TTL = 60
+
+
+@dataclass(frozen=True)
+class LeaderboardKey:
+    stroke: str
+    distance: int
+    gender: str
+    category: str
+    season: Optional[int] = None  # None — за всё время
+
+    @property
+    def name(self) -> str:
+        scope = "global" if self.season is None else f"season:{self.season}"
+        return f"leaderboard:{scope}:{self.stroke}:{self.distance}:{self.gender}:{self.category}"
+
+    @property
+    def rows_name(self) -> str:
+        return f"{self.name}:rows"
+
+    @property
+    def ready_name(self) -> str:
+        return f"{self.name}:ready"
+
+    @property
+    def lock_name(self) -> str:
+        return f"{self.name}:lock"
+
+
+def time_to_centiseconds(value: time) -> int:
+    return (
+        ((value.hour * 60 + value.minute) * 60 + value.second) * 100
+        + value.microsecond // 10_000
+    )
+
+
+def result_member(result_id: int) -> str:
+    # фиксированная ширина: при равном времени Redis сортирует лексикографически
+    return f"{result_id:010d}"
+
+
+def _match_category(
+    min_age: Optional[int],
+    max_age: Optional[int],
+    categories: Optional[List[str]],
+) -> Optional[str]:
+    if categories:
+        if min_age is not None or max_age is not None or len(categories) != 1:
+            return None
+        return categories[0] if categories[0] in CATEGORY_INDEX else None
+
+    for category in CATEGORY_CONFIG:
+        if category["min_age"] == min_age and category["max_age"] == max_age:
+            return category["id"]
+    return None
+
+
+def match_leaderboard(
+    distance: Optional[int] = None,
+    stroke: Optional[str] = None,
+    gender: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    categories: Optional[List[str]] = None,
+    year: Optional[int] = None,
+    season: Optional[int] = None,
+    current_season: Optional[bool] = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    courses: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+) -> Optional[LeaderboardKey]:
+    """Возвращает снимок, которым можно ответить на запрос, или None."""
+    if not stroke or not distance or gender not in GENDERS:
+        return None
+    if year or start_date or end_date or courses or statuses:
+        return None
+
+    current = get_current_season()
+    if current_season:
+        season = current
+    if season is not None and season != current:
+        return None
+
+    category = _match_category(min_age, max_age, categories)
+    if category is None:
+        return None
+
+    return LeaderboardKey(
+        stroke=stroke,
+        distance=distance,
+        gender=gender,
+        category=category,
+        season=season,
+    )
+
+
+async def build_leaderboard(redis: Redis, key: LeaderboardKey) -> bool:
+    """Пересобирает снимок из Postgres. False — сборку уже ведёт другой воркер."""
+    if not await redis.set(key.lock_name, 1, nx=True, ex=BUILD_LOCK_TTL):
+        return False
+
+    try:
+        # "0" — сборка идёт; инвалидация удалит метку, и снимок не станет готовым
+        await redis.set(key.ready_name, 0, ex=BUILD_LOCK_TTL)
+        query = build_top_results_query(
+            stroke=key.stroke,
+            distance=key.distance,
+            gender=key.gender,
+            categories=[key.category],
+            season=key.season,
+        )
+        rows = await execute_query(query)
+
+        scores = {}
+        payloads = {}
+        for row in rows:
+            member = result_member(row["result_id"])
+            scores[member] = time_to_centiseconds(row["result_resolved_time"])
+            payloads[member] = RedisCachePickleCompressed.encode(row)
+
+        tmp_name = f"{key.name}:tmp"
+        tmp_rows_name = f"{key.rows_name}:tmp"
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(tmp_name, tmp_rows_name)
+            if scores:
+                pipe.zadd(tmp_name, scores)
+                pipe.hset(tmp_rows_name, mapping=payloads)
+                pipe.rename(tmp_name, key.name)
+                pipe.rename(tmp_rows_name, key.rows_name)
+                pipe.expire(key.name, LEADERBOARD_TTL)
+                pipe.expire(key.rows_name, LEADERBOARD_TTL)
+            else:
+                pipe.delete(key.name, key.rows_name)
+            pipe.set(key.ready_name, 1, ex=LEADERBOARD_TTL, xx=True)
+            await pipe.execute()
+        _log.debug("Built leaderboard %s with %d rows", key.name, len(rows))
+        return True
+    finally:
+        await redis.delete(key.lock_name)
+
+
+async def read_leaderboard(
+    redis: Redis,
+    key: LeaderboardKey,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    after: Optional[TopCursor] = None,
+) -> Optional[list[dict]]:
+    """Читает страницу снимка. None — снимок не готов, нужен запрос в SQL."""
+    if await redis.get(key.ready_name) != b"1":
+        if not await build_leaderboard(redis, key):
+            return None
+        if await redis.get(key.ready_name) != b"1":
+            return None
+
+    start = offset or 0
+    if after is not None:
+        rank = await redis.zrank(key.name, result_member(after.result_id))
+        if rank is None:
+            return None
+        start = rank + 1
+    stop = start + limit - 1 if limit else -1
+    members = await redis.zrange(key.name, start, stop)
+    if not members:
+        return []
+
+    payloads = await redis.hmget(key.rows_name, members)
+    return [
+        RedisCachePickleCompressed.decode(payload)
+        for payload in payloads
+        if payload is not None
+    ]
+
+
+def affected_leaderboards(events: Iterable[tuple[str, int]]) -> list[LeaderboardKey]:
+    seasons = (None, get_current_season())
+    return [
+        LeaderboardKey(
+            stroke=stroke,
+            distance=distance,
+            gender=gender,
+            category=category["id"],
+            season=season,
+        )
+        for stroke, distance in events
+        for gender in GENDERS
+        for category in CATEGORY_CONFIG
+        for season in seasons
+    ]
+
+
+async def invalidate_leaderboards(redis: Redis, events: Iterable[tuple[str, int]]) -> None:
+    """Сбрасывает снимки затронутых дисциплин, они пересоберутся при чтении."""
+    keys = affected_leaderboards(events)
+    if not keys:
+        return
+    await redis.delete(*(key.ready_name for key in keys))
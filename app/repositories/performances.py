@@ -0,0 +1,106 @@
+import logging
+from typing import Iterable
+
+from fastapi import Response
+from redis.asyncio import Redis
+
+from app.core.errors import APIError, ErrorCode
+from app.repositories.sa.performances import build_athlete_performances_query
+from app.repositories.sa.utils import execute_query
+from app.schemas.athlete.performance import UserPerformance
+from app.schemas.competition.competition import Competition_Pydantic
+from app.schemas.rows import SectionDecoder
+from app.shared.cache.responses import cached_json_response
+from app.shared.cache.tags import athlete_tag
+
+_log = logging.getLogger(__name__)
+
+PERFORMANCES_TTL = 60 * 60 * 24 * 3
+# больше спортсменов за раз (импорт протокола) прогреваются первым чтением
+PERFORMANCES_WARM_LIMIT = 20
+# спортсмены, чьи выступления прогреет фоновая задача
+PERFORMANCES_WARM_QUEUE_KEY = "performances:warm"
+
+_decode_performance = SectionDecoder("result", UserPerformance)
+_decode_competition = SectionDecoder("competition", Competition_Pydantic)
+
+
+def build_performances(athlete_id: int, rows: list[dict]) -> dict:
+    """Строки build_athlete_performances_query -> JSON-форма UserAthleteResults.
+
+    Лучшие результаты по дисциплинам отмечаются за один проход.
+    """
+    competitions = []
+    best: dict[tuple[str, int], tuple] = {}
+    current_id = None
+
+    for row in rows:
+        if row["result_id"] is None:
+            continue
+
+        if row["competition_id"] != current_id:
+            current_id = row["competition_id"]
+            competitions.append({"competition": _decode_competition(row), "performances": []})
+
+        performance = _decode_performance(row)
+        competitions[-1]["performances"].append(performance)
+
+        resolved_time = row["result_resolved_time"]
+        if resolved_time is None:
+            continue
+        key = (row["result_stroke"], row["result_distance"])
+        rank = (resolved_time, row["result_id"])
+        current = best.get(key)
+        if current is None or rank < current[0]:
+            best[key] = (rank, performance)
+
+    for _, performance in best.values():
+        performance["best"] = True
+
+    return {"id": athlete_id, "results": competitions}
+
+
+async def get_athlete_performances(athlete_id: int) -> dict:
+    rows = await execute_query(build_athlete_performances_query(athlete_id))
+    if not rows:
+        raise APIError(ErrorCode.ATHLETE_NOT_FOUND)
+    return build_performances(athlete_id, rows)
+
+
+async def athlete_performances_response(redis: Redis, athlete_id: int) -> Response:
+    return await cached_json_response(
+        redis,
+        f"performances:{athlete_id}",
+        [athlete_tag(athlete_id)],
+        lambda: get_athlete_performances(athlete_id),
+        None,  # build_performances уже отдаёт JSON-форму UserAthleteResults
+        expire_seconds=PERFORMANCES_TTL,
+    )
+
+
+async def queue_performances_warmup(redis: Redis, athlete_ids: Iterable[int]) -> bool:
+    """Ставит спортсменов в очередь прогрева; False — их слишком много, греть не нужно."""
+    athlete_ids = set(athlete_ids)
+    if not athlete_ids or len(athlete_ids) > PERFORMANCES_WARM_LIMIT:
+        return False
+    await redis.sadd(PERFORMANCES_WARM_QUEUE_KEY, *athlete_ids)
+    return True
+
+
+async def warm_queued_performances(redis: Redis) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.smembers(PERFORMANCES_WARM_QUEUE_KEY)
+        pipe.delete(PERFORMANCES_WARM_QUEUE_KEY)
+        athlete_ids, _ = await pipe.execute()
+    await warm_athlete_performances(redis, (int(athlete_id) for athlete_id in athlete_ids))
+
+
+async def warm_athlete_performances(redis: Redis, athlete_ids: Iterable[int]) -> None:
+    """Пересобирает документ выступлений после записи, чтобы читатели не ждали пересчёта."""
+    for athlete_id in sorted(set(athlete_ids)):
+        try:
+            await athlete_performances_response(redis, athlete_id)
+        except APIError:
+            continue  # спортсмена удалили
+        except Exception:
+            _log.exception("Failed to warm performances for athlete %s", athlete_id)
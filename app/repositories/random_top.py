@@ -0,0 +1,59 @@
+from collections import Counter
+from datetime import date
+
+from redis.asyncio import Redis
+
+from app.repositories.ratings import ABSOLUTE_CATEGORY
+from app.repositories.sa.random_top import build_top_availability_query
+from app.repositories.sa.top_results import get_current_season
+from app.repositories.sa.utils import execute_query
+from app.shared.cache.tags import ALL_EVENTS_TAG
+from app.shared.cache.tiered import get_or_compute_tagged
+from app.shared.utils.metadata import COMBINATIONS
+
+AVAILABILITY_TTL = 60 * 60 * 24
+MIN_TOP_RESULTS = 3
+
+AvailabilityKey = tuple[str, int, str, str]
+
+
+def build_availability(rows: list[dict]) -> dict[AvailabilityKey, int]:
+    """Строки группировки -> {(stroke, distance, gender, category): число результатов}.
+
+    Абсолютная категория — сумма по всем возрастам, включая спортсменов вне категорий.
+    """
+    counts: Counter = Counter()
+    for row in rows:
+        event = (row["stroke"], row["distance"], row["gender"])
+        counts[(*event, ABSOLUTE_CATEGORY)] += row["results_count"]
+        if row["category"] is not None:
+            counts[(*event, row["category"])] += row["results_count"]
+    return dict(counts)
+
+
+def eligible_combinations(availability: dict[AvailabilityKey, int]) -> list[tuple]:
+    return [
+        (style, gender, category)
+        for style, gender, category in COMBINATIONS
+        if availability.get(
+            (style["stroke"], style["distance"], gender, category["id"]), 0
+        ) >= MIN_TOP_RESULTS
+    ]
+
+
+async def get_top_availability(redis: Redis) -> dict[AvailabilityKey, int]:
+    """Матрица доступности топов текущего сезона; сбрасывается записью любых результатов."""
+    current_year = date.today().year
+    season = get_current_season()
+
+    async def compute():
+        query = build_top_availability_query(current_year, season)
+        return build_availability(await execute_query(query))
+
+    return await get_or_compute_tagged(
+        redis,
+        f"top_availability:{season}:{current_year}",
+        [ALL_EVENTS_TAG],
+        compute,
+        expire_seconds=AVAILABILITY_TTL,
+    )
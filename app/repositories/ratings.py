@@ -1,17 +1,30 @@
 import logging
 from collections import defaultdict
-from datetime import time
+from datetime import date, time
+from typing import AsyncIterator, Iterable, Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from redis.asyncio import Redis
 
-from app.repositories.get_top_results import get_top_results
-from app.schemas.results.top import parse_best_full_result
-from app.shared.cache.redis_compressed import RedisCachePickleCompressed
-from app.shared.utils.metadata import categories
+from app.repositories.sa.ratings import GLOBAL_SCOPE, SEASON_SCOPE, build_ratings_query
+from app.repositories.sa.top_results import get_current_season
+from app.repositories.sa.utils import stream_query
+from app.schemas.results.top import best_full_result_decoder
+from app.shared.utils.metadata import categories as CATEGORY_CONFIG
 from pymongo import UpdateOne
 
 _log = logging.getLogger(__name__)
 
 BATCH_SIZE = 1000
+ABSOLUTE_CATEGORY = "absolute"
+
+DIRTY_PARTITIONS_KEY = "ratings:dirty:partitions"
+# члены вида athlete_id:stroke:distance — чьи записи в каких дисциплинах пересобрать целиком
+DIRTY_ATHLETE_EVENTS_KEY = "ratings:dirty:athlete_events"
+RANKING_KEYS = [
+    f"{scope}:{category['id']}"
+    for scope in (SEASON_SCOPE, GLOBAL_SCOPE)
+    for category in CATEGORY_CONFIG
+]
 
 
 def as_duration(result: time):
@@ -23,39 +36,288 @@ def as_duration(result: time):
     )
 
 
+def rankings_from_row(row: dict) -> list[tuple[str, dict]]:
+    """Строка рейтинга -> пары (ключ рейтинга, сериализованный BestFullResult)."""
+    scope = row["scope"]
+    entries = [(f"{scope}:{ABSOLUTE_CATEGORY}", row["absolute_row_num"])]
+    if row["category"] is not None:
+        entries.append((f"{scope}:{row['category']}", row["category_row_num"]))
+
+    item = best_full_result_decoder.decode(row, 0)
+    return [(key, {**item, "row_num": row_num}) for key, row_num in entries]
+
+
+def category_for_birth_year(birth_year, current_year: int) -> Optional[str]:
+    """Python-зеркало build_category_expression."""
+    try:
+        birth_year = int(birth_year)
+    except (TypeError, ValueError):
+        return None
+
+    for cfg in CATEGORY_CONFIG:
+        min_age, max_age = cfg["min_age"], cfg["max_age"]
+        if min_age is None and max_age is None:
+            continue
+        if max_age is not None and birth_year < current_year - max_age:
+            continue
+        if min_age is not None and birth_year > current_year - min_age:
+            continue
+        return cfg["id"]
+    return None
+
+
+def partition_member(stroke: str, distance: int, gender: str, category: str) -> str:
+    return f"{stroke}:{distance}:{gender}:{category}"
+
+
+def parse_partition_member(member: str | bytes) -> tuple[str, int, str, str]:
+    if isinstance(member, bytes):
+        member = member.decode()
+    stroke, distance, gender, category = member.split(":")
+    return stroke, int(distance), gender, category
+
+
+def athlete_event_member(athlete_id: int, stroke: str, distance: int) -> str:
+    return f"{athlete_id}:{stroke}:{distance}"
+
+
+def parse_athlete_event_member(member: str | bytes) -> tuple[int, str, int]:
+    if isinstance(member, bytes):
+        member = member.decode()
+    athlete_id, stroke, distance = member.split(":")
+    return int(athlete_id), stroke, int(distance)
+
+
+async def mark_ratings_dirty(
+    redis: Redis,
+    athletes: Iterable[dict],
+    events: Iterable[tuple[str, int]],
+) -> None:
+    """Запоминает партиции (stroke, distance, gender, category), затронутые записью.
+
+    Вместе с партициями запоминаются дисциплины каждого спортсмена: в пересчёте
+    его записи по ним заменяются целиком, а партиции его пола и категории
+    по этим дисциплинам попадают в пересчёт, так что заменять есть чем.
+    """
+    events = list(events)
+    current_year = date.today().year
+
+    members = set()
+    athlete_events = set()
+    for athlete in athletes:
+        categories = [ABSOLUTE_CATEGORY]
+        category = category_for_birth_year(athlete["birth_year"], current_year)
+        if category is not None:
+            categories.append(category)
+        for stroke, distance in events:
+            athlete_events.add(athlete_event_member(athlete["id"], stroke, distance))
+            for category in categories:
+                members.add(partition_member(stroke, distance, athlete["gender"], category))
+
+    if not members:
+        return
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.sadd(DIRTY_PARTITIONS_KEY, *members)
+        pipe.sadd(DIRTY_ATHLETE_EVENTS_KEY, *athlete_events)
+        await pipe.execute()
+
+
+DirtyAthletes = dict[int, set[tuple[str, int]]]
+
+
+async def _pop_dirty(redis: Redis) -> tuple[set[tuple[str, int, str, str]], DirtyAthletes]:
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.smembers(DIRTY_PARTITIONS_KEY)
+        pipe.smembers(DIRTY_ATHLETE_EVENTS_KEY)
+        pipe.delete(DIRTY_PARTITIONS_KEY, DIRTY_ATHLETE_EVENTS_KEY)
+        partitions, athlete_events, _ = await pipe.execute()
+
+    dirty_athletes: DirtyAthletes = defaultdict(set)
+    for member in athlete_events:
+        athlete_id, stroke, distance = parse_athlete_event_member(member)
+        dirty_athletes[athlete_id].add((stroke, distance))
+    return {parse_partition_member(member) for member in partitions}, dict(dirty_athletes)
+
+
+async def clear_ratings_dirty(redis: Redis) -> None:
+    await redis.delete(DIRTY_PARTITIONS_KEY, DIRTY_ATHLETE_EVENTS_KEY)
+
+
+async def delete_ratings(collection: AsyncIOMotorCollection, athlete_ids: Iterable[int]) -> None:
+    athlete_ids = list(athlete_ids)
+    if athlete_ids:
+        await collection.delete_many({"_id": {"$in": athlete_ids}})
+
+
+async def _stream_rating_rows(query) -> AsyncIterator[tuple[int, list[dict]]]:
+    """Строки рейтинга, сгруппированные по спортсмену (запрос отсортирован по athlete_id)."""
+    athlete_id = None
+    rows = []
+    async for row in stream_query(query, prefetch=BATCH_SIZE):
+        if row["athlete_id"] != athlete_id:
+            if athlete_id is not None:
+                yield athlete_id, rows
+            athlete_id = row["athlete_id"]
+            rows = []
+        rows.append(row)
+
+    if athlete_id is not None:
+        yield athlete_id, rows
+
+
+def _ranking_field_expression(key: str, drop_events: set[tuple[str, int]], entries: list[dict]):
+    """Aggregation-выражение: убрать записи drop_events из rankings.<key> и дописать entries."""
+    field = f"$rankings.{key}"
+    kept = {
+        "$filter": {
+            "input": {"$cond": [{"$isArray": field}, field, []]},
+            "as": "entry",
+            "cond": {
+                "$not": [{
+                    "$in": [
+                        ["$$entry.result.stroke", "$$entry.result.distance"],
+                        {"$literal": [list(event) for event in sorted(drop_events)]},
+                    ]
+                }]
+            },
+        }
+    }
+    merged = {"$concatArrays": [kept, {"$literal": entries}]}
+    return {
+        "$let": {
+            "vars": {"merged": merged},
+            "in": {"$cond": [{"$gt": [{"$size": "$$merged"}, 0]}, "$$merged", "$$REMOVE"]},
+        }
+    }
+
+
+async def _flush(collection: AsyncIOMotorCollection, operations: list[UpdateOne]):
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+        operations.clear()
+
+
 async def update_ratings(collection: AsyncIOMotorCollection):
     _log.info("Starting athlete rankings update")
 
-    athlete_results = defaultdict(lambda: defaultdict(list))
-
-    for season in [True, False]:
-        season_str = 'current_season' if season else 'global'
-        for category in categories:
-            _log.debug("Processing category '%s' for season '%s'",
-                       category['name'], season_str)
-
-            results = await get_top_results(min_age=category['min_age'],
-                                            max_age=category['max_age'],
-                                            current_season=season)
-            results = [parse_best_full_result(res) for res in results]
-            for top in results:
-                athlete_results[top.athlete.id][
-                    season_str + ':' + category['id']].append(
-                    top.model_dump(mode='json')
-                )
-    _log.info("Collected results for %d athletes", len(athlete_results))
-
-    operations = [
-        UpdateOne(
-            {"_id": athlete_id},
-            {"$set": {"rankings": dict(rankings)}},
-            upsert=True
+    current_date = date.today()
+    query = build_ratings_query(
+        current_year=current_date.year,
+        current_season=get_current_season(current_date),
+    )
+
+    operations: list[UpdateOne] = []
+    athletes_count = 0
+    async for athlete_id, rows in _stream_rating_rows(query):
+        rankings = defaultdict(list)
+        for row in rows:
+            for key, payload in rankings_from_row(row):
+                rankings[key].append(payload)
+
+        operations.append(
+            UpdateOne(
+                {"_id": athlete_id},
+                {"$set": {"rankings": dict(rankings)}},
+                upsert=True
+            )
         )
-        for athlete_id, rankings in athlete_results.items()
-    ]
+        athletes_count += 1
+        if len(operations) >= BATCH_SIZE:
+            await _flush(collection, operations)
+
+    await _flush(collection, operations)
+    _log.info("Saved ranking results for %d athletes", athletes_count)
+
+
+async def update_ratings_delta(collection: AsyncIOMotorCollection, redis: Redis):
+    """Пересчитывает только партиции, затронутые записями с прошлого запуска."""
+    partitions, dirty_athletes = await _pop_dirty(redis)
+    if not partitions:
+        _log.debug("No dirty rating partitions")
+        return
+
+    try:
+        await _update_partitions(collection, partitions, dirty_athletes)
+    except Exception:
+        # вернуть партиции, чтобы их подобрал следующий запуск
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(DIRTY_PARTITIONS_KEY, *(partition_member(*p) for p in partitions))
+            if dirty_athletes:
+                pipe.sadd(DIRTY_ATHLETE_EVENTS_KEY, *(
+                    athlete_event_member(athlete_id, *event)
+                    for athlete_id, events in dirty_athletes.items()
+                    for event in events
+                ))
+            await pipe.execute()
+        raise
+
+
+def rating_update(
+    partitions: set[tuple[str, int, str, str]],
+    rows: list[dict],
+    own_events: Iterable[tuple[str, int]] = (),
+) -> tuple[dict, bool]:
+    """Поля $set для документа спортсмена после пересчёта partitions.
+
+    В каждом ключе заменяются дисциплины, по которым пересчитана его партиция,
+    и собственные изменённые дисциплины спортсмена (own_events) — во всех ключах:
+    место могло пропасть, а категория или пол смениться. Второе значение — были ли строки.
+    """
+    entries = defaultdict(list)
+    events = defaultdict(set)
+    for row in rows:
+        for key, payload in rankings_from_row(row):
+            stroke, distance, gender = row["result_stroke"], row["result_distance"], row["athlete_gender"]
+            if (stroke, distance, gender, key.split(":", 1)[1]) not in partitions:
+                continue
+            entries[key].append(payload)
+            events[key].add((stroke, distance))
+
+    has_entries = bool(entries)
+    own_events = set(own_events)
+    keys = RANKING_KEYS if own_events else list(entries)
+    fields = {
+        f"rankings.{key}": _ranking_field_expression(key, events[key] | own_events, entries[key])
+        for key in keys
+    }
+    return fields, has_entries
+
+
+async def _update_partitions(
+    collection: AsyncIOMotorCollection,
+    partitions: set[tuple[str, int, str, str]],
+    dirty_athletes: DirtyAthletes,
+):
+    current_date = date.today()
+    query = build_ratings_query(
+        current_year=current_date.year,
+        current_season=get_current_season(current_date),
+        partitions={(stroke, distance, gender) for stroke, distance, gender, _ in partitions},
+    )
+
+    operations: list[UpdateOne] = []
+    athletes_count = 0
+
+    def add_operation(athlete_id: int, rows: list[dict]):
+        fields, has_entries = rating_update(partitions, rows, dirty_athletes.get(athlete_id, ()))
+        if fields:
+            # без строк документ только чистится: не создавать его для удалённых спортсменов
+            operations.append(UpdateOne({"_id": athlete_id}, [{"$set": fields}], upsert=has_entries))
+
+    seen = set()
+    async for athlete_id, rows in _stream_rating_rows(query):
+        seen.add(athlete_id)
+        add_operation(athlete_id, rows)
+        athletes_count += 1
+        if len(operations) >= BATCH_SIZE:
+            await _flush(collection, operations)
+
+    for athlete_id in dirty_athletes.keys() - seen:
+        add_operation(athlete_id, [])
 
-    await collection.bulk_write(operations)
-    _log.info("Saved ranking results for athletes")
+    await _flush(collection, operations)
+    _log.info("Refreshed %d rating partitions for %d athletes",
+              len(partitions), athletes_count)
 
 
 async def get_ratings(collection: AsyncIOMotorCollection, id: int):
@@ -0,0 +1,91 @@
+from typing import Sequence
+
+from sqlalchemy import Integer, String, and_, case, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.repositories.sa.models import athletes
+
+CREATE_COLUMNS = ("last_name", "first_name", "birth_year", "gender", "city", "club", "license")
+# None в строке обновления значит «не менять»
+UPDATE_COLUMNS = CREATE_COLUMNS
+
+
+def _unnest(columns: dict[str, Sequence], types: dict[str, type]):
+    """unnest параллельных массивов с номером строки: один параметр на колонку."""
+    arrays = [literal(list(values), ARRAY(types.get(name, String))) for name, values in columns.items()]
+    return func.unnest(*arrays).table_valued(*columns, with_ordinality="ord").render_derived("input")
+
+
+def build_create_athletes_query(rows: Sequence[dict]):
+    """INSERT из unnest; id выдаются заранее, поэтому ответ идёт в порядке входа.
+
+    ON CONFLICT не используется: у athletes нет естественного уникального ключа
+    (ФИО + год не уникальны), конфликтовать вставке не с чем.
+    """
+    source = _unnest({name: [row[name] for row in rows] for name in CREATE_COLUMNS}, {})
+    numbered = (
+        select(
+            func.nextval(text("pg_get_serial_sequence('athletes', 'id')")).label("id"),
+            source.c.ord,
+            *(source.c[name] for name in CREATE_COLUMNS),
+        )
+        .cte("numbered")
+    )
+    inserted = (
+        insert(athletes)
+        .from_select(
+            ["id", *CREATE_COLUMNS],
+            select(numbered.c.id, *(numbered.c[name] for name in CREATE_COLUMNS)),
+        )
+        .returning(*athletes.c)
+        .cte("inserted")
+    )
+    return (
+        select(*inserted.c)
+        .select_from(inserted.join(numbered, numbered.c.id == inserted.c.id))
+        .order_by(numbered.c.ord)
+    )
+
+
+def build_update_athletes_query(rows: Sequence[dict]):
+    """UPDATE ... FROM unnest: меняются только строки, где какое-то значение отличается.
+
+    Ответ — все запрошенные спортсмены в порядке входа, уже с новыми значениями,
+    и флаг changed для тех, кого UPDATE действительно коснулся.
+
+    Пропуск идёт по строкам, а не по колонкам: список SET у UPDATE общий на все
+    строки, а Postgres при обновлении всё равно пишет новую версию строки целиком,
+    так что CASE на каждую колонку не уменьшил бы запись. Строки без изменений
+    не пишутся вовсе, и updated_at у них не трогается.
+    """
+    source = _unnest(
+        {"id": [row["id"] for row in rows], **{name: [row.get(name) for row in rows] for name in UPDATE_COLUMNS}},
+        {"id": Integer},
+    )
+    changes = [
+        and_(source.c[name].isnot(None), source.c[name].is_distinct_from(athletes.c[name]))
+        for name in UPDATE_COLUMNS
+    ]
+    updated = (
+        update(athletes)
+        .values(
+            **{name: func.coalesce(source.c[name], athletes.c[name]) for name in UPDATE_COLUMNS},
+            updated_at=func.now(),
+        )
+        .where(athletes.c.id == source.c.id, or_(*changes))
+        .returning(*athletes.c)
+        .cte("updated")
+    )
+    changed = updated.c.id.isnot(None)
+    return (
+        select(
+            *(case((changed, updated.c[column.name]), else_=column).label(column.name) for column in athletes.c),
+            changed.label("changed"),
+        )
+        .select_from(
+            source
+            .join(athletes, athletes.c.id == source.c.id)
+            .outerjoin(updated, updated.c.id == source.c.id)
+        )
+        .order_by(source.c.ord)
+    )
@@ -0,0 +1,81 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import Integer, delete, distinct, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from app.repositories.sa.models import athlete_stats, athletes, competitions, results
+from app.repositories.sa.utils import any_of
+
+PODIUM_PLACES = ("1", "2", "3")
+# первый ключ pg_advisory_xact_lock(int, int): пространство блокировок athlete_stats
+ATHLETE_STATS_LOCK_SPACE = 1002
+
+
+def build_lock_athlete_stats_query(athlete_ids: Sequence[int]):
+    """Транзакционные блокировки спортсменов в порядке ids (ids отсортированы — без дедлоков)."""
+    athlete_id = func.unnest(literal(list(athlete_ids), ARRAY(Integer))).column_valued("athlete_id")
+    return select(func.pg_advisory_xact_lock(ATHLETE_STATS_LOCK_SPACE, athlete_id))
+
+
+def build_delete_athlete_stats_query(athlete_ids: Optional[Sequence[int]] = None):
+    query = delete(athlete_stats)
+    if athlete_ids is not None:
+        query = query.where(any_of(athlete_stats.c.athlete_id, athlete_ids, Integer))
+    return query
+
+
+def build_insert_athlete_stats_query(athlete_ids: Optional[Sequence[int]] = None):
+    filters = []
+    if athlete_ids is not None:
+        filters.append(any_of(results.c.athlete_id, athlete_ids, Integer))
+
+    stats = (
+        select(
+            results.c.athlete_id,
+            func.count(distinct(results.c.competition_id)),
+            func.count().filter(any_of(results.c.place, PODIUM_PLACES)),
+            func.count(),
+            # личный рекорд — лучшее время в каждой дисциплине
+            func.count(distinct(tuple_(results.c.stroke, results.c.distance)))
+            .filter(results.c.resolved_time.isnot(None)),
+            func.max(competitions.c.start_date),
+        )
+        .select_from(
+            results.join(competitions, competitions.c.id == results.c.competition_id)
+        )
+        .where(*filters)
+        .group_by(results.c.athlete_id)
+    )
+
+    return insert(athlete_stats).from_select(
+        [
+            "athlete_id",
+            "competitions_count",
+            "podiums_count",
+            "results_count",
+            "personal_bests_count",
+            "last_competition_date",
+        ],
+        stats,
+    )
+
+
+def build_athlete_detail_query(athlete_id: int):
+    """Спортсмен вместе со статистикой одним поиском по первичному ключу."""
+    counters = (
+        athlete_stats.c.competitions_count,
+        athlete_stats.c.podiums_count,
+        athlete_stats.c.results_count,
+        athlete_stats.c.personal_bests_count,
+    )
+    return (
+        select(
+            *athletes.c,
+            *(func.coalesce(column, 0).label(column.name) for column in counters),
+            athlete_stats.c.last_competition_date,
+        )
+        .select_from(
+            athletes.outerjoin(athlete_stats, athlete_stats.c.athlete_id == athletes.c.id)
+        )
+        .where(athletes.c.id == athlete_id)
+    )
@@ -0,0 +1,96 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import (Integer, and_, any_, case, cast, delete, func, literal,
+                        literal_column, select)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from app.repositories.sa.models import best_results, competitions, results
+
+# первый ключ pg_advisory_xact_lock(int, int): пространство блокировок best_results
+BEST_RESULTS_LOCK_SPACE = 1001
+
+
+def season_expression(start_date_col):
+    """Сезон начинается 1 сентября: 2024-09-01..2025-08-31 -> 2024."""
+    return (
+        cast(func.extract("year", start_date_col), Integer)
+        - case(
+            (func.extract("month", start_date_col) < literal_column("9"),
+             literal_column("1", Integer)),
+            else_=literal_column("0", Integer),
+        )
+    )
+
+
+def build_lock_best_results_query(athlete_ids: Sequence[int]):
+    """Транзакционные блокировки спортсменов в порядке ids (ids отсортированы — без дедлоков).
+
+    course и status допускают NULL, а NULL в уникальном ключе не конфликтует,
+    поэтому ON CONFLICT здесь не спасает: параллельные пересчёты одного
+    спортсмена разводятся блокировкой.
+    """
+    athlete_id = func.unnest(literal(list(athlete_ids), ARRAY(Integer))).column_valued("athlete_id")
+    return select(func.pg_advisory_xact_lock(BEST_RESULTS_LOCK_SPACE, athlete_id))
+
+
+def build_delete_best_results_query(athlete_ids: Optional[Sequence[int]] = None):
+    query = delete(best_results)
+    if athlete_ids is not None:
+        query = query.where(
+            best_results.c.athlete_id == any_(
+                literal(list(athlete_ids), ARRAY(Integer)))
+        )
+    return query
+
+
+def build_insert_best_results_query(athlete_ids: Optional[Sequence[int]] = None):
+    season = season_expression(competitions.c.start_date)
+    group_columns = (
+        results.c.athlete_id,
+        results.c.stroke,
+        results.c.distance,
+        season,
+        competitions.c.course,
+        competitions.c.status,
+    )
+
+    filters = [results.c.resolved_time.isnot(None)]
+    if athlete_ids is not None:
+        filters.append(
+            results.c.athlete_id == any_(
+                literal(list(athlete_ids), ARRAY(Integer)))
+        )
+
+    best = (
+        select(
+            results.c.athlete_id,
+            results.c.id,
+            results.c.stroke,
+            results.c.distance,
+            season.label("season"),
+            competitions.c.course,
+            competitions.c.status,
+            results.c.resolved_time,
+        )
+        .select_from(
+            results.join(
+                competitions, competitions.c.id == results.c.competition_id)
+        )
+        .where(and_(*filters))
+        .distinct(*group_columns)
+        .order_by(*group_columns, results.c.resolved_time, results.c.id)
+    )
+
+    return insert(best_results).from_select(
+        [
+            "athlete_id",
+            "result_id",
+            "stroke",
+            "distance",
+            "season",
+            "course",
+            "status",
+            "resolved_time",
+        ],
+        best,
+    )
@@ -0,0 +1,62 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import Integer, delete, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.repositories.sa.models import athletes, competitions, content_last_modified, results
+from app.repositories.sa.utils import any_of
+
+ATHLETE = "athlete"
+COMPETITION = "competition"
+
+# сущность -> (таблица, колонка results со ссылкой на неё)
+_SOURCES = {
+    ATHLETE: (athletes, results.c.athlete_id),
+    COMPETITION: (competitions, results.c.competition_id),
+}
+
+
+def build_delete_vanished_last_modified_query(
+    entity_type: str,
+    entity_ids: Optional[Sequence[int]] = None,
+):
+    """Строки удалённых сущностей: upsert их не трогает."""
+    table, _ = _SOURCES[entity_type]
+    query = delete(content_last_modified).where(
+        content_last_modified.c.entity_type == entity_type,
+        ~exists().where(table.c.id == content_last_modified.c.entity_id),
+    )
+    if entity_ids is not None:
+        query = query.where(any_of(content_last_modified.c.entity_id, entity_ids, Integer))
+    return query
+
+
+def build_insert_last_modified_query(entity_type: str, entity_ids: Optional[Sequence[int]] = None):
+    """Дата изменения сущности или её последнего результата — то, что раньше считал sitemap."""
+    table, result_column = _SOURCES[entity_type]
+    last_update = func.greatest(
+        func.date(table.c.updated_at),
+        func.coalesce(
+            func.max(func.date(results.c.updated_at)),
+            func.date(table.c.updated_at)
+        )
+    )
+    source = (
+        select(literal(entity_type), table.c.id, last_update)
+        .select_from(table.outerjoin(results, table.c.id == result_column))
+        .group_by(table.c.id)
+    )
+    if entity_ids is not None:
+        source = source.where(any_of(table.c.id, entity_ids, Integer))
+
+    # upsert, а не delete + insert: параллельные пересчёты одной сущности
+    # иначе упирались бы в уникальный ключ (entity_type, entity_id)
+    query = insert(content_last_modified).from_select(
+        ["entity_type", "entity_id", "last_update"],
+        source,
+    )
+    return query.on_conflict_do_update(
+        index_elements=[content_last_modified.c.entity_type, content_last_modified.c.entity_id],
+        set_={"last_update": query.excluded.last_update},
+        where=content_last_modified.c.last_update.is_distinct_from(query.excluded.last_update),
+    )
@@ -1,7 +1,12 @@
-from sqlalchemy import MetaData
+from sqlalchemy import Column, MetaData, String, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.models.athlete.athlete import Athlete
+from app.models.athlete.athlete_stats import AthleteStats
+from app.models.competition.best_result import BestResult
 from app.models.competition.competition import Competition
 from app.models.competition.result import Result
+from app.models.misc.content_last_modified import ContentLastModified
+from app.models.roles.coach import Coach
 from app.sql.utils import tortoise_model_to_sqlalchemy_table
 
 
@@ -9,3 +14,14 @@ metadata = MetaData()
 results = tortoise_model_to_sqlalchemy_table(Result)
 athletes = tortoise_model_to_sqlalchemy_table(Athlete)
 competitions = tortoise_model_to_sqlalchemy_table(Competition)
+best_results = tortoise_model_to_sqlalchemy_table(BestResult)
+athlete_stats = tortoise_model_to_sqlalchemy_table(AthleteStats)
+content_last_modified = tortoise_model_to_sqlalchemy_table(ContentLastModified)
+coaches = tortoise_model_to_sqlalchemy_table(Coach)
+# генерируемая колонка из init_postgres, в модели Tortoise её нет
+coaches.append_column(Column("search_vector", TSVECTOR))
+
+# генерируемые ключи имён (name_search_key) из init_postgres; в select(athletes)
+# они не попадают, иначе схемы Athlete_Pydantic с extra="forbid" их отвергнут
+athlete_last_name_key = literal_column("athletes.last_name_key", String)
+athlete_first_name_key = literal_column("athletes.first_name_key", String)
@@ -0,0 +1,30 @@
+from sqlalchemy import select
+
+from app.repositories.sa.models import athletes, competitions, results
+from app.repositories.sa.utils import label_columns
+
+
+def build_athlete_performances_query(athlete_id: int):
+    """Все результаты спортсмена с соревнованиями одним запросом.
+
+    LEFT JOIN от athletes: спортсмен без результатов даёт одну строку с NULL,
+    несуществующий — ни одной. Порядок уже тот, в котором строится ответ.
+    """
+    return (
+        select(
+            athletes.c.id.label("athlete_id"),
+            *label_columns(results, "result"),
+            *label_columns(competitions, "competition"),
+        )
+        .select_from(
+            athletes
+            .outerjoin(results, results.c.athlete_id == athletes.c.id)
+            .outerjoin(competitions, competitions.c.id == results.c.competition_id)
+        )
+        .where(athletes.c.id == athlete_id)
+        .order_by(
+            competitions.c.start_date.desc(),
+            competitions.c.id,
+            results.c.id,
+        )
+    )
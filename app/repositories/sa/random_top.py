@@ -0,0 +1,36 @@
+from datetime import date
+
+from sqlalchemy import func, select
+
+from app.repositories.sa.models import athletes, competitions, results
+from app.repositories.sa.ratings import build_category_expression
+
+
+def build_top_availability_query(current_year: int, season: int):
+    """Число результатов сезона по (stroke, distance, gender, category) одним запросом."""
+    season_results = (
+        select(
+            results.c.stroke,
+            results.c.distance,
+            athletes.c.gender,
+            build_category_expression(current_year).label("category"),
+        )
+        .select_from(
+            results
+            .join(athletes, athletes.c.id == results.c.athlete_id)
+            .join(competitions, competitions.c.id == results.c.competition_id)
+        )
+        .where(
+            competitions.c.start_date >= date(season, 9, 1),
+            competitions.c.start_date <= date(season + 1, 8, 31),
+        )
+        # CASE вычисляется один раз, группировка идёт по готовой колонке
+        .subquery("season_results")
+    )
+    columns = (
+        season_results.c.stroke,
+        season_results.c.distance,
+        season_results.c.gender,
+        season_results.c.category,
+    )
+    return select(*columns, func.count().label("results_count")).group_by(*columns)
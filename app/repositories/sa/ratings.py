@@ -0,0 +1,126 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import Integer, and_, case, cast, literal, null, or_, select, union_all
+from sqlalchemy.sql.functions import dense_rank
+
+from app.repositories.sa.models import athletes, best_results, competitions, results
+from app.repositories.sa.utils import label_columns
+from app.shared.utils.metadata import categories as CATEGORY_CONFIG
+
+SEASON_SCOPE = "current_season"
+GLOBAL_SCOPE = "global"
+
+
+def build_category_expression(current_year: int):
+    """Возрастная категория спортсмена (без абсолютной) или NULL."""
+    birth_year = cast(athletes.c.birth_year, Integer)
+    whens = []
+    for cfg in CATEGORY_CONFIG:
+        min_age, max_age = cfg["min_age"], cfg["max_age"]
+        if min_age is None and max_age is None:
+            continue
+
+        conditions = []
+        if max_age is not None:
+            conditions.append(birth_year >= current_year - max_age)
+        if min_age is not None:
+            conditions.append(birth_year <= current_year - min_age)
+        whens.append((and_(*conditions), literal(cfg["id"])))
+    return case(*whens, else_=null())
+
+
+def _build_scope_query(
+    scope: str,
+    current_year: int,
+    season: Optional[int],
+    partitions: Optional[list[tuple[str, int, str]]] = None,
+):
+    filters = []
+    athlete_filters = []
+    if season is not None:
+        filters.append(best_results.c.season == season)
+    if partitions is not None:
+        # окно ранжирования совпадает с фильтром, поэтому места не искажаются
+        filters.append(or_(*(
+            and_(best_results.c.stroke == stroke, best_results.c.distance == distance)
+            for stroke, distance in {(stroke, distance) for stroke, distance, _ in partitions}
+        )))
+        athlete_filters.append(or_(*(
+            and_(
+                results.c.stroke == stroke,
+                results.c.distance == distance,
+                athletes.c.gender == gender,
+            )
+            for stroke, distance, gender in partitions
+        )))
+
+    best_subq = (
+        select(best_results.c.result_id)
+        .where(*filters)
+        .distinct(
+            best_results.c.athlete_id,
+            best_results.c.stroke,
+            best_results.c.distance,
+        )
+        .order_by(
+            best_results.c.athlete_id,
+            best_results.c.stroke,
+            best_results.c.distance,
+            best_results.c.resolved_time,
+            best_results.c.result_id,
+        )
+        .subquery(f"best_{scope}")
+    )
+
+    category = build_category_expression(current_year)
+    return (
+        select(
+            *label_columns(results, "result"),
+            *label_columns(athletes, "athlete"),
+            *label_columns(competitions, "competition"),
+            literal(scope).label("scope"),
+            category.label("category"),
+            dense_rank().over(
+                partition_by=[
+                    results.c.stroke,
+                    results.c.distance,
+                    athletes.c.gender,
+                    category,
+                ],
+                order_by=results.c.resolved_time,
+            ).label("category_row_num"),
+            dense_rank().over(
+                partition_by=[
+                    results.c.stroke,
+                    results.c.distance,
+                    athletes.c.gender,
+                ],
+                order_by=results.c.resolved_time,
+            ).label("absolute_row_num"),
+        )
+        .select_from(
+            results
+            .join(best_subq, best_subq.c.result_id == results.c.id)
+            .join(athletes, athletes.c.id == results.c.athlete_id)
+            .join(competitions, competitions.c.id == results.c.competition_id)
+        )
+        .where(*athlete_filters)
+    )
+
+
+def build_ratings_query(
+    current_year: int,
+    current_season: int,
+    partitions: Optional[Iterable[tuple[str, int, str]]] = None,
+):
+    """Все места всех спортсменов за один проход, сгруппированные по спортсмену.
+
+    partitions — тройки (stroke, distance, gender), которыми ограничить пересчёт.
+    """
+    if partitions is not None:
+        partitions = sorted(set(partitions))
+    query = union_all(
+        _build_scope_query(SEASON_SCOPE, current_year, current_season, partitions),
+        _build_scope_query(GLOBAL_SCOPE, current_year, None, partitions),
+    ).subquery("ratings")
+    return select(query).order_by(query.c.athlete_id)
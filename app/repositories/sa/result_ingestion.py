@@ -0,0 +1,91 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, cast, insert, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB, TIME
+from sqlalchemy.schema import CreateTable
+
+from app.repositories.sa.models import athletes, competitions, results
+
+# Временная таблица сессии: строки загружаются в неё через COPY и исчезают
+# вместе с транзакцией. id результата выдаётся при загрузке (DEFAULT nextval),
+# поэтому вставленную строку можно сопоставить с номером строки загрузки.
+result_staging = Table(
+    "result_staging",
+    MetaData(),
+    Column("row_no", Integer, nullable=False),
+    Column(
+        "result_id",
+        Integer,
+        nullable=False,
+        server_default=text("nextval(pg_get_serial_sequence('results', 'id'))"),
+    ),
+    Column("athlete_id", Integer, nullable=False),
+    Column("competition_id", Integer, nullable=False),
+    Column("stroke", String),
+    Column("distance", Integer),
+    Column("result", TIME(timezone=True)),
+    Column("final", TIME(timezone=True)),
+    Column("place", String),
+    Column("final_rank", String),
+    Column("points", String),
+    Column("record", String),
+    Column("status", String),
+    Column("metadata", Text),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+# колонки, которые заполняет COPY (result_id берётся из DEFAULT)
+STAGING_COLUMNS = tuple(column.name for column in result_staging.c if column.name != "result_id")
+RESULT_VALUE_COLUMNS = STAGING_COLUMNS[3:]
+
+
+def build_create_staging_sql() -> str:
+    return str(CreateTable(result_staging).compile(dialect=postgresql.dialect()))
+
+
+def build_ingest_results_query():
+    """Одна вставка из staging и построчный отчёт: вставленная строка или причина отказа.
+
+    Строки, чей спортсмен или соревнование исчезли после проверки, не вставляются.
+    """
+    staging = result_staging
+    source = (
+        select(
+            staging.c.result_id,
+            staging.c.athlete_id,
+            staging.c.competition_id,
+            *(staging.c[name] for name in RESULT_VALUE_COLUMNS if name != "metadata"),
+            cast(staging.c.metadata, JSONB),
+        )
+        .select_from(
+            staging
+            .join(athletes, athletes.c.id == staging.c.athlete_id)
+            .join(competitions, competitions.c.id == staging.c.competition_id)
+        )
+        .order_by(staging.c.row_no)
+    )
+    inserted = (
+        insert(results)
+        .from_select(
+            ["id", "athlete_id", "competition_id", *RESULT_VALUE_COLUMNS],
+            source,
+        )
+        .returning(*results.c)
+        .cte("inserted")
+    )
+
+    return (
+        select(
+            staging.c.row_no,
+            athletes.c.id.is_(None).label("athlete_missing"),
+            competitions.c.id.is_(None).label("competition_missing"),
+            *inserted.c,
+        )
+        .select_from(
+            staging
+            .outerjoin(inserted, inserted.c.id == staging.c.result_id)
+            .outerjoin(athletes, athletes.c.id == staging.c.athlete_id)
+            .outerjoin(competitions, competitions.c.id == staging.c.competition_id)
+        )
+        .order_by(staging.c.row_no)
+    )
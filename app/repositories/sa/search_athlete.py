@@ -1,6 +1,10 @@
 from typing import Optional
-from sqlalchemy import select, func, or_, and_, String
-from app.repositories.sa.models import athletes
+from sqlalchemy import Float, and_, bindparam, case, func, or_, select, true, String
+from app.repositories.sa.models import athlete_first_name_key, athlete_last_name_key, athletes
+from app.repositories.sa.utils import any_of
+from app.shared.utils.name_keys import KEY_PREFIX_MIN_LENGTH, KEY_PREFIX_UPPER, name_search_key
+
+ADMIN_SCORE_COLUMN = "search_score"
 
 
 def build_athlete_search_query(user_input: str, limit: Optional[int], similarity_threshold: float = 0.3):
@@ -46,3 +50,129 @@ def build_athlete_search_query(user_input: str, limit: Optional[int], similarity
         stmt = stmt.limit(limit)
 
     return stmt
+
+
+def _key_match(column, key: str):
+    # ключи в COLLATE "C": диапазон обслуживается btree-индексом и при generic-плане
+    if len(key) >= KEY_PREFIX_MIN_LENGTH:
+        return and_(column >= key, column < key + KEY_PREFIX_UPPER)
+    return column == key
+
+
+def build_athlete_key_search_query(keys: list[str], limit: Optional[int]):
+    """Поиск по ключам имён (name_search_key): точные совпадения выше префиксных."""
+    last_key, first_key = athlete_last_name_key, athlete_first_name_key
+    if len(keys) == 1:
+        where_expr = or_(_key_match(last_key, keys[0]), _key_match(first_key, keys[0]))
+    else:
+        k1, k2 = keys
+        where_expr = or_(
+            and_(_key_match(last_key, k1), _key_match(first_key, k2)),
+            and_(_key_match(last_key, k2), _key_match(first_key, k1)),
+        )
+
+    exact_matches = (
+        case((any_of(last_key, keys), 1), else_=0)
+        + case((any_of(first_key, keys), 1), else_=0)
+    )
+    stmt = (
+        select(athletes)
+        .where(where_expr)
+        .order_by(exact_matches.desc(), last_key, first_key, athletes.c.id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _name_match(column, key_column, word: str):
+    # % сравнивает с pg_trgm.similarity_threshold и идёт по GIN-индексу;
+    # ключ имени ловит короткие префиксы и транслитерацию, которые триграммы не видят
+    conds = [column.op("%")(word)]
+    key = name_search_key(word)
+    if key:
+        conds.append(_key_match(key_column, key))
+    return or_(*conds)
+
+
+def _name_pairs(words: list[str]) -> list[tuple[str, str]]:
+    """(фамилия, имя) для запроса из нескольких слов в обоих порядках."""
+    first, second, *rest = words
+    return [
+        (first, " ".join([second, *rest])),
+        (second, " ".join([first, *rest])),
+    ]
+
+
+def build_admin_athlete_search_query(
+    query: Optional[str] = None,
+    last_name: Optional[str] = None,
+    first_name: Optional[str] = None,
+    birth_year: Optional[int] = None,
+    club: Optional[str] = None,
+    gender: Optional[str] = None,
+    limit: int = 50,
+    after: Optional[tuple[Optional[float], int]] = None,
+):
+    """Поиск для админки: сходство по триграммам, keyset-пагинация по (score, id)."""
+    conds = []
+    words = []
+    for word in (query or "").split():
+        # год рождения в запросе — точный фильтр, а не часть имени
+        if word.isdigit() and len(word) == 4:
+            conds.append(athletes.c.birth_year == word)
+        else:
+            words.append(word)
+
+    if last_name:
+        conds.append(athletes.c.last_name.icontains(last_name, autoescape=True))
+    if first_name:
+        conds.append(athletes.c.first_name.icontains(first_name, autoescape=True))
+    if birth_year:
+        conds.append(athletes.c.birth_year == str(birth_year))
+    if club:
+        conds.append(athletes.c.club.icontains(club, autoescape=True))
+    if gender:
+        conds.append(athletes.c.gender == gender)
+
+    last, first = athletes.c.last_name, athletes.c.first_name
+    if not words:
+        stmt = select(athletes).where(and_(true(), *conds))
+        if after is not None:
+            stmt = stmt.where(athletes.c.id > after[1])
+        return stmt.order_by(athletes.c.id).limit(limit)
+
+    if len(words) == 1:
+        word = words[0]
+        conds.append(or_(
+            _name_match(last, athlete_last_name_key, word),
+            _name_match(first, athlete_first_name_key, word),
+        ))
+        score = func.greatest(func.similarity(last, word), func.similarity(first, word))
+    else:
+        pairs = _name_pairs(words)
+        conds.append(or_(*(
+            and_(_name_match(last, athlete_last_name_key, last_word),
+                 _name_match(first, athlete_first_name_key, first_word))
+            for last_word, first_word in pairs
+        )))
+        # сумма, а не среднее: деление увело бы real в numeric
+        score = func.greatest(*(
+            func.similarity(last, last_word) + func.similarity(first, first_word)
+            for last_word, first_word in pairs
+        ))
+
+    matches = (
+        select(athletes, score.label(ADMIN_SCORE_COLUMN))
+        .where(and_(*conds))
+        .subquery("matches")
+    )
+    matched_score = matches.c[ADMIN_SCORE_COLUMN]
+    stmt = select(matches)
+    if after is not None:
+        after_score = bindparam("after_score", after[0], type_=Float)
+        stmt = stmt.where(or_(
+            matched_score < after_score,
+            and_(matched_score == after_score, matches.c.id > after[1]),
+        ))
+    return stmt.order_by(matched_score.desc(), matches.c.id).limit(limit)
@@ -0,0 +1,38 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func, literal_column, select
+
+from app.repositories.sa.models import coaches
+
+COACH_SEARCH_CONFIG = "simple"
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# то же выражение, что в генерируемой колонке coach.search_vector
+COACH_SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple', translate(lower("
+    "coalesce(last_name, '') || ' ' || coalesce(first_name, '') || ' ' || "
+    "coalesce(middle_name, '') || ' ' || coalesce(club, '') || ' ' || coalesce(city, '')"
+    "), 'ё', 'е'))"
+)
+
+
+def build_prefix_tsquery(user_input: str) -> Optional[str]:
+    """Слова ввода -> 'слово:* & ...'; в выражение попадают только буквы и цифры."""
+    words = _WORD_RE.findall(user_input.lower().replace("ё", "е"))
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def build_coach_search_query(tsquery: str, limit: int):
+    # конфигурация — литерал: параметр пришлось бы передавать как regconfig
+    query = func.to_tsquery(literal_column(f"'{COACH_SEARCH_CONFIG}'"), tsquery)
+    rank = func.ts_rank(coaches.c.search_vector, query)
+    return (
+        select(*(column for column in coaches.c if column.name != "search_vector"))
+        .where(coaches.c.search_vector.op("@@")(query))
+        .order_by(rank.desc(), coaches.c.last_name, coaches.c.id)
+        .limit(limit)
+    )
@@ -1,48 +1,60 @@
+from typing import Optional
+
 from sqlalchemy import (
-    select, func
+    literal, select, func
 )
-from app.repositories.sa.models import athletes, results, competitions
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.repositories.sa.models import content_last_modified
 
 
-def build_competitions_last_update_query():
+def build_last_modified_query(entity_type: str, id_range: Optional[tuple[int, int]] = None):
+    """(id, last_update) сущностей из проекции content_last_modified — чтение по индексу."""
     query = (
         select(
-            competitions.c.id,
-            func.greatest(
-                func.date(competitions.c.updated_at),
-                func.coalesce(
-                    func.max(func.date(results.c.updated_at)),
-                    func.date(competitions.c.updated_at)
-                )
-            ).label("last_update"),
-        )
-        .select_from(
-            competitions.outerjoin(
-                results, competitions.c.id == results.c.competition_id
-            )
+            content_last_modified.c.entity_id.label("id"),
+            content_last_modified.c.last_update,
         )
-        .group_by(competitions.c.id)
+        .where(content_last_modified.c.entity_type == entity_type)
     )
+    if id_range is not None:
+        low, high = id_range
+        query = query.where(
+            content_last_modified.c.entity_id >= low,
+            content_last_modified.c.entity_id < high,
+        ).order_by(content_last_modified.c.entity_id)
     return query
 
 
-def build_athletes_last_update_query():
-    query = (
+def build_shard_bounds_query(entity_type: str, shard_size: int):
+    """Первый и последний шард раздела: min/max по индексу, без чтения всей проекции."""
+    entity_id = content_last_modified.c.entity_id
+    return (
         select(
-            athletes.c.id,
-            func.greatest(
-                func.date(athletes.c.updated_at),
-                func.coalesce(
-                    func.max(func.date(results.c.updated_at)),
-                    func.date(athletes.c.updated_at)
-                )
-            ).label("last_update"),
+            (func.min(entity_id) // shard_size).label("first"),
+            (func.max(entity_id) // shard_size).label("last"),
         )
-        .select_from(
-            athletes.outerjoin(
-                results, athletes.c.id == results.c.athlete_id
-            )
+        .where(content_last_modified.c.entity_type == entity_type)
+    )
+
+
+def build_shard_summary_query(items_query, shard_size: int):
+    """Шарды по диапазонам id: число URL, последний lastmod и отпечаток содержимого.
+
+    Отпечаток меняется, только если у шарда поменялся набор id или чей-то lastmod.
+    """
+    items = items_query.subquery("items")
+    shard = (items.c.id // shard_size).label("shard")
+    fingerprint = func.md5(func.string_agg(
+        func.concat(items.c.id, ":", items.c.last_update),
+        aggregate_order_by(literal(","), items.c.id),
+    )).label("fingerprint")
+    return (
+        select(
+            shard,
+            func.count().label("urls"),
+            func.max(items.c.last_update).label("last_update"),
+            fingerprint,
         )
-        .group_by(athletes.c.id)
+        .group_by(shard)
+        .order_by(shard)
     )
-    return query
@@ -1,40 +1,201 @@
-from typing import Any, List, Optional
+from typing import Any, List, NamedTuple, Optional
 from sqlalchemy import (
-    CTE, Table, Integer, select, and_, func, cast, text, or_
+    CTE, Table, Integer, select, and_, func, cast, text, or_, tuple_, case
 )
 from sqlalchemy.sql.functions import dense_rank
-from datetime import date
+from datetime import date, time
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import array
-from app.repositories.sa.models import athletes, results, competitions
-from app.repositories.sa.utils import prepare_columns, label_columns
+from app.repositories.sa.models import athletes, results, competitions, best_results
+from app.repositories.sa.utils import any_of, prepare_columns, label_columns
 from app.shared.utils.metadata import categories as CATEGORY_CONFIG
 CATEGORY_INDEX = {c["id"]: c for c in CATEGORY_CONFIG}
 
 
-def build_top_results_query(
-    distance: Optional[int] = None,
-    stroke: Optional[str] = None,
-    gender: Optional[str] = None,
-    limit: Optional[int] = None,
-    offset: Optional[int] = None,
-    min_age: Optional[int] = None,
-    max_age: Optional[int] = None,
-    categories: Optional[List[str]] = None,
+class TopCursor(NamedTuple):
+    """Последняя строка предыдущей страницы топа."""
+    row_num: int
+    resolved_time: time
+    result_id: int
+
+
+def supports_top_cursor(
+    stroke: Optional[str],
+    distance: Optional[int],
+    gender: Optional[str],
+) -> bool:
+    """Курсор только внутри одной партиции ранга: в смеси партиций row_num не монотонен."""
+    return bool(stroke and distance and gender)
+
+
+def get_current_season(current_date: Optional[date] = None) -> int:
+    current_date = current_date or date.today()
+    return current_date.year if current_date.month >= 9 else current_date.year - 1
+
+
+def can_use_best_results(
     year: Optional[int] = None,
-    season: Optional[int] = None,
-    current_season: Optional[bool] = False,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    courses: Optional[List[str]] = None,
-    statuses: Optional[List[str]] = None,
+) -> bool:
+    # best_results агрегирует по сезонам, произвольные даты нужно считать по results
+    return year is None and start_date is None and end_date is None
+
+
+def build_age_conditions(
+    current_year: int,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    categories: Optional[List[str]] = None,
+) -> list:
+    conditions = []
+    birth_year = cast(athletes.c.birth_year, Integer)
+
+    # ✅ безопасная фильтрация по категориям
+    if categories:
+        age_conditions = []
+        for cat_id in categories:
+            cfg = CATEGORY_INDEX.get(cat_id)
+            if not cfg:
+                continue
+
+            min_cat_age = cfg["min_age"]
+            max_cat_age = cfg["max_age"]
+
+            # если категория абсолютная — пропускаем фильтр по возрасту
+            if min_cat_age is None and max_cat_age is None:
+                age_conditions = []
+                break
+
+            birth_min = current_year - max_cat_age if max_cat_age is not None else None
+            birth_max = current_year - min_cat_age if min_cat_age is not None else None
+
+            if birth_min is not None and birth_max is not None:
+                age_conditions.append(birth_year.between(birth_min, birth_max))
+            elif birth_min is not None:
+                age_conditions.append(birth_year >= birth_min)
+            elif birth_max is not None:
+                age_conditions.append(birth_year <= birth_max)
+
+        if age_conditions:
+            conditions.append(or_(*age_conditions))
+
+    # ✅ отдельные min/max_age параметры
+    if min_age is not None:
+        conditions.append(birth_year <= current_year - min_age)
+    if max_age is not None:
+        conditions.append(birth_year >= current_year - max_age)
+
+    return conditions
+
+
+def _row_num(after: Optional[TopCursor] = None):
+    window = dict(
+        partition_by=[
+            results.c.stroke,
+            results.c.distance,
+            athletes.c.gender
+        ],
+        order_by=results.c.resolved_time
+    )
+    row_num = dense_rank().over(**window)
+    if after is not None:
+        # строки до курсора отброшены ещё до окна: ранг продолжает ранг курсора,
+        # а время, равное времени курсора, делит с ним место
+        first_time = func.min(results.c.resolved_time).over(**window)
+        row_num = row_num + after.row_num - case((first_time == after.resolved_time, 1), else_=0)
+    return row_num.label("row_num")
+
+
+def _ranked_columns(after: Optional[TopCursor] = None):
+    return (
+        *label_columns(results, "result"),
+        *label_columns(athletes, "athlete"),
+        *label_columns(competitions, "competition"),
+        _row_num(after),
+    )
+
+
+def _build_from_best_results(
+    distance: Optional[int],
+    stroke: Optional[str],
+    gender: Optional[str],
+    season: Optional[int],
+    courses: Optional[List[str]],
+    statuses: Optional[List[str]],
+    age_conditions: list,
+    after: Optional[TopCursor] = None,
 ):
-    current_date = date.today()
-    current_year = current_date.year
+    filters = []
+    if stroke:
+        filters.append(best_results.c.stroke == stroke)
+    if distance:
+        filters.append(best_results.c.distance == distance)
+    if gender:
+        filters.append(athletes.c.gender == gender)
+    if season:
+        filters.append(best_results.c.season == season)
+
+    if courses:
+        courses_clean = [c for c in courses if c]
+        if courses_clean:
+            filters.append(any_of(best_results.c.course, courses_clean))
+
+    if statuses:
+        statuses_clean = [s for s in statuses if s]
+        if statuses_clean:
+            filters.append(any_of(best_results.c.status, statuses_clean))
+
+    filters.extend(age_conditions)
+
+    # лучший результат спортсмена среди всех сезонов/бассейнов/статусов,
+    # попавших под фильтры
+    best_subq = (
+        select(best_results.c.result_id)
+        .select_from(
+            best_results.join(
+                athletes, athletes.c.id == best_results.c.athlete_id)
+        )
+        .where(and_(*filters))
+        .distinct(
+            best_results.c.athlete_id,
+            best_results.c.stroke,
+            best_results.c.distance,
+        )
+        .order_by(
+            best_results.c.athlete_id,
+            best_results.c.stroke,
+            best_results.c.distance,
+            best_results.c.resolved_time,
+            best_results.c.result_id,
+        )
+        .subquery("best_results")
+    )
+
+    return (
+        select(*_ranked_columns(after))
+        .select_from(
+            results
+            .join(best_subq, best_subq.c.result_id == results.c.id)
+            .join(athletes, athletes.c.id == results.c.athlete_id)
+            .join(competitions, competitions.c.id == results.c.competition_id)
+        )
+    )
 
-    if current_season:
-        season = current_year if current_date.month >= 9 else current_year - 1
 
+def _build_from_results(
+    distance: Optional[int],
+    stroke: Optional[str],
+    gender: Optional[str],
+    year: Optional[int],
+    season: Optional[int],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    courses: Optional[List[str]],
+    statuses: Optional[List[str]],
+    age_conditions: list,
+    after: Optional[TopCursor] = None,
+):
     year_start = date(year, 1, 1) if year else None
     year_end = date(year, 12, 31) if year else None
     season_start = date(season, 9, 1) if season else None
@@ -69,13 +230,13 @@ def build_top_results_query(
         courses_clean = [c for c in courses if c]
         if courses_clean:
             best_results_filters.append(
-                competitions.c.course.in_(tuple(courses_clean)))
+                any_of(competitions.c.course, courses_clean))
 
     if statuses:
         statuses_clean = [s for s in statuses if s]
         if statuses_clean:
             best_results_filters.append(
-                competitions.c.status.in_(tuple(statuses_clean)))
+                any_of(competitions.c.status, statuses_clean))
 
     best_results_subq = (
         select(
@@ -99,19 +260,7 @@ def build_top_results_query(
     )
 
     query = (
-        select(
-            *label_columns(results, "result"),
-            *label_columns(athletes, "athlete"),
-            *label_columns(competitions, "competition"),
-            dense_rank().over(
-                partition_by=[
-                    results.c.stroke,
-                    results.c.distance,
-                    athletes.c.gender
-                ],
-                order_by=results.c.resolved_time
-            ).label("row_num")
-        )
+        select(*_ranked_columns(after))
         .select_from(
             results
             .join(athletes, athletes.c.id == results.c.athlete_id)
@@ -125,46 +274,86 @@ def build_top_results_query(
         )
         .where(and_(*base_filters))
     )
+    if age_conditions:
+        query = query.where(and_(*age_conditions))
+    return query
 
-    # ✅ безопасная фильтрация по категориям
-    if categories:
-        age_conditions = []
-        for cat_id in categories:
-            cfg = CATEGORY_INDEX.get(cat_id)
-            if not cfg:
-                continue
 
-            min_cat_age = cfg["min_age"]
-            max_cat_age = cfg["max_age"]
+def build_top_results_query(
+    distance: Optional[int] = None,
+    stroke: Optional[str] = None,
+    gender: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    categories: Optional[List[str]] = None,
+    year: Optional[int] = None,
+    season: Optional[int] = None,
+    current_season: Optional[bool] = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    courses: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    after: Optional[TopCursor] = None,
+):
+    """after — последняя строка предыдущей страницы (только при supports_top_cursor).
 
-            # если категория абсолютная — пропускаем фильтр по возрасту
-            if min_cat_age is None and max_cat_age is None:
-                age_conditions = []
-                break
+    Строки до курсора отсекаются до оконной функции, а ранг продолжается от
+    ранга курсора, так что глубокие страницы не пересчитывают начало топа.
+    """
+    current_date = date.today()
+    current_year = current_date.year
 
-            birth_min = current_year - max_cat_age if max_cat_age is not None else None
-            birth_max = current_year - min_cat_age if min_cat_age is not None else None
-            col = cast(athletes.c.birth_year, Integer)
+    if current_season:
+        season = get_current_season(current_date)
 
-            if birth_min is not None and birth_max is not None:
-                age_conditions.append(col.between(birth_min, birth_max))
-            elif birth_min is not None:
-                age_conditions.append(col >= birth_min)
-            elif birth_max is not None:
-                age_conditions.append(col <= birth_max)
+    age_conditions = build_age_conditions(
+        current_year,
+        min_age=min_age,
+        max_age=max_age,
+        categories=categories,
+    )
 
-        if age_conditions:
-            query = query.where(or_(*age_conditions))
+    if can_use_best_results(year, start_date, end_date):
+        query = _build_from_best_results(
+            distance=distance,
+            stroke=stroke,
+            gender=gender,
+            season=season,
+            courses=courses,
+            statuses=statuses,
+            age_conditions=age_conditions,
+            after=after,
+        )
+    else:
+        query = _build_from_results(
+            distance=distance,
+            stroke=stroke,
+            gender=gender,
+            year=year,
+            season=season,
+            start_date=start_date,
+            end_date=end_date,
+            courses=courses,
+            statuses=statuses,
+            age_conditions=age_conditions,
+            after=after,
+        )
 
-    # ✅ отдельные min/max_age параметры
-    if min_age is not None:
-        birth_max = current_year - min_age
-        query = query.where(cast(athletes.c.birth_year, Integer) <= birth_max)
-    if max_age is not None:
-        birth_min = current_year - max_age
-        query = query.where(cast(athletes.c.birth_year, Integer) >= birth_min)
+    if after is not None:
+        # в одной партиции порядок (resolved_time, id) совпадает с (row_num, id)
+        query = (
+            query
+            .where(
+                tuple_(results.c.resolved_time, results.c.id)
+                > tuple_(after.resolved_time, after.result_id)
+            )
+            .order_by(results.c.resolved_time, results.c.id)
+        )
+        return query.limit(limit) if limit else query
 
-    query = query.order_by(text("row_num"))
+    query = query.order_by(text("row_num"), results.c.id)
     if offset:
         query = query.offset(offset)
     if limit:
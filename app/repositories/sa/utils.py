@@ -1,6 +1,17 @@
-from typing import Any, Optional
-from sqlalchemy import CTE, Table
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Optional
+from sqlalchemy import CTE, String, Table, any_, literal
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from tortoise import Tortoise
+
+COMPILED_CACHE_SIZE = 512
+STREAM_PREFETCH = 500
+
+# asyncpg-диалект сразу компилирует в $n и проставляет типы параметров
+_dialect = asyncpg_dialect()
+_compiled_cache: OrderedDict = OrderedDict()
 
 
 def label_columns(table_or_cte: Table | CTE, prefix: str, include: Optional[set[str]] = None, exclude: Optional[set[str]] = None):
@@ -45,3 +56,54 @@ def compile_query_with_literals(query):
     )
     sql = str(compiled)
     return sql
+
+
+def any_of(column, values, item_type=String):
+    """column = ANY($n): один параметр-массив вместо IN с переменным числом параметров."""
+    return column == any_(literal(list(values), ARRAY(item_type)))
+
+
+def compile_query_cached(query):
+    """SQL с $n-параметрами; текст компилируется один раз на форму запроса.
+
+    Одинаковый текст позволяет asyncpg переиспользовать подготовленный
+    statement соединения, а Postgres — его план.
+    """
+    cache_key = query._generate_cache_key()
+    if cache_key is None:
+        compiled = query.compile(dialect=_dialect)
+        params = compiled.construct_params()
+    else:
+        compiled = _compiled_cache.get(cache_key.key)
+        if compiled is None:
+            compiled = query.compile(dialect=_dialect, cache_key=cache_key)
+            _compiled_cache[cache_key.key] = compiled
+            if len(_compiled_cache) > COMPILED_CACHE_SIZE:
+                _compiled_cache.popitem(last=False)
+        else:
+            _compiled_cache.move_to_end(cache_key.key)
+        params = compiled.construct_params(
+            extracted_parameters=cache_key.bindparams)
+
+    # имена параметров с точками и т.п. в params экранированы
+    escaped = compiled.escaped_bind_names
+    return compiled.string, [params[escaped.get(name, name)] for name in compiled.positiontup]
+
+
+async def execute_query(query, connection_name: str = "default") -> list[dict]:
+    sql, params = compile_query_cached(query)
+    return await Tortoise.get_connection(connection_name).execute_query_dict(sql, params)
+
+
+async def stream_query(
+    query,
+    prefetch: int = STREAM_PREFETCH,
+    connection_name: str = "default",
+) -> AsyncIterator[dict]:
+    """Строки через серверный курсор: в памяти не больше prefetch строк."""
+    sql, params = compile_query_cached(query)
+    conn = Tortoise.get_connection(connection_name)
+    async with conn.acquire_connection() as connection:
+        async with connection.transaction():
+            async for record in connection.cursor(sql, *params, prefetch=prefetch):
+                yield dict(record)
@@ -1,13 +1,73 @@
 from typing import Optional
-from tortoise import Tortoise
-from app.repositories.sa.search_athlete import build_athlete_search_query
-from app.repositories.sa.utils import compile_query_with_dollar_params
+
+from app.core.errors import APIError, ErrorCode
+from app.repositories import athlete_index as name_index
+from app.repositories.sa.search_athlete import (ADMIN_SCORE_COLUMN,
+                                                build_admin_athlete_search_query,
+                                                build_athlete_key_search_query,
+                                                build_athlete_search_query)
+from app.repositories.sa.utils import execute_query
+from app.shared.utils.name_keys import query_name_keys
+from app.shared.utils.pagination import decode_cursor, encode_cursor
 
 
 async def search_athletes(search: str, limit: Optional[int]):
+    # индекс в памяти отвечает так же, как SQL; пока он не построен — идём в Postgres
+    index = name_index.athlete_index
+    if index is not None:
+        results = index.search(search, limit)
+        if results is not None:
+            return results
+
+    # совпадения по ключам имён (латиница, ё/е) — индексный поиск, они идут первыми
+    keys = query_name_keys(search)
+    results = await execute_query(build_athlete_key_search_query(keys, limit)) if keys else []
+    if limit is not None and len(results) >= limit:
+        return results
+
     query = build_athlete_search_query(search, limit)
-    sql, params = compile_query_with_dollar_params(query)
-    results = await Tortoise.get_connection(
-        "default").execute_query_dict(
-            sql, params)
-    return results
+    return name_index.merge_ranked(
+        results, await execute_query(query), limit, key=lambda row: row["id"])
+
+
+ADMIN_SEARCH_LIMIT = 50
+ADMIN_SEARCH_MAX_LIMIT = 200
+
+
+def decode_search_cursor(cursor: str) -> tuple[Optional[float], int]:
+    """Курсор (score, id) последней строки; score None — выдача без запроса, по id."""
+    score, athlete_id = decode_cursor(cursor, 2)
+    try:
+        return (None if score is None else float(score)), int(athlete_id)
+    except (ValueError, TypeError) as exc:
+        raise APIError(ErrorCode.INVALID_CURSOR) from exc
+
+
+async def search_athletes_admin(
+    query: Optional[str] = None,
+    last_name: Optional[str] = None,
+    first_name: Optional[str] = None,
+    birth_year: Optional[int] = None,
+    club: Optional[str] = None,
+    gender: Optional[str] = None,
+    limit: int = ADMIN_SEARCH_LIMIT,
+    after: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """Страница спортсменов для админки и курсор следующей (None — страниц больше нет)."""
+    limit = max(1, min(limit, ADMIN_SEARCH_MAX_LIMIT))
+    rows = await execute_query(build_admin_athlete_search_query(
+        query=query,
+        last_name=last_name,
+        first_name=first_name,
+        birth_year=birth_year,
+        club=club,
+        gender=gender,
+        limit=limit,
+        after=decode_search_cursor(after) if after else None,
+    ))
+
+    scores = [row.pop(ADMIN_SCORE_COLUMN, None) for row in rows]
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(scores[-1], rows[-1]["id"])
+    return rows, next_cursor
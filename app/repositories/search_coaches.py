@@ -0,0 +1,13 @@
+from app.repositories.sa.search_coach import build_coach_search_query, build_prefix_tsquery
+from app.repositories.sa.utils import execute_query
+
+COACH_SEARCH_LIMIT = 20
+COACH_SEARCH_MAX_LIMIT = 50
+
+
+async def search_coaches(search: str, limit: int = COACH_SEARCH_LIMIT) -> list[dict]:
+    tsquery = build_prefix_tsquery(search)
+    if tsquery is None:
+        return []
+    limit = min(max(limit, 1), COACH_SEARCH_MAX_LIMIT)
+    return await execute_query(build_coach_search_query(tsquery, limit))
@@ -1,28 +1,38 @@
-import datetime
-from tortoise import Tortoise
-from app.repositories.sa.sitemap import build_athletes_last_update_query, build_competitions_last_update_query
-from app.repositories.sa.utils import compile_query_with_dollar_params
-
-
-async def get_competitions_last_update():
-    query = build_competitions_last_update_query()
-    sql, params = compile_query_with_dollar_params(query)
-    results = await Tortoise.get_connection(
-        "default").execute_query_dict(sql, params)
-    for r in results:
-        lastmod = r["last_update"]
-        if isinstance(lastmod, datetime.datetime):
-            r['lastmod'] = lastmod.date()
-    return results
-
-
-async def get_athletes_last_update():
-    query = build_athletes_last_update_query()
-    sql, params = compile_query_with_dollar_params(query)
-    results = await Tortoise.get_connection(
-        "default").execute_query_dict(sql, params)
-    for r in results:
-        lastmod = r["last_update"]
-        if isinstance(lastmod, datetime.datetime):
-            r['lastmod'] = lastmod.date()
-    return results
+from typing import AsyncIterator, Optional
+
+from app.repositories.sa.content_last_modified import ATHLETE, COMPETITION
+from app.repositories.sa.sitemap import (build_last_modified_query, build_shard_bounds_query,
+                                         build_shard_summary_query)
+from app.repositories.sa.utils import execute_query, stream_query
+
+_ENTITY_TYPES = {
+    "events": COMPETITION,
+    "athletes": ATHLETE,
+}
+
+
+def _shard_range(shard: int, shard_size: int) -> tuple[int, int]:
+    return shard * shard_size, (shard + 1) * shard_size
+
+
+async def get_shard_numbers(section: str, shard_size: int) -> list[int]:
+    """Номера шардов от первого до последнего; пустые отсеет get_shard_summary."""
+    rows = await execute_query(build_shard_bounds_query(_ENTITY_TYPES[section], shard_size))
+    if not rows or rows[0]["first"] is None:
+        return []
+    return list(range(rows[0]["first"], rows[0]["last"] + 1))
+
+
+async def get_shard_summary(section: str, shard: int, shard_size: int) -> Optional[dict]:
+    """Число URL, последний lastmod и отпечаток одного шарда — чтение только его диапазона id."""
+    query = build_shard_summary_query(
+        build_last_modified_query(_ENTITY_TYPES[section], _shard_range(shard, shard_size)), shard_size)
+    rows = await execute_query(query)
+    return rows[0] if rows else None
+
+
+async def iter_shard_items(section: str, shard: int, shard_size: int) -> AsyncIterator[dict]:
+    """(id, last_update) шарда по возрастанию id, через серверный курсор."""
+    query = build_last_modified_query(_ENTITY_TYPES[section], _shard_range(shard, shard_size))
+    async for row in stream_query(query):
+        yield row
@@ -1,3 +1,6 @@
+from datetime import date
+from typing import Optional
+
 from pydantic import Field
 from tortoise.contrib.pydantic import pydantic_model_creator
 from app.schemas import create_pydantic_model, with_nested
@@ -12,6 +15,9 @@ AthleteDetailed_Pydantic = with_nested(
     create_pydantic_model(Athlete),
     occupied_places_count=(int, Field(0, description="По умолчанию 0")),
     competitions_count=(int, Field(0, description="По умолчанию 0")),
+    results_count=(int, Field(0, description="По умолчанию 0")),
+    personal_bests_count=(int, Field(0, description="Дисциплины с зачётным временем")),
+    last_competition_date=(Optional[date], None),
 )
 
 
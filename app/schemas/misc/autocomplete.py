@@ -0,0 +1,13 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    id: int
+    label: str
+
+
+class AutocompleteOut(BaseModel):
+    athletes: List[Suggestion]
+    competitions: List[Suggestion]
@@ -1,15 +1,19 @@
-from datetime import date
+import base64
+import json
+from datetime import time
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.errors import APIError, ErrorCode
 from app.models.athlete.athlete import Athlete
 from app.models.competition.competition import Competition
 from app.models.competition.result import Result
-from app.repositories.sa.top_results import prepare_columns
+from app.repositories.sa.top_results import TopCursor, prepare_columns
 from app.schemas.athlete.athlete import Athlete_Pydantic
 from app.schemas.competition.competition import Competition_Pydantic
 from app.schemas.results.result import ResultDepth0_Pydantic
+from app.schemas.rows import SectionDecoder
 from app.shared.enums.enums import GenderEnum
 
 
@@ -39,6 +43,7 @@ AthleteTopResponse = Dict[str, List[BestFullResult]]
 
 class TopResponse(BaseModel):
     results: List[BestFullResult]
+    next_cursor: Optional[str] = None
 
 
 def parse_best_full_result(row: dict) -> BestFullResult:
@@ -48,3 +53,55 @@ def parse_best_full_result(row: dict) -> BestFullResult:
         competition=prepare_columns(Competition, row, 'competition'),
         row_num=row["row_num"],
     )
+
+
+class BestFullResultDecoder:
+    """Строки топа -> JSON-форма BestFullResult без ORM-экземпляров и валидации.
+
+    Результат совпадает с parse_best_full_result(row).model_dump(mode="json").
+    """
+
+    def __init__(self):
+        self._sections = [
+            SectionDecoder("result", ResultDepth0_Pydantic),
+            SectionDecoder("athlete", Athlete_Pydantic),
+            SectionDecoder("competition", Competition_Pydantic),
+        ]
+
+    def decode(self, row: dict, row_num: Optional[int] = None) -> dict:
+        item = {section.prefix: section(row) for section in self._sections}
+        item["row_num"] = row["row_num"] if row_num is None else row_num
+        return item
+
+    def decode_many(self, rows: List[dict]) -> List[dict]:
+        decode = self.decode
+        return [decode(row) for row in rows]
+
+
+best_full_result_decoder = BestFullResultDecoder()
+
+
+def encode_top_cursor(row: dict) -> str:
+    """Непрозрачный курсор (row_num, resolved_time, result_id) строки топа."""
+    raw = json.dumps([row["row_num"], row["result_resolved_time"].isoformat(), row["result_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_top_cursor(cursor: str) -> TopCursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        row_num, resolved_time, result_id = json.loads(raw)
+        return TopCursor(int(row_num), time.fromisoformat(resolved_time), int(result_id))
+    except (ValueError, TypeError) as exc:
+        raise APIError(ErrorCode.INVALID_CURSOR) from exc
+
+
+def build_top_response(results: List[dict], limit: Optional[int], cursor: bool = True) -> dict:
+    """cursor=False — топ из нескольких партиций, листать его можно только offset."""
+    next_cursor = None
+    if cursor and limit and len(results) == limit:
+        next_cursor = encode_top_cursor(results[-1])
+    return {
+        "results": best_full_result_decoder.decode_many(results),
+        "next_cursor": next_cursor,
+    }
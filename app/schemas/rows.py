@@ -0,0 +1,75 @@
+import json
+from datetime import date, datetime, time, timezone
+from typing import Any, Callable, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from app.shared.utils.flexible_time import FlexibleTime, format_time
+
+
+def _time_to_json(value: Any) -> str:
+    if not isinstance(value, time):
+        value = FlexibleTime.validate(value)
+    return format_time(value)
+
+
+def _datetime_to_json(value: datetime) -> str:
+    # так же, как pydantic: UTC сериализуется с суффиксом Z
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    text = value.astimezone(timezone.utc).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _date_to_json(value: date) -> str:
+    return value.isoformat()
+
+
+def _json_field_to_json(value: Any) -> Any:
+    # asyncpg без кодека отдаёт json/jsonb строкой
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _json_converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    types = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if get_origin(annotation) is not Union or not types:
+        types = [annotation]
+
+    if any(isinstance(tp, type) and issubclass(tp, FlexibleTime) for tp in types):
+        return _time_to_json
+    if datetime in types:
+        return _datetime_to_json
+    if date in types:
+        return _date_to_json
+    if dict in types or list in types:
+        return _json_field_to_json
+    return None
+
+
+class SectionDecoder:
+    """Колонки "{prefix}_{поле}" строки -> JSON-форма модели без валидации.
+
+    План (поле, ключ колонки, значение по умолчанию, конвертер) строится
+    один раз; результат совпадает с model_dump(mode="json") ORM-пути.
+    """
+
+    def __init__(self, prefix: str, model: type[BaseModel]):
+        self.prefix = prefix
+        self._plan = [
+            (
+                name,
+                f"{prefix}_{name}",
+                None if field.is_required() else field.default,
+                _json_converter(field.annotation),
+            )
+            for name, field in model.model_fields.items()
+        ]
+
+    def __call__(self, row: dict) -> dict:
+        values = {}
+        for name, column, default, convert in self._plan:
+            value = row.get(column, default)
+            if value is not None and convert is not None:
+                value = convert(value)
+            values[name] = value
+        return values
@@ -5,6 +5,8 @@ from tortoise.functions import Count
 
 from app.core.security.hashing import hash_password
 from app.models import Athlete, Distance, Result, User
+from app.services.data_changes import (ResultChangeSet, collect_athlete_removal,
+                                       collect_competition_changes, on_results_changed)
 
 
 class AthleteSnapshot(BaseModel):
@@ -102,9 +104,12 @@ async def transfer_results(
         response.messages.append("Dry-run only. Re-run with apply=true to move these results.")
         return response
 
+    changes = ResultChangeSet.from_results(results)
     for result in results:
         result.athlete_id = to_athlete_id
     await Result.bulk_update(results, ["athlete_id"])
+    changes.athlete_ids.add(to_athlete_id)
+    await on_results_changed(changes)
 
     response.messages.append(
         f"Moved {len(results)} result(s) from athlete #{from_athlete_id} to #{to_athlete_id}."
@@ -115,7 +120,9 @@ async def transfer_results(
     response.messages.append(f"Source athlete remaining results: {remaining}")
 
     if delete_empty_source and remaining == 0:
+        removal = await collect_athlete_removal([from_athlete_id])
         await athlete_from.delete()
+        await on_results_changed(removal)
         response.deleted_source_athlete = True
         response.messages.append(f"Deleted empty source athlete #{from_athlete_id}.")
     elif delete_empty_source:
@@ -136,7 +143,9 @@ async def clear_results(competition_id: int, apply: bool = False) -> Maintenance
         response.messages.append("Dry-run only. Re-run with apply=true to delete these results.")
         return response
 
+    changes = await collect_competition_changes(competition_id)
     deleted = await Result.filter(competition_id=competition_id).delete()
+    await on_results_changed(changes)
     response.affected = deleted
     response.messages.append(f"Deleted results: {deleted}")
     return response
@@ -173,8 +182,10 @@ async def clear_empty_athletes(apply: bool = False) -> MaintenanceOperationResul
         response.messages.append("Dry-run only. Re-run with apply=true to delete these athletes.")
         return response
 
+    removal = await collect_athlete_removal(athlete.id for athlete in athletes_without_results)
     for athlete in athletes_without_results:
         await athlete.delete()
+    await on_results_changed(removal)
 
     response.messages.append(f"Deleted athletes without results: {count}")
     return response
@@ -0,0 +1,87 @@
+from typing import Iterable
+
+from tortoise import Tortoise
+
+from app.core.errors import APIError, ErrorCode
+from app.models.athlete.athlete import Athlete
+from app.repositories.sa.athlete_bulk import (CREATE_COLUMNS, UPDATE_COLUMNS,
+                                              build_create_athletes_query,
+                                              build_update_athletes_query)
+from app.repositories.sa.utils import compile_query_cached
+from app.schemas.athlete.review import BulkAthleteCreateItem, BulkAthleteUpdateItem
+from app.services.data_changes import collect_athlete_profiles, on_athletes_changed
+
+ATHLETE_CHUNK_SIZE = 1000
+
+
+def _chunks(rows: list[dict], size: int = ATHLETE_CHUNK_SIZE) -> Iterable[list[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _normalize(values: dict) -> dict:
+    if values.get("birth_year") is not None:
+        values["birth_year"] = str(values["birth_year"])
+    if values.get("gender") is not None:
+        values["gender"] = values["gender"].upper()
+    return values
+
+
+def create_rows(items: Iterable[BulkAthleteCreateItem]) -> list[dict]:
+    return [_normalize({name: getattr(item, name) for name in CREATE_COLUMNS}) for item in items]
+
+
+def update_rows(items: Iterable[BulkAthleteUpdateItem]) -> list[dict]:
+    """Одна строка на id: повторы сливаются, более поздние значения побеждают."""
+    merged: dict[int, dict] = {}
+    for item in items:
+        changes = _normalize(item.model_dump(include=set(UPDATE_COLUMNS), exclude_none=True))
+        merged.setdefault(item.id, {"id": item.id}).update(changes)
+    return list(merged.values())
+
+
+async def _fetch_chunks(build_query, rows: list[dict], expected: bool = False) -> list[dict]:
+    """Запрос на каждую пачку, все пачки в одной транзакции."""
+    fetched = []
+    conn = Tortoise.get_connection("default")
+    async with conn.acquire_connection() as connection:
+        async with connection.transaction():
+            for chunk in _chunks(rows):
+                sql, params = compile_query_cached(build_query(chunk))
+                chunk_rows = await connection.fetch(sql, *params)
+                if expected and len(chunk_rows) != len(chunk):
+                    # исключение внутри транзакции откатывает уже записанные пачки
+                    raise APIError(ErrorCode.ATHLETE_NOT_FOUND)
+                fetched.extend(dict(row) for row in chunk_rows)
+    return fetched
+
+
+async def create_athletes(items: list[BulkAthleteCreateItem]) -> list[Athlete]:
+    """Создаёт спортсменов; порядок ответа совпадает с порядком items."""
+    if not items:
+        return []
+
+    rows = await _fetch_chunks(build_create_athletes_query, create_rows(items))
+    created = [Athlete._init_from_db(**row) for row in rows]
+    await on_athletes_changed(athlete.id for athlete in created)
+    return created
+
+
+async def update_athletes(items: list[BulkAthleteUpdateItem]) -> list[Athlete]:
+    """Применяет частичные изменения; ATHLETE_NOT_FOUND, если кого-то из items нет.
+
+    Записываются только строки, где значение действительно отличается.
+    """
+    if not items:
+        return []
+
+    updates = update_rows(items)
+    # профили до записи: смена пола или года переносит спортсмена в другие партиции рейтинга
+    previous = await collect_athlete_profiles(row["id"] for row in updates)
+    rows = await _fetch_chunks(build_update_athletes_query, updates, expected=True)
+    changed_ids = [row["id"] for row in rows if row.pop("changed")]
+    athletes_by_id = {row["id"]: Athlete._init_from_db(**row) for row in rows}
+
+    if changed_ids:
+        await on_athletes_changed(changed_ids, previous)
+    return [athletes_by_id[item.id] for item in items]
@@ -1,6 +1,7 @@
 from app.services.athlete_identity.candidate_search import (
     CandidateResolution,
     resolve_source_candidates,
+    resolve_sources_candidates,
 )
 from app.services.athlete_identity.decision_engine import IdentityDecision, decide_identity
 from app.services.athlete_identity.normalizer import (
@@ -33,6 +34,7 @@ __all__ = [
     "normalize_gender",
     "normalize_text",
     "resolve_source_candidates",
+    "resolve_sources_candidates",
     "score_candidate",
     "source_cache_key",
     "to_candidate_response",
@@ -12,6 +12,7 @@ from app.schemas.athlete.review import (
 )
 from app.schemas.results.result import BulkCreateResult
 from app.services.athlete_identity.normalizer import is_empty_value, is_meaningful_value, is_weak_value
+from app.services.data_changes import athlete_profile, on_athletes_changed
 from app.shared.enums.enums import ReviewDecisionActionEnum, ReviewItemStatusEnum, ReviewSessionStatusEnum
 
 RESOLVED_ITEM_STATUSES = {
@@ -134,6 +135,7 @@ async def apply_review_decision(item: ReviewItem, decision: ReviewApplyDecisionI
     updated_fields: list[str] = []
     created_athlete = None
     candidate_athlete = None
+    previous_profile = None
 
     if decision.action in {
         ReviewDecisionActionEnum.MATCH_EXISTING,
@@ -146,6 +148,7 @@ async def apply_review_decision(item: ReviewItem, decision: ReviewApplyDecisionI
             raise APIError(ErrorCode.ATHLETE_NOT_FOUND)
 
         if decision.action == ReviewDecisionActionEnum.ENRICH_EXISTING:
+            previous_profile = athlete_profile(candidate_athlete)
             updated_fields = await apply_safe_enrich(candidate_athlete, decision.patch)
             item.status = ReviewItemStatusEnum.ENRICH_PENDING
         else:
@@ -177,6 +180,11 @@ async def apply_review_decision(item: ReviewItem, decision: ReviewApplyDecisionI
 
     await item.save()
 
+    if created_athlete is not None:
+        await on_athletes_changed([created_athlete.id])
+    elif updated_fields:
+        await on_athletes_changed([candidate_athlete.id], {candidate_athlete.id: previous_profile})
+
     action_name = normalize_review_action_name(decision.action)
     reasons, conflicts, updated_fields = get_review_item_context(
         item,
@@ -1,13 +1,16 @@
 from dataclasses import dataclass
+from typing import Sequence
 
 from app.models.athlete.athlete import Athlete
+from app.repositories.athlete_identity import (NameKeyLookup, find_athletes_by_name_key,
+                                               find_athletes_by_name_keys)
 from app.schemas.athlete.review import (
     ResolveCandidateItem,
     ResolveCandidateSourceItem,
     ResolveRecommendedAction,
 )
 from app.services.athlete_identity.decision_engine import IdentityDecision, decide_identity
-from app.services.athlete_identity.normalizer import normalize_gender
+from app.services.athlete_identity.normalizer import normalize_gender, source_cache_key
 from app.services.athlete_identity.scorer import is_same_candidate, to_candidate_response
 from app.shared.enums.enums import ReviewDecisionActionEnum
 
@@ -32,18 +35,16 @@ class CandidateResolution:
         }
 
 
-async def resolve_source_candidates(source: ResolveCandidateSourceItem) -> CandidateResolution:
-    base_query = Athlete.filter(
-        last_name__iexact=source.last_name.strip(),
-        first_name__iexact=source.first_name.strip(),
-        birth_year=str(source.birth_year),
+def name_key_lookup(source: ResolveCandidateSourceItem) -> NameKeyLookup:
+    return (
+        source.last_name,
+        source.first_name,
+        str(source.birth_year),
+        normalize_gender(source.gender),
     )
-    gender = normalize_gender(source.gender)
-    if gender:
-        base_query = base_query.filter(gender=gender)
 
-    athletes = await base_query.limit(50)
 
+def build_resolution(source: ResolveCandidateSourceItem, athletes: list[Athlete]) -> CandidateResolution:
     candidates: list[ResolveCandidateItem] = []
     for athlete in athletes:
         if not is_same_candidate(source, athlete):
@@ -57,3 +58,27 @@ async def resolve_source_candidates(source: ResolveCandidateSourceItem) -> Candi
         candidates=candidates,
         decision=decide_identity(candidates),
     )
+
+
+async def resolve_source_candidates(source: ResolveCandidateSourceItem) -> CandidateResolution:
+    # индексный поиск по ключам имён шире точного сравнения, is_same_candidate отсеет лишнее
+    athletes = await find_athletes_by_name_key(*name_key_lookup(source))
+    return build_resolution(source, athletes)
+
+
+async def resolve_sources_candidates(
+    sources: Sequence[ResolveCandidateSourceItem],
+) -> list[CandidateResolution]:
+    """resolve_source_candidates для всего списка: кандидаты одним запросом на пачку ключей.
+
+    Одинаковые источники (source_cache_key) оцениваются один раз; порядок ответа — как у sources.
+    """
+    unique: dict[tuple[str, ...], ResolveCandidateSourceItem] = {}
+    for source in sources:
+        unique.setdefault(source_cache_key(source), source)
+    found = await find_athletes_by_name_keys(name_key_lookup(source) for source in unique.values())
+    resolutions = {
+        key: build_resolution(source, found[name_key_lookup(source)])
+        for key, source in unique.items()
+    }
+    return [resolutions[source_cache_key(source)] for source in sources]
@@ -0,0 +1,188 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from app.jobs.manager import schedule_performances_warmup, schedule_ratings_refresh
+from app.models.athlete.athlete import Athlete
+from app.models.competition.result import Result
+from app.repositories.athlete_stats import refresh_athlete_stats
+from app.repositories.autocomplete import (sync_athlete_autocomplete,
+                                           sync_competition_autocomplete)
+from app.repositories.best_results import refresh_best_results
+from app.repositories.content_last_modified import refresh_last_modified
+from app.repositories.leaderboards import invalidate_leaderboards
+from app.repositories.performances import queue_performances_warmup
+from app.repositories.ratings import delete_ratings, mark_ratings_dirty
+from app.shared.cache.tags import (ALL_EVENTS_TAG, SITEMAP_TAG, athlete_tag,
+                                   bump_tags, competition_tag, event_tag)
+from app.shared.clients.mongodb import db
+from app.shared.utils.sitemap import sitemap_shard_tag
+from app.shared.clients.redis import client
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class ResultChangeSet:
+    """Что затронула запись результатов: спортсмены, соревнования, дисциплины.
+
+    athletes — профили (id, gender, birth_year), снятые до удаления спортсменов:
+    после него их уже не прочитать. previous_athletes — профили до изменения
+    пола или года рождения: спортсмен уходит из партиций прежней категории.
+    """
+    athlete_ids: set[int] = field(default_factory=set)
+    competition_ids: set[int] = field(default_factory=set)
+    events: set[tuple[str, int]] = field(default_factory=set)
+    athletes: dict[int, dict] = field(default_factory=dict)
+    removed_athlete_ids: set[int] = field(default_factory=set)
+    previous_athletes: dict[int, dict] = field(default_factory=dict)
+
+    def add(
+        self,
+        athlete_id: int,
+        competition_id: Optional[int] = None,
+        stroke: Optional[str] = None,
+        distance: Optional[int] = None,
+    ) -> None:
+        self.athlete_ids.add(athlete_id)
+        if competition_id is not None:
+            self.competition_ids.add(competition_id)
+        if stroke is not None and distance is not None:
+            self.events.add((stroke, distance))
+
+    def add_result(self, result: Result) -> None:
+        self.add(
+            result.athlete_id,
+            result.competition_id,
+            result.stroke,
+            result.distance,
+        )
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.add(
+                row["athlete_id"],
+                row.get("competition_id"),
+                row.get("stroke"),
+                row.get("distance"),
+            )
+
+    @classmethod
+    def from_results(cls, results: Iterable[Result]) -> "ResultChangeSet":
+        changes = cls()
+        for result in results:
+            changes.add_result(result)
+        return changes
+
+    def __bool__(self) -> bool:
+        return bool(self.athlete_ids)
+
+    def cache_tags(self) -> set[str]:
+        tags = {ALL_EVENTS_TAG, SITEMAP_TAG}
+        tags.update(athlete_tag(athlete_id) for athlete_id in self.athlete_ids)
+        tags.update(competition_tag(competition_id) for competition_id in self.competition_ids)
+        tags.update(event_tag(stroke, distance) for stroke, distance in self.events)
+        tags.update(sitemap_shard_tag("athletes", athlete_id) for athlete_id in self.athlete_ids)
+        tags.update(sitemap_shard_tag("events", competition_id) for competition_id in self.competition_ids)
+        return tags
+
+
+async def collect_competition_changes(competition_id: int) -> ResultChangeSet:
+    rows = await Result.filter(competition_id=competition_id).distinct().values(
+        "athlete_id", "competition_id", "stroke", "distance"
+    )
+    changes = ResultChangeSet(competition_ids={competition_id})
+    changes.add_rows(rows)
+    return changes
+
+
+async def collect_athlete_changes(athlete_ids: Iterable[int]) -> ResultChangeSet:
+    athlete_ids = set(athlete_ids)
+    if not athlete_ids:
+        return ResultChangeSet()
+    rows = await Result.filter(athlete_id__in=athlete_ids).distinct().values(
+        "athlete_id", "competition_id", "stroke", "distance"
+    )
+    changes = ResultChangeSet(athlete_ids=athlete_ids)
+    changes.add_rows(rows)
+    return changes
+
+
+def athlete_profile(athlete: Athlete) -> dict:
+    """Поля спортсмена, по которым он попадает в партиции рейтинга."""
+    return {"id": athlete.id, "gender": athlete.gender, "birth_year": athlete.birth_year}
+
+
+async def collect_athlete_profiles(athlete_ids: Iterable[int]) -> dict[int, dict]:
+    """Профили для рейтинга; перед изменением спортсменов — снимок для on_athletes_changed."""
+    athletes = await Athlete.filter(id__in=set(athlete_ids)).values("id", "gender", "birth_year")
+    return {athlete["id"]: athlete for athlete in athletes}
+
+
+async def collect_athlete_removal(athlete_ids: Iterable[int]) -> ResultChangeSet:
+    """Изменения от удаления спортсменов; вызывать до удаления."""
+    changes = await collect_athlete_changes(athlete_ids)
+    changes.athletes = await collect_athlete_profiles(changes.athlete_ids)
+    changes.removed_athlete_ids = set(changes.athlete_ids)
+    return changes
+
+
+async def on_results_changed(changes: ResultChangeSet) -> None:
+    if not changes:
+        return
+
+    _log.debug(
+        "Results changed: %d athletes, %d competitions, %d events",
+        len(changes.athlete_ids),
+        len(changes.competition_ids),
+        len(changes.events),
+    )
+    await refresh_best_results(changes.athlete_ids)
+    await refresh_athlete_stats(changes.athlete_ids)
+    await refresh_last_modified(changes.athlete_ids, changes.competition_ids)
+    await invalidate_leaderboards(client, changes.events)
+    await bump_tags(client, changes.cache_tags())
+    # прогрев — в фоне: запись (и каждая пачка потоковой загрузки) его не ждёт
+    if await queue_performances_warmup(client, changes.athlete_ids - changes.removed_athlete_ids):
+        schedule_performances_warmup()
+
+    athletes = dict(changes.athletes)
+    missing = changes.athlete_ids - athletes.keys()
+    if missing:
+        athletes.update(await collect_athlete_profiles(missing))
+    await mark_ratings_dirty(
+        client, [*athletes.values(), *changes.previous_athletes.values()], changes.events)
+    await delete_ratings(db['ranking'], changes.removed_athlete_ids)
+    await sync_athlete_autocomplete(client, changes.removed_athlete_ids)
+    if changes.events:
+        schedule_ratings_refresh()
+
+
+async def on_athletes_changed(
+    athlete_ids: Iterable[int],
+    previous: Optional[dict[int, dict]] = None,
+) -> None:
+    """Профиль спортсмена (пол, год рождения, ФИО) входит в топы, выступления и sitemap.
+
+    previous — профили до изменения (collect_athlete_profiles / athlete_profile):
+    без них спортсмен остаётся в партициях прежнего пола и категории до полного пересчёта.
+    """
+    athlete_ids = set(athlete_ids)
+    changes = await collect_athlete_changes(athlete_ids)
+    changes.previous_athletes = {
+        athlete_id: profile for athlete_id, profile in (previous or {}).items()
+        if athlete_id in athlete_ids
+    }
+    await on_results_changed(changes)
+    await sync_athlete_autocomplete(client, athlete_ids)
+
+
+async def on_competitions_changed(competition_ids: Iterable[int]) -> None:
+    competition_ids = set(competition_ids)
+    await refresh_last_modified(competition_ids=competition_ids)
+    await sync_competition_autocomplete(client, competition_ids)
+    await bump_tags(client, {
+        SITEMAP_TAG,
+        *(competition_tag(competition_id) for competition_id in competition_ids),
+        *(sitemap_shard_tag("events", competition_id) for competition_id in competition_ids),
+    })
@@ -0,0 +1,153 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from tortoise import Tortoise
+
+from app.core.errors import APIError, ErrorCode
+from app.models.athlete.athlete import Athlete
+from app.models.competition.competition import Competition
+from app.models.competition.result import Result
+from app.repositories.sa.result_ingestion import (RESULT_VALUE_COLUMNS, STAGING_COLUMNS,
+                                                  build_create_staging_sql,
+                                                  build_ingest_results_query,
+                                                  result_staging)
+from app.repositories.sa.utils import compile_query_cached
+from app.schemas.results.result import BulkCreateResult
+
+_log = logging.getLogger(__name__)
+
+_TIME_FIELDS = ("result", "final")
+_REPORT_COLUMNS = ("row_no", "athlete_missing", "competition_missing")
+
+
+@dataclass
+class IngestionReport:
+    results: list[Result] = field(default_factory=list)
+    rejected: list[tuple[BulkCreateResult, APIError]] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[dict]:
+        return [ingestion_error(exc, item) for item, exc in self.rejected]
+
+
+def ingestion_error(exc: Exception, item: BulkCreateResult) -> dict:
+    return {
+        "exception": True,
+        "name": type(exc).__name__,
+        "description": str(exc),
+        "input": item,
+    }
+
+
+def _missing_reference_error(item: BulkCreateResult, athletes: dict, competitions: dict) -> Optional[APIError]:
+    # порядок проверок как у прежней поштучной загрузки: сначала соревнование
+    if item.competition_id not in competitions:
+        return APIError(ErrorCode.COMPETITION_NOT_FOUND)
+    if item.athlete_id not in athletes:
+        return APIError(ErrorCode.ATHLETE_NOT_FOUND)
+    return None
+
+
+def staging_records(items: Iterable[BulkCreateResult]) -> tuple[list[tuple], list[int]]:
+    """Строки для COPY и индекс входного элемента для каждой строки."""
+    time_fields = {name: Result._meta.fields_map[name] for name in _TIME_FIELDS}
+    records = []
+    owners = []
+    for item_index, item in enumerate(items):
+        for result in item.results:
+            # атрибуты, а не model_dump: он превратил бы FlexibleTime обратно в строку
+            values = {name: getattr(result, name, None) for name in RESULT_VALUE_COLUMNS}
+            for name, time_field in time_fields.items():
+                values[name] = time_field.to_db_value(values[name], None)
+            if values["metadata"] is not None:
+                values["metadata"] = json.dumps(values["metadata"], ensure_ascii=False)
+
+            records.append((
+                len(records),
+                item.athlete_id,
+                item.competition_id,
+                *(values[name] for name in RESULT_VALUE_COLUMNS),
+            ))
+            owners.append(item_index)
+    return records, owners
+
+
+def _rejection_error(row: dict) -> APIError:
+    return APIError(
+        ErrorCode.COMPETITION_NOT_FOUND if row["competition_missing"]
+        else ErrorCode.ATHLETE_NOT_FOUND
+    )
+
+
+async def _copy_and_insert(records: list[tuple], ignore_exception: bool) -> list[dict]:
+    sql, params = compile_query_cached(build_ingest_results_query())
+    conn = Tortoise.get_connection("default")
+    async with conn.acquire_connection() as connection:
+        async with connection.transaction():
+            await connection.execute(build_create_staging_sql())
+            await connection.copy_records_to_table(
+                result_staging.name, records=records, columns=STAGING_COLUMNS)
+            rows = [dict(row) for row in await connection.fetch(sql, *params)]
+
+            rejected = next((row for row in rows if row["id"] is None), None)
+            if rejected is not None and not ignore_exception:
+                # исключение внутри транзакции откатывает всю загрузку
+                raise _rejection_error(rejected)
+            return rows
+
+
+async def ingest_results(items: list[BulkCreateResult], ignore_exception: bool = True) -> IngestionReport:
+    """Загрузка протокола: проверка ссылок, COPY во временную таблицу и одна вставка.
+
+    ignore_exception=False прерывает загрузку на первом ошибочном элементе, как раньше.
+    """
+    report = IngestionReport()
+
+    athlete_ids = {item.athlete_id for item in items}
+    competition_ids = {item.competition_id for item in items}
+    athletes = {athlete.id: athlete for athlete in await Athlete.filter(id__in=athlete_ids)}
+    competitions = {
+        competition.id: competition
+        for competition in await Competition.filter(id__in=competition_ids)
+    }
+
+    accepted = []
+    for item in items:
+        error = _missing_reference_error(item, athletes, competitions)
+        if error is None:
+            accepted.append(item)
+        elif not ignore_exception:
+            raise error
+        else:
+            report.rejected.append((item, error))
+
+    records, owners = staging_records(accepted)
+    if not records:
+        return report
+
+    rows = await _copy_and_insert(records, ignore_exception)
+
+    failed = set()
+    for row in rows:
+        item = accepted[owners[row["row_no"]]]
+        if row["id"] is not None:
+            values = {key: value for key, value in row.items() if key not in _REPORT_COLUMNS}
+            result = Result._init_from_db(**values)
+            result.athlete = athletes[item.athlete_id]
+            result.competition = competitions[item.competition_id]
+            report.results.append(result)
+            continue
+
+        # спортсмена или соревнование удалили между проверкой и вставкой
+        if owners[row["row_no"]] in failed:
+            continue
+        failed.add(owners[row["row_no"]])
+        report.rejected.append((item, _rejection_error(row)))
+
+    _log.info(
+        "Ingested %d results from %d items, %d items rejected",
+        len(report.results), len(items), len(report.rejected),
+    )
+    return report
@@ -0,0 +1,115 @@
+import pickle
+import zlib
+from typing import Any, Callable, NamedTuple
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# b"C" + id сериализатора + id компрессора; старые значения (zlib+pickle)
+# начинаются с 0x78, поэтому их можно отличить и прочитать
+HEADER_MAGIC = b"C"
+
+
+class _Part(NamedTuple):
+    id: int
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _raw_dumps(value: bytes) -> bytes:
+    if not isinstance(value, (bytes, bytearray)):
+        raise TypeError("raw codec stores only bytes")
+    return bytes(value)
+
+
+SERIALIZERS: dict[str, _Part] = {
+    "pickle": _Part(1, pickle.dumps, pickle.loads),
+    "raw": _Part(4, _raw_dumps, bytes),
+}
+if orjson is not None:
+    SERIALIZERS["orjson"] = _Part(2, orjson.dumps, orjson.loads)
+if msgpack is not None:
+    SERIALIZERS["msgpack"] = _Part(
+        3,
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False),
+    )
+
+COMPRESSORS: dict[str, _Part] = {
+    "none": _Part(0, bytes, bytes),
+    "zlib": _Part(1, zlib.compress, zlib.decompress),
+}
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = _Part(2, lz4_frame.compress, lz4_frame.decompress)
+if zstandard is not None:
+    COMPRESSORS["zstd"] = _Part(
+        3,
+        zstandard.ZstdCompressor().compress,
+        zstandard.ZstdDecompressor().decompress,
+    )
+
+_SERIALIZERS_BY_ID = {part.id: part for part in SERIALIZERS.values()}
+_COMPRESSORS_BY_ID = {part.id: part for part in COMPRESSORS.values()}
+
+
+class Codec:
+    """Сериализатор + компрессор. Заголовок делает значение самоописывающим,
+    поэтому decode читает данные, записанные любым кодеком."""
+
+    def __init__(self, serializer: str = "pickle", compression: str = "zlib"):
+        # опечатка в настройке или неустановленный extra — ошибка при старте, а не тихий zlib
+        if serializer not in SERIALIZERS:
+            raise ValueError(
+                f"Cache serializer {serializer!r} is not available "
+                f"(installed: {', '.join(SERIALIZERS)}; orjson/msgpack need the cache-codecs extra)")
+        if compression not in COMPRESSORS:
+            raise ValueError(
+                f"Cache compression {compression!r} is not available "
+                f"(installed: {', '.join(COMPRESSORS)}; lz4/zstd need the cache-codecs extra)")
+
+        self.serializer = serializer
+        self.compression = compression
+        self._serializer = SERIALIZERS[serializer]
+        self._compressor = COMPRESSORS[compression]
+        self._header = HEADER_MAGIC + bytes((self._serializer.id, self._compressor.id))
+
+    def encode(self, value: Any) -> bytes:
+        return self._header + self._compressor.dumps(self._serializer.dumps(value))
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        if data[:1] != HEADER_MAGIC:
+            return pickle.loads(zlib.decompress(data))
+
+        serializer = _SERIALIZERS_BY_ID.get(data[1])
+        compressor = _COMPRESSORS_BY_ID.get(data[2])
+        if serializer is None or compressor is None:
+            raise ValueError(f"Unsupported cache codec header: {data[:3]!r}")
+        return serializer.loads(compressor.loads(data[3:]))
+
+    def __repr__(self) -> str:
+        return f"Codec({self.serializer!r}, {self.compression!r})"
+
+
+def default_codec() -> Codec:
+    """Кодек из настроек CACHE_SERIALIZER / CACHE_COMPRESSION; ValueError на неизвестное имя."""
+    return Codec(settings.CACHE_SERIALIZER, settings.CACHE_COMPRESSION)
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Iterable, Optional
+
+from redis.asyncio import Redis
+
+from app.shared.cache.local import local_cache
+from app.shared.cache.tags import INVALIDATION_CHANNEL
+
+_log = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 5
+
+# None — сбросить всё: подписка переподключалась и могла пропустить сообщения
+InvalidationHandler = Callable[[Optional[list[str]]], None]
+
+_handlers: list[InvalidationHandler] = []
+_task: Optional[asyncio.Task] = None
+
+
+def on_invalidation(handler: InvalidationHandler) -> InvalidationHandler:
+    """Регистрирует обработчик тегов, сброшенных любым воркером."""
+    _handlers.append(handler)
+    return handler
+
+
+def dispatch_invalidation(tags: Iterable[str]) -> None:
+    tags = list(tags)
+    local_cache.invalidate_tags(tags)
+    for handler in _handlers:
+        try:
+            handler(tags)
+        except Exception:
+            _log.exception("Invalidation handler %r failed", handler)
+
+
+def _reset_all() -> None:
+    local_cache.clear()
+    for handler in _handlers:
+        try:
+            handler(None)
+        except Exception:
+            _log.exception("Invalidation handler %r failed", handler)
+
+
+async def _listen(redis: Redis) -> None:
+    while True:
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            _reset_all()
+            _log.info("Subscribed to %s", INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                try:
+                    tags = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    _log.warning("Malformed invalidation message: %r", message)
+                    continue
+                dispatch_invalidation(tags)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _log.exception("Invalidation listener failed, reconnecting")
+            await asyncio.sleep(RECONNECT_DELAY)
+        finally:
+            await pubsub.aclose()
+
+
+def start_invalidation_listener(redis: Redis) -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_listen(redis))
+
+
+async def stop_invalidation_listener() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, NamedTuple, Optional
+
+LOCAL_MAX_ENTRIES = 1024
+LOCAL_TTL = 60 * 5
+
+MISSING = object()
+
+
+class _LocalEntry(NamedTuple):
+    value: Any
+    tags: tuple[str, ...]
+    expires_at: float
+
+
+class LocalCache:
+    """LRU с TTL в памяти процесса для уже декодированных значений.
+
+    Значения отдаются по ссылке, изменять их нельзя.
+    """
+
+    def __init__(self, max_entries: int = LOCAL_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._tag_versions: dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def versions(self, tags: Iterable[str]) -> tuple:
+        """Снимок до чтения из Redis: set() не сохранит значение, если теги сбросили."""
+        return self._epoch, tuple(self._tag_versions.get(tag, 0) for tag in tags)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        tags: Iterable[str],
+        versions: Optional[tuple] = None,
+        ttl: int = LOCAL_TTL,
+    ) -> None:
+        tags = tuple(tags)
+        if versions is not None and versions != self.versions(tags):
+            return
+
+        self._entries[key] = _LocalEntry(value, tags, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        for key in [key for key, entry in self._entries.items() if tags.intersection(entry.tags)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._epoch += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+local_cache = LocalCache()
@@ -1,22 +1,180 @@
-import pickle
-import zlib
-from typing import Any, Optional
+import asyncio
+import logging
+import struct
+import time
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+from uuid import uuid4
 
 from redis.asyncio import Redis
 
+from app.shared.cache.codecs import Codec, default_codec
+
+_log = logging.getLogger(__name__)
+
+LOCK_SECONDS = 30
+LOCK_POLL_INTERVAL = 0.05
+
+# b"E" + fresh_until (double) + значение в формате кодека
+ENVELOPE_MAGIC = b"E"
+
+# снимаем блокировку, только если она всё ещё наша
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class CacheEnvelope(NamedTuple):
+    value: Any
+    fresh_until: float
+
 
 class RedisCachePickleCompressed:
-    def __init__(self, redis: Redis):
+    # общие на процесс: вычисления в полёте и фоновые обновления
+    _inflight: dict[str, asyncio.Task] = {}
+    _refreshing: dict[str, asyncio.Task] = {}
+
+    _default_codec: Optional[Codec] = None
+
+    def __init__(self, redis: Redis, codec: Optional[Codec] = None):
         self.redis = redis
+        self.codec = codec or self.get_default_codec()
+
+    @classmethod
+    def get_default_codec(cls) -> Codec:
+        if cls._default_codec is None:
+            cls._default_codec = default_codec()
+        return cls._default_codec
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        return cls.get_default_codec().encode(value)
+
+    @staticmethod
+    def decode(compressed: bytes) -> Any:
+        return Codec.decode(compressed)
 
     async def set(self, key: str, value: Any, expire_seconds: Optional[int] = None):
-        data = pickle.dumps(value)
-        compressed = zlib.compress(data)
-        await self.redis.set(key, compressed, ex=expire_seconds)
+        await self.redis.set(key, self.codec.encode(value), ex=expire_seconds)
 
     async def get(self, key: str) -> Optional[Any]:
         compressed = await self.redis.get(key)
         if compressed is None:
             return None
-        data = zlib.decompress(compressed)
-        return pickle.loads(data)
+        return self.decode(compressed)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire_seconds: int,
+        stale_seconds: int = 0,
+        lock_seconds: int = LOCK_SECONDS,
+    ) -> Any:
+        """Значение из кеша или compute(), который выполняется один раз на все воркеры.
+
+        Первые expire_seconds значение свежее; следующие stale_seconds
+        отдаётся устаревшее, а пересчёт идёт в фоне.
+        """
+        envelope = await self._get_envelope(key)
+        if envelope is not None:
+            if envelope.fresh_until > time.time():
+                return envelope.value
+            if stale_seconds:
+                self._refresh_in_background(key, compute, expire_seconds, stale_seconds, lock_seconds)
+                return envelope.value
+
+        # вычисление — отдельная задача: отмена запроса, который его начал
+        # (клиент отключился), не должна отменять его для остальных ждущих
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_locked(
+                key, compute, expire_seconds, stale_seconds, lock_seconds, wait=True))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        return await asyncio.shield(task)
+
+    @classmethod
+    def _forget_inflight(cls, key: str, task: asyncio.Task) -> None:
+        if cls._inflight.get(key) is task:
+            del cls._inflight[key]
+        # исключение может никто не ждать — помечаем его полученным
+        if not task.cancelled():
+            task.exception()
+
+    async def _get_envelope(self, key: str) -> Optional[CacheEnvelope]:
+        data = await self.redis.get(key)
+        if data is None or data[:1] != ENVELOPE_MAGIC:
+            return None
+        (fresh_until,) = struct.unpack(">d", data[1:9])
+        return CacheEnvelope(self.decode(data[9:]), fresh_until)
+
+    async def _set_envelope(self, key: str, value: Any, expire_seconds: int, stale_seconds: int):
+        data = (
+            ENVELOPE_MAGIC
+            + struct.pack(">d", time.time() + expire_seconds)
+            + self.codec.encode(value)
+        )
+        await self.redis.set(key, data, ex=expire_seconds + stale_seconds)
+
+    async def _compute_locked(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire_seconds: int,
+        stale_seconds: int,
+        lock_seconds: int,
+        wait: bool,
+    ) -> Any:
+        lock_name = f"{key}:lock"
+        token = uuid4().hex
+        if await self.redis.set(lock_name, token, nx=True, ex=lock_seconds):
+            try:
+                value = await compute()
+                await self._set_envelope(key, value, expire_seconds, stale_seconds)
+                return value
+            finally:
+                await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_name, token)
+
+        if not wait:
+            return None
+
+        # пересчёт уже ведёт другой процесс — ждём его результат
+        deadline = time.monotonic() + lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            envelope = await self._get_envelope(key)
+            if envelope is not None and envelope.fresh_until > time.time():
+                return envelope.value
+            if not await self.redis.exists(lock_name):
+                break
+
+        _log.warning("Cache %s was not filled by the lock holder, computing locally", key)
+        value = await compute()
+        await self._set_envelope(key, value, expire_seconds, stale_seconds)
+        return value
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire_seconds: int,
+        stale_seconds: int,
+        lock_seconds: int,
+    ) -> None:
+        if key in self._inflight or key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self._compute_locked(
+                    key, compute, expire_seconds, stale_seconds, lock_seconds, wait=False)
+            except Exception:
+                _log.exception("Background cache refresh failed for %s", key)
+            finally:
+                self._refreshing.pop(key, None)
+
+        # ссылка на задачу держит её от сборщика мусора и гасит повторные запуски
+        self._refreshing[key] = asyncio.create_task(refresh())
@@ -0,0 +1,58 @@
+from typing import Any, Awaitable, Callable
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.shared.cache.codecs import Codec
+from app.shared.cache.local import LOCAL_TTL
+from app.shared.cache.tiered import get_or_compute_tagged
+
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def _adapter(response_model: Any) -> TypeAdapter:
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters[response_model] = TypeAdapter(response_model)
+    return adapter
+
+
+def render_json(response_model: Any, value: Any) -> bytes:
+    """Валидация и сериализация как у response_model FastAPI, но один раз — при записи в кеш.
+
+    response_model=None — значение уже в JSON-форме ответа, валидация не нужна.
+    """
+    if response_model is None:
+        return to_json(value)
+    adapter = _adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(value), by_alias=True)
+
+
+async def cached_json_response(
+    redis: Redis,
+    key: str,
+    tags: list[str],
+    compute: Callable[[], Awaitable[Any]],
+    response_model: Any,
+    expire_seconds: int,
+    stale_seconds: int = 0,
+    local_ttl: int = LOCAL_TTL,
+) -> Response:
+    """Кеширует готовое тело ответа: попадание отдаётся без распаковки и валидации."""
+    async def render() -> bytes:
+        return render_json(response_model, await compute())
+
+    body = await get_or_compute_tagged(
+        redis,
+        f"json:{key}",
+        tags,
+        render,
+        expire_seconds=expire_seconds,
+        stale_seconds=stale_seconds,
+        local_ttl=local_ttl,
+        codec=Codec("raw", settings.CACHE_COMPRESSION),
+    )
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,57 @@
+import json
+import logging
+from typing import Iterable
+
+from redis.asyncio import Redis
+
+from app.shared.cache.local import local_cache
+
+_log = logging.getLogger(__name__)
+
+GENERATIONS_KEY = "cache:tags"
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+SITEMAP_TAG = "sitemap"
+STANDARDS_TAG = "standards"
+ALL_EVENTS_TAG = "event:*"  # запросы без конкретной дисциплины
+
+
+def athlete_tag(athlete_id: int) -> str:
+    return f"athlete:{athlete_id}"
+
+
+def competition_tag(competition_id: int) -> str:
+    return f"competition:{competition_id}"
+
+
+def event_tag(stroke: str, distance: int) -> str:
+    return f"event:{stroke}:{distance}"
+
+
+async def get_generations(redis: Redis, tags: list[str]) -> list[int]:
+    if not tags:
+        return []
+    values = await redis.hmget(GENERATIONS_KEY, tags)
+    return [int(value) if value is not None else 0 for value in values]
+
+
+async def tagged_key(redis: Redis, key: str, tags: list[str]) -> str:
+    """Ключ кеша с поколениями тегов: после bump_tags старые записи не читаются."""
+    generations = await get_generations(redis, tags)
+    return f"{key}:g" + ".".join(map(str, generations))
+
+
+async def bump_tags(redis: Redis, tags: Iterable[str]) -> None:
+    """Сдвигает поколения тегов и оповещает остальные воркеры."""
+    tags = sorted(set(tags))
+    if not tags:
+        return
+
+    # свой процесс сбрасываем сразу, остальные узнают через pub/sub
+    local_cache.invalidate_tags(tags)
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.hincrby(GENERATIONS_KEY, tag, 1)
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps(tags))
+        await pipe.execute()
+    _log.debug("Bumped cache tags: %s", tags)
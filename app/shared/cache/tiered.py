@@ -0,0 +1,34 @@
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.asyncio import Redis
+
+from app.shared.cache.codecs import Codec
+from app.shared.cache.local import LOCAL_TTL, MISSING, local_cache
+from app.shared.cache.redis_compressed import RedisCachePickleCompressed
+from app.shared.cache.tags import tagged_key
+
+
+async def get_or_compute_tagged(
+    redis: Redis,
+    key: str,
+    tags: list[str],
+    compute: Callable[[], Awaitable[Any]],
+    expire_seconds: int,
+    stale_seconds: int = 0,
+    local_ttl: int = LOCAL_TTL,
+    codec: Optional[Codec] = None,
+) -> Any:
+    """Память процесса -> Redis (ключ с поколениями тегов) -> compute()."""
+    value = local_cache.get(key)
+    if value is not MISSING:
+        return value
+
+    versions = local_cache.versions(tags)
+    value = await RedisCachePickleCompressed(redis, codec).get_or_compute(
+        await tagged_key(redis, key, tags),
+        compute,
+        expire_seconds=expire_seconds,
+        stale_seconds=stale_seconds,
+    )
+    local_cache.set(key, value, tags, versions, ttl=local_ttl)
+    return value
@@ -7,9 +7,16 @@ from pydantic_core import core_schema
 from tortoise import fields
 
 
+def format_time(value: datetime.time) -> str:
+    """Строковое представление FlexibleTime без создания экземпляра."""
+    if value.hour:
+        return f"{value.hour}:{value.minute:02}:{value.second:02},{int(value.microsecond / 10000):02}"
+    return f"{value.minute:02}:{value.second:02},{int(value.microsecond / 10000):02}"
+
+
 class FlexibleTime(datetime.time):
     time_regex = re.compile(
-        r"^(?:(?P<minutes>\d{1,2}):)?(?P<seconds>\d{1,2})[.,](?P<hundredths>\d{1,2})$"
+        r"^(?:(?:(?P<hours>\d{1,2}):)?(?P<minutes>\d{1,2}):)?(?P<seconds>\d{1,2})[.,](?P<hundredths>\d{1,2})$"
     )
 
     @classmethod
@@ -45,18 +52,17 @@ class FlexibleTime(datetime.time):
             raise ValueError(f"Invalid time format: {value}")
 
         groups = match.groupdict()
+        hours = int(groups.get("hours") or 0)
         minutes = int(groups.get("minutes") or 0)
         seconds = int(groups.get("seconds") or 0)
         hundredths = int(groups.get("hundredths") or 0)
 
         return cls(
-            hour=0, minute=minutes, second=seconds, microsecond=hundredths * 10_000
+            hour=hours, minute=minutes, second=seconds, microsecond=hundredths * 10_000
         )
 
     def __str__(self) -> str:
-        if self.hour:
-            return f"{self.hour}:{self.minute:02}:{self.second:02},{int(self.microsecond / 10000):02}"
-        return f"{self.minute:02}:{self.second:02},{int(self.microsecond / 10000):02}"
+        return format_time(self)
 
     def __repr__(self) -> str:
         return f'"{self}"'
@@ -0,0 +1,93 @@
+import re
+from typing import Optional
+
+# Ключ поиска имени: регистр, ё/е и кириллица/латиница сводятся к одному виду,
+# "Фёдоров", "Федоров" и "Fyodorov" дают "fedorov". То же правило живёт в SQL
+# (name_search_key_function_sql), поэтому таблицы ниже — единственный источник.
+
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e",
+    "ж": "zh", "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "h", "ц": "c", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "iu", "я": "ia",
+    "і": "i", "ї": "i", "є": "e",
+}
+
+# латинские варианты написания; порядок важен
+LATIN_RULES = (
+    ("shch", "sh"),
+    ("tch", "ch"),
+    ("kh", "h"),
+    ("ts", "c"),
+    ("yo", "e"),
+    ("x", "ks"),
+    ("w", "v"),
+    ("q", "k"),
+    ("j", "i"),
+    ("y", "i"),
+)
+
+# короче — только точное совпадение, иначе префикс захватит полтаблицы
+KEY_PREFIX_MIN_LENGTH = 3
+# следующий за "z" символ: диапазон [key, key + "{") — все ключи с префиксом key
+KEY_PREFIX_UPPER = "{"
+
+_TRANSLIT_TABLE = str.maketrans(CYRILLIC_TO_LATIN)
+_NON_KEY_RE = re.compile(r"[^a-z0-9]+")
+_REPEAT_RE = re.compile(r"(.)\1+")
+
+
+def name_search_key(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    key = value.lower().translate(_TRANSLIT_TABLE)
+    for old, new in LATIN_RULES:
+        key = key.replace(old, new)
+    key = _NON_KEY_RE.sub("", key)
+    return _REPEAT_RE.sub(r"\1", key)
+
+
+def query_name_keys(user_input: str) -> Optional[list[str]]:
+    """Ключи слов запроса (одно или два слова) или None, если искать по ключам нечего."""
+    words = user_input.split()
+    if len(words) not in (1, 2):
+        return None
+    keys = [name_search_key(word) for word in words]
+    if not all(keys):
+        return None
+    return keys
+
+
+def key_matches(field_key: str, key: str) -> bool:
+    if len(key) >= KEY_PREFIX_MIN_LENGTH:
+        return field_key.startswith(key)
+    return field_key == key
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def name_search_key_function_sql() -> str:
+    """CREATE FUNCTION name_search_key(text), повторяющая Python-версию шаг в шаг."""
+    expr = "lower(value)"
+    single = {src: dst for src, dst in CYRILLIC_TO_LATIN.items() if len(dst) == 1}
+    for src, dst in CYRILLIC_TO_LATIN.items():
+        if len(dst) > 1:
+            expr = f"replace({expr}, {_sql_literal(src)}, {_sql_literal(dst)})"
+    # translate удаляет символы без пары, поэтому буквы -> "" идут в конце
+    dropped = "".join(src for src, dst in CYRILLIC_TO_LATIN.items() if not dst)
+    expr = (
+        f"translate({expr}, {_sql_literal(''.join(single) + dropped)}, "
+        f"{_sql_literal(''.join(single.values()))})"
+    )
+    for old, new in LATIN_RULES:
+        expr = f"replace({expr}, {_sql_literal(old)}, {_sql_literal(new)})"
+    expr = f"regexp_replace({expr}, '[^a-z0-9]+', '', 'g')"
+    expr = f"regexp_replace({expr}, '(.)\\1+', '\\1', 'g')"
+    return (
+        "CREATE OR REPLACE FUNCTION name_search_key(value text) RETURNS text\n"
+        "LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE\n"
+        f"AS $$ SELECT {expr} $$;"
+    )
@@ -0,0 +1,148 @@
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from fastapi import Request
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.errors import APIError, ErrorCode
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_BATCH_SIZE = 500
+MAX_LINE_BYTES = 1 << 20
+
+# описание тела для OpenAPI: FastAPI не знает, что маршрут читает поток сам
+NDJSON_OPENAPI_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+    }
+}
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Batch = list[tuple[int, ModelT]]
+
+
+class NDJSONResponse(StreamingResponse):
+    """Поток объектов, по одному JSON на строку.
+
+    Тело запроса читается, пока ответ уже пишется, поэтому receive отдаётся
+    маршруту целиком: обычный StreamingResponse слушал бы в нём разрыв соединения.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(self, content: AsyncIterable[Any], status_code: int = 200, headers: Optional[dict] = None):
+        super().__init__(self._encode(content), status_code=status_code, headers=headers)
+
+    @staticmethod
+    async def _encode(content: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+        async for item in content:
+            yield to_json(item) + b"\n"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def require_ndjson(request: Request) -> None:
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";", 1)[0].strip() != NDJSON_MEDIA_TYPE:
+        raise APIError(ErrorCode.UNSUPPORTED_MEDIA_TYPE)
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int = MAX_LINE_BYTES,
+) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """(номер строки, байты) по мере прихода тела; None — строка длиннее max_line_bytes."""
+    buffer = bytearray()
+    overflow = False
+    line_no = 0
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not overflow:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        overflow = True
+                        buffer.clear()
+                break
+
+            line_no += 1
+            if not overflow:
+                buffer += chunk[start:end]
+            too_long = overflow or len(buffer) > max_line_bytes
+            yield line_no, None if too_long else bytes(buffer)
+            buffer.clear()
+            overflow = False
+            start = end + 1
+
+    if buffer or overflow:
+        yield line_no + 1, None if overflow else bytes(buffer)
+
+
+def line_error(line_no: int, message: str) -> dict:
+    return {"line": line_no, "error": message}
+
+
+async def iter_batches(
+    lines: AsyncIterable[tuple[int, Optional[bytes]]],
+    model: type[ModelT],
+    batch_size: int = NDJSON_BATCH_SIZE,
+) -> AsyncIterator[tuple[Batch, list[dict]]]:
+    """Пачки провалидированных строк и ошибки разбора, накопленные вместе с ними."""
+    rows: Batch = []
+    errors: list[dict] = []
+    async for line_no, line in lines:
+        if line is None:
+            errors.append(line_error(line_no, "line is too long"))
+        elif line.strip():
+            try:
+                rows.append((line_no, model.model_validate_json(line)))
+            except ValidationError as exc:
+                errors.append(line_error(line_no, str(exc)))
+
+        if len(rows) + len(errors) >= batch_size:
+            yield rows, errors
+            rows, errors = [], []
+
+    if rows or errors:
+        yield rows, errors
+
+
+async def stream_ingest(
+    request: Request,
+    model: type[ModelT],
+    handle_batch: Callable[[Batch], Awaitable[dict]],
+    batch_size: int = NDJSON_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    """Строка прогресса на каждую пачку и итоговая строка в конце.
+
+    handle_batch возвращает поля для строки прогресса; ошибки строк кладёт в "errors".
+    Ошибка всей пачки (APIError) попадает в её строку, загрузка продолжается.
+    """
+    batches = rows_total = errors_total = 0
+    async for rows, errors in iter_batches(iter_lines(request.stream()), model, batch_size):
+        batches += 1
+        progress = {"batch": batches, "rows": len(rows) + len(errors)}
+        if rows:
+            try:
+                progress.update(await handle_batch(rows))
+            except APIError as exc:
+                errors.append({
+                    "lines": [rows[0][0], rows[-1][0]],
+                    "error": exc.error_name,
+                    "message": exc.message,
+                })
+        errors.extend(progress.pop("errors", []))
+        progress["errors"] = errors
+
+        rows_total += progress["rows"]
+        errors_total += len(errors)
+        yield progress
+
+    yield {"done": True, "batches": batches, "rows": rows_total, "errors": errors_total}
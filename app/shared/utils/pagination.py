@@ -0,0 +1,24 @@
+import base64
+import json
+from typing import Any
+
+from app.core.errors import APIError, ErrorCode
+
+# списки, которые отдаются массивом, передают курсор следующей страницы заголовком
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(values)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise APIError(ErrorCode.INVALID_CURSOR) from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise APIError(ErrorCode.INVALID_CURSOR)
+    return values
@@ -1,82 +1,190 @@
 import datetime
-import xml.etree.ElementTree as ET
-from app.repositories.sitemap import get_athletes_last_update, get_competitions_last_update
+from typing import AsyncIterable, AsyncIterator, NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+from app.core.config import settings
+from app.repositories.sitemap import get_shard_numbers, get_shard_summary, iter_shard_items
+from app.shared.cache.codecs import Codec
 from app.shared.cache.redis_compressed import RedisCachePickleCompressed
+from app.shared.cache.tags import SITEMAP_TAG
+from app.shared.cache.tiered import get_or_compute_tagged
 from app.shared.clients.redis import client
 
+SITE_URL = "https://fincubes.ru"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# протокол ограничивает файл 50 000 URL и 50 МБ; шард — диапазон id такого размера
+SITEMAP_SHARD_SIZE = 40_000
+SITEMAP_CHUNK_SIZE = 1000
+
+SHARDS_TTL = 60 * 60 * 24
+SHARD_SUMMARY_TTL = 60 * 60 * 24 * 7
+SHARDS_STALE_TTL = 60 * 60
+SHARD_TTL = 60 * 60 * 24 * 7
+
+PAGES_SHARD = "pages"
+
+STATIC_PAGES = [
+    ("/", "daily", "1.0"),
+    ("/top", "daily", "1.0"),
+    ("/standards", "daily", "1.0"),
+    ("/records", "daily", "1.0"),
+    ("/region", "daily", "1.0"),
+    ("/event", "daily", "1.0"),
+    ("/team", "daily", "0.8"),
+    ("/about", "daily", "0.8"),
+    ("/privacy", "daily", "0.8"),
+    ("/terms", "daily", "0.8"),
+    ("/login", "daily", "0.8"),
+    ("/signup", "daily", "0.8"),
+]
+
+
+class SitemapSection(NamedTuple):
+    path: str
+    changefreq: str
+    priority: str
+
+
+SECTIONS = {
+    "events": SitemapSection("/event", "monthly", "0.7"),
+    "athletes": SitemapSection("/user", "weekly", "0.5"),
+}
 
-def create_element(tag: str, text: str) -> ET.Element:
-    el = ET.Element(tag)
-    el.text = text
-    return el
 
+def sitemap_shard_tag(section_name: str, entity_id: int) -> str:
+    """Тег шарда, в диапазон которого попадает сущность: запись сбрасывает только его отпечаток."""
+    return f"sitemap:{section_name}-{entity_id // SITEMAP_SHARD_SIZE}"
 
-def create_url_element(loc, lastmod, changefreq=None, priority=None):
-    url_el = ET.Element("url")
-    url_el.append(create_element("loc", loc))
-    url_el.append(create_element("lastmod", lastmod))
+
+def shard_url(name: str) -> str:
+    return f"{SITE_URL}/sitemap/{name}.xml"
+
+
+def url_entry(loc: str, lastmod: str, changefreq: Optional[str] = None, priority: Optional[str] = None) -> str:
+    parts = [f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod>"]
     if changefreq:
-        url_el.append(create_element("changefreq", changefreq))
+        parts.append(f"<changefreq>{changefreq}</changefreq>")
     if priority:
-        url_el.append(create_element("priority", priority))
-    return url_el
+        parts.append(f"<priority>{priority}</priority>")
+    parts.append("</url>")
+    return "".join(parts)
 
 
-async def _generate_sitemap_static() -> bytes:
-    """
-    Асинхронно создаёт sitemap.xml, используя SQL-запросы через Tortoise.
+async def stream_xml(
+    root: str,
+    entries: AsyncIterable[str],
+    chunk_size: int = SITEMAP_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """XML-документ кусками: элементы пишутся по мере чтения, без дерева в памяти."""
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<{root} xmlns="{SITEMAP_NS}">'.encode()
+    chunk = []
+    async for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk).encode()
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk).encode()
+    yield f"</{root}>".encode()
+
+
+async def _static_entries(today: str) -> AsyncIterator[str]:
+    for path, changefreq, priority in STATIC_PAGES:
+        yield url_entry(f"{SITE_URL}{path}", today, changefreq, priority)
+
+
+async def _section_entries(section_name: str, shard: int) -> AsyncIterator[str]:
+    section = SECTIONS[section_name]
+    async for row in iter_shard_items(section_name, shard, SITEMAP_SHARD_SIZE):
+        yield url_entry(
+            f"{SITE_URL}{section.path}/{row['id']}",
+            row["last_update"].strftime("%Y-%m-%d"),
+            section.changefreq,
+            section.priority,
+        )
+
+
+async def _shard_summary(section_name: str, shard: int) -> Optional[dict]:
+    """Отпечаток шарда кешируется под его тегом: md5 пересчитывается только у тронутых шардов."""
+    name = f"{section_name}-{shard}"
+
+    async def compute() -> Optional[dict]:
+        row = await get_shard_summary(section_name, shard, SITEMAP_SHARD_SIZE)
+        if row is None:
+            return None
+        return {
+            "name": name,
+            "lastmod": row["last_update"].isoformat(),
+            "fingerprint": row["fingerprint"],
+        }
+
+    return await get_or_compute_tagged(
+        client,
+        f"sitemap:summary:{name}",
+        [sitemap_shard_tag(section_name, shard * SITEMAP_SHARD_SIZE)],
+        compute,
+        expire_seconds=SHARD_SUMMARY_TTL,
+    )
+
+
+async def _list_shards() -> list[dict]:
+    # статичные страницы берут lastmod на сегодня: отпечаток — дата
+    today = datetime.date.today().isoformat()
+    shards = [{"name": PAGES_SHARD, "lastmod": today, "fingerprint": today}]
+    for section_name in SECTIONS:
+        for shard in await get_shard_numbers(section_name, SITEMAP_SHARD_SIZE):
+            summary = await _shard_summary(section_name, shard)
+            if summary is not None:
+                shards.append(summary)
+    return shards
+
+
+async def get_sitemap_shards() -> list[dict]:
+    """Шарды с отпечатками; список пересчитывается после сброса тега sitemap."""
+    return await get_or_compute_tagged(
+        client,
+        "sitemap:shards",
+        [SITEMAP_TAG],
+        _list_shards,
+        expire_seconds=SHARDS_TTL,
+        stale_seconds=SHARDS_STALE_TTL,
+    )
+
+
+async def _render_shard(name: str) -> bytes:
+    if name == PAGES_SHARD:
+        entries = _static_entries(datetime.date.today().isoformat())
+    else:
+        section_name, shard = name.rsplit("-", 1)
+        entries = _section_entries(section_name, int(shard))
+    return b"".join([chunk async for chunk in stream_xml("urlset", entries)])
+
+
+async def generate_sitemap_shard(name: str) -> Optional[bytes]:
+    """XML шарда или None, если такого шарда нет.
+
+    Ключ содержит отпечаток, поэтому шард пересобирается, только когда поменялись его URL.
     """
-    urlset = ET.Element(
-        "urlset", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
-    today_str = datetime.date.today().strftime("%Y-%m-%d")
-    static_pages = [
-        ("https://fincubes.ru/", today_str, "daily", "1.0"),
-        ("https://fincubes.ru/top", today_str, "daily", "1.0"),
-        ("https://fincubes.ru/standards", today_str, "daily", "1.0"),
-        ("https://fincubes.ru/records", today_str, "daily", "1.0"),
-        ("https://fincubes.ru/region", today_str, "daily", "1.0"),
-        ("https://fincubes.ru/event", today_str, "daily", "1.0"),
-        ("https://fincubes.ru/team", today_str, "daily", "0.8"),
-        ("https://fincubes.ru/about", today_str, "daily", "0.8"),
-        ("https://fincubes.ru/privacy", today_str, "daily", "0.8"),
-        ("https://fincubes.ru/terms", today_str, "daily", "0.8"),
-        ("https://fincubes.ru/login", today_str, "daily", "0.8"),
-        ("https://fincubes.ru/signup", today_str, "daily", "0.8"),
-    ]
-    for loc, lastmod, cf, pr in static_pages:
-        urlset.append(create_url_element(loc, lastmod, cf, pr))
-
-    competitions = await get_competitions_last_update()
-    for comp in competitions:
-        lastmod = comp["last_update"]
-        urlset.append(create_url_element(
-            f"https://fincubes.ru/event/{comp['id']}",
-            lastmod.strftime("%Y-%m-%d"),
-            "monthly",
-            "0.7"
-        ))
-
-    athletes = await get_athletes_last_update()
-    for ath in athletes:
-        lastmod = ath["last_update"]
-        urlset.append(create_url_element(
-            f"https://fincubes.ru/user/{ath['id']}",
-            lastmod.strftime("%Y-%m-%d"),
-            "weekly",
-            "0.5"
-        ))
-
-    xml_bytes = ET.tostring(urlset, encoding="utf-8", xml_declaration=True)
-    return xml_bytes
-
-
-async def generate_sitemap() -> bytes:
-    cache = RedisCachePickleCompressed(client)
-    cache_key = "sitemap"
-    cached = await cache.get(cache_key)
-    if cached:
-        return cached
-
-    result = await _generate_sitemap_static()
-    await cache.set(cache_key, result, expire_seconds=60 * 60)
-    return result
+    shard = next((item for item in await get_sitemap_shards() if item["name"] == name), None)
+    if shard is None:
+        return None
+
+    return await RedisCachePickleCompressed(client, Codec("raw", settings.CACHE_COMPRESSION)).get_or_compute(
+        f"sitemap:shard:{name}:{shard['fingerprint']}",
+        lambda: _render_shard(name),
+        expire_seconds=SHARD_TTL,
+    )
+
+
+async def _index_entries(shards: list[dict]) -> AsyncIterator[str]:
+    for shard in shards:
+        yield (
+            f"<sitemap><loc>{escape(shard_url(shard['name']))}</loc>"
+            f"<lastmod>{shard['lastmod']}</lastmod></sitemap>"
+        )
+
+
+async def generate_sitemap_index() -> bytes:
+    shards = await get_sitemap_shards()
+    return b"".join([chunk async for chunk in stream_xml("sitemapindex", _index_entries(shards))])
@@ -0,0 +1,30 @@
+import re
+import struct
+from typing import FrozenSet
+
+# pg_trgm: слова — последовательности букв и цифр, остальное разделители
+_WORD_RE = re.compile(r"[^\W_]+")
+
+Trigrams = FrozenSet[str]
+
+
+def as_real(value: float) -> float:
+    """Округление до float4: similarity() в Postgres возвращает real."""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+def trigrams(text: str) -> Trigrams:
+    """Набор триграмм как у pg_trgm: каждое слово дополняется до "  слово "."""
+    result = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(result)
+
+
+def similarity(left: Trigrams, right: Trigrams) -> float:
+    """Python-зеркало pg_trgm similarity() для готовых наборов триграмм."""
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return as_real(shared / (len(left) + len(right) - shared))
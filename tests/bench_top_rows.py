@@ -0,0 +1,82 @@
+"""Сравнение разбора строк топа: ORM-путь parse_best_full_result и BestFullResultDecoder.
+
+    python -m tests.bench_top_rows [rows] [repeat]
+"""
+import json
+import sys
+import timeit
+from datetime import date, datetime, time, timezone
+
+from app.schemas.results.top import best_full_result_decoder, parse_best_full_result
+
+
+def make_row(i: int) -> dict:
+    """Строка в том виде, в каком её отдаёт asyncpg для build_top_results_query."""
+    created = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    return {
+        "result_id": i,
+        "result_athlete_id": 1000 + i,
+        "result_competition_id": 10,
+        "result_stroke": "SURFACE",
+        "result_distance": 50,
+        "result_result": time(0, 0, 21, 450000, tzinfo=timezone.utc),
+        "result_final": None if i % 2 else time(0, 0, 21, 300000, tzinfo=timezone.utc),
+        "result_resolved_time": time(0, 0, 21, 300000, tzinfo=timezone.utc),
+        "result_place": str(i),
+        "result_final_rank": None,
+        "result_points": "512",
+        "result_record": None,
+        "result_status": "COMPLETED",
+        "result_metadata": json.dumps({"lane": i % 8}),
+        "result_created_at": created,
+        "result_updated_at": created,
+        "athlete_id": 1000 + i,
+        "athlete_last_name": "Иванов",
+        "athlete_first_name": "Иван",
+        "athlete_birth_year": "2008",
+        "athlete_club": "Дельфин",
+        "athlete_city": "Москва",
+        "athlete_license": None,
+        "athlete_gender": "M",
+        "athlete_avatar_url": None,
+        "athlete_is_top": False,
+        "athlete_created_at": created,
+        "athlete_updated_at": created,
+        "competition_id": 10,
+        "competition_name": "Кубок России",
+        "competition_date": "01.05.2024",
+        "competition_location": "Бассейн",
+        "competition_city": "Москва",
+        "competition_organizer": "ФПС",
+        "competition_course": "LCM",
+        "competition_status": None,
+        "competition_links": json.dumps([]),
+        "competition_start_date": date(2024, 5, 1),
+        "competition_end_date": date(2024, 5, 3),
+        "competition_last_processed_at": None,
+        "competition_created_at": created,
+        "competition_updated_at": created,
+        "row_num": i + 1,
+    }
+
+
+def orm_path(rows: list[dict]) -> list[dict]:
+    return [parse_best_full_result(row).model_dump(mode="json") for row in rows]
+
+
+def decoder_path(rows: list[dict]) -> list[dict]:
+    return best_full_result_decoder.decode_many(rows)
+
+
+def main(count: int = 1000, repeat: int = 5) -> None:
+    rows = [make_row(i) for i in range(count)]
+    assert orm_path(rows) == decoder_path(rows)
+
+    for name, func in (("orm", orm_path), ("decoder", decoder_path)):
+        best = min(timeit.repeat(lambda: func(rows), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1000:8.2f} ms / {count} rows"
+              f" ({best / count * 1e6:.2f} us/row)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
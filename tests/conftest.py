@@ -0,0 +1,95 @@
+import pytest
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def hmget(self, key, fields):
+        values = self.data.get(key, {})
+        return [values.get(field) for field in fields]
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+class FakeSetRedis:
+    def __init__(self):
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakeSetPipeline(self)
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+
+class FakeSetPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def sadd(self, key, *members):
+        self.calls.append(lambda: self.redis.sets.setdefault(key, set()).update(members))
+
+    def smembers(self, key):
+        self.calls.append(lambda: set(self.redis.sets.get(key, ())))
+
+    def delete(self, *keys):
+        self.calls.append(lambda: [self.redis.sets.pop(key, None) for key in keys])
+
+    async def execute(self):
+        return [call() for call in self.calls]
+
+
+class FakeTransaction:
+    def __init__(self):
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_query(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    async def execute_script(self, sql):
+        self.statements.append((sql, None))
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def fake_set_redis():
+    return FakeSetRedis()
+
+
+@pytest.fixture
+def fake_transaction():
+    return FakeTransaction()
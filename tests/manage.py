@@ -6,7 +6,13 @@ from typing import Optional
 from app.core.config import settings
 from app.models import Athlete, Result, Distance, User
 from app.core.security.hashing import hash_password
+from app.repositories.athlete_stats import rebuild_athlete_stats
+from app.repositories.autocomplete import rebuild_all_autocomplete
+from app.repositories.best_results import rebuild_best_results
+from app.repositories.content_last_modified import rebuild_last_modified
+from app.jobs.jobs import daily_task, ratings_delta_task
 from app.services import admin_maintenance
+from app.shared.clients.redis import client
 from tortoise.functions import Count
 from tortoise import Tortoise
 
@@ -99,6 +105,46 @@ async def transfer_results(
     print_maintenance_result(result)
 
 
+@app.command()
+@with_db_connection
+async def rebuild_best():
+    """Пересобрать таблицу лучших результатов (best_results)"""
+    await rebuild_best_results()
+    print("Таблица best_results пересобрана.")
+
+
+@app.command()
+@with_db_connection
+async def rebuild_stats():
+    """Пересобрать статистику спортсменов (athlete_stats)"""
+    await rebuild_athlete_stats()
+    print("Таблица athlete_stats пересобрана.")
+
+
+@app.command()
+@with_db_connection
+async def rebuild_last_modified_dates():
+    """Пересобрать даты изменения страниц для sitemap (content_last_modified)"""
+    await rebuild_last_modified()
+    print("Таблица content_last_modified пересобрана.")
+
+
+@app.command()
+@with_db_connection
+async def rebuild_autocomplete():
+    """Пересобрать подсказки автодополнения в Redis"""
+    await rebuild_all_autocomplete(client)
+    print("Подсказки автодополнения пересобраны.")
+
+
+@app.command()
+@with_db_connection
+async def refresh_ratings(full: bool = False):
+    """Пересчитать рейтинги: только затронутые партиции или полностью (--full)"""
+    await (daily_task() if full else ratings_delta_task())
+    print("Рейтинги обновлены.")
+
+
 @app.command()
 @with_db_connection
 async def change_password():
@@ -1,6 +1,12 @@
+import json
+
 import pytest
+from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
 from app.main import create_app
+from app.shared.utils.ndjson import NDJSON_MEDIA_TYPE, NDJSONResponse, stream_ingest
 
 
 @pytest.fixture(scope="module")
@@ -13,3 +19,32 @@ def client():
 def test_root_returns_404(client):
     response = client.get("/")
     assert response.status_code == 404
+
+
+def test_ndjson_ingest_streams_progress_per_batch():
+    class Row(BaseModel):
+        id: int
+
+    app = FastAPI()
+
+    @app.post("/ingest")
+    async def ingest(request: Request):
+        async def handle_batch(rows):
+            return {"ids": [item.id for _, item in rows]}
+
+        return NDJSONResponse(stream_ingest(request, Row, handle_batch, batch_size=2))
+
+    def body():
+        yield b'{"id": 1}\n{"id"'
+        yield b': 2}\n\nnot json\n'
+        yield b'{"id": 3}'
+
+    with TestClient(app) as test_client:
+        response = test_client.post(
+            "/ingest", content=body(), headers={"content-type": NDJSON_MEDIA_TYPE})
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    assert [line.get("ids") for line in lines[:-1]] == [[1, 2], [3]]
+    assert [error["line"] for error in lines[1]["errors"]] == [4]
+    assert lines[-1] == {"done": True, "batches": 2, "rows": 4, "errors": 1}
@@ -0,0 +1,40 @@
+from app.repositories.sa.athlete_bulk import build_create_athletes_query, build_update_athletes_query
+from app.repositories.sa.utils import compile_query_cached
+from app.schemas.athlete.review import BulkAthleteCreateItem, BulkAthleteUpdateItem
+from app.services.athlete_bulk import create_rows, update_rows
+
+
+def test_bulk_athlete_create_keeps_input_order():
+    rows = create_rows([
+        BulkAthleteCreateItem(external_id="b", last_name="Петров", first_name="Пётр", birth_year=2011, gender="m"),
+        BulkAthleteCreateItem(external_id="a", last_name="Иванов", first_name="Иван", birth_year=2010, gender="M"),
+        BulkAthleteCreateItem(external_id="c", last_name="Петров", first_name="Пётр", birth_year=2011, gender="M"),
+    ])
+    assert [(row["last_name"], row["birth_year"], row["gender"]) for row in rows] == [
+        ("Петров", "2011", "M"), ("Иванов", "2010", "M"), ("Петров", "2011", "M"),
+    ]
+
+    sql, params = compile_query_cached(build_create_athletes_query(rows))
+    assert ["Петров", "Иванов", "Петров"] in params
+    # id выдаются до вставки, ответ сортируется по номеру входной строки
+    assert "nextval(pg_get_serial_sequence('athletes', 'id'))" in sql
+    assert sql.endswith("ORDER BY numbered.ord")
+
+
+def test_bulk_athlete_update_writes_only_changed_rows_in_one_statement():
+    rows = update_rows([
+        BulkAthleteUpdateItem(id=5, club="Дельфин", gender="m"),
+        BulkAthleteUpdateItem(id=9, birth_year=2010),
+        BulkAthleteUpdateItem(id=5, club="Нептун"),
+    ])
+    assert rows == [{"id": 5, "club": "Нептун", "gender": "M"}, {"id": 9, "birth_year": "2010"}]
+
+    sql, params = compile_query_cached(build_update_athletes_query(rows))
+    assert len(params) == 8 and "WITH ORDINALITY" in sql
+    assert "input.club IS DISTINCT FROM athletes.club" in sql
+    assert "ORDER BY input.ord" in sql
+    assert params[0] == [5, 9] and [None, "2010"] in params and ["Нептун", None] in params
+
+    # пачки другого размера используют тот же текст запроса
+    other_sql, _ = compile_query_cached(build_update_athletes_query(rows[:1]))
+    assert other_sql == sql
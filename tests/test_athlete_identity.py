@@ -4,6 +4,8 @@ import pytest
 
 from app.core.errors import APIError, ErrorCode
 from app.models.athlete.athlete import Athlete
+from app.repositories.athlete_identity import build_name_key_batch_query, name_key_lookup_key
+from app.repositories.sa.utils import compile_query_cached
 from app.schemas.athlete.review import (
     ReviewApplyDecisionItem,
     ResolveCandidateSourceItem,
@@ -19,7 +21,8 @@ from app.services.athlete_identity.apply import (
     safe_patch_payload,
     validate_result_upload_resolution,
 )
-from app.services.athlete_identity.candidate_search import resolve_source_candidates
+from app.services.athlete_identity.candidate_search import (resolve_source_candidates,
+                                                            resolve_sources_candidates)
 from app.services.athlete_identity.decision_engine import decide_identity
 from app.services.athlete_identity.normalizer import (
     classify_team_kind,
@@ -36,6 +39,7 @@ from app.shared.utils.athlete_identity import (
     score_candidate,
     to_candidate_response,
 )
+from app.shared.utils.name_keys import name_search_key
 
 
 class FakeAthleteQuery:
@@ -60,6 +64,12 @@ class FakeAthleteQuery:
         return self._athletes
 
 
+def fake_name_key_lookup(athletes):
+    async def find(*args, **kwargs):
+        return athletes
+    return find
+
+
 class FakeValuesQuery:
     def __init__(self, rows):
         self._rows = rows
@@ -342,8 +352,8 @@ def test_result_upload_resolution_requires_review_session():
 def test_resolve_source_candidates_returns_formal_signals(monkeypatch):
     athlete = make_athlete(club="-", license=None)
     monkeypatch.setattr(
-        "app.services.athlete_identity.candidate_search.Athlete.filter",
-        lambda **kwargs: FakeAthleteQuery([athlete]),
+        "app.services.athlete_identity.candidate_search.find_athletes_by_name_key",
+        fake_name_key_lookup([athlete]),
     )
 
     resolution = asyncio.run(resolve_source_candidates(make_source(team="СШОР Клин", rank="II")))
@@ -360,8 +370,8 @@ def test_resolve_source_candidates_returns_formal_signals(monkeypatch):
 def test_resolve_source_candidates_populates_conflicts_for_meaningful_club_conflict(monkeypatch):
     athlete = make_athlete(club="СШОР Юность")
     monkeypatch.setattr(
-        "app.services.athlete_identity.candidate_search.Athlete.filter",
-        lambda **kwargs: FakeAthleteQuery([athlete]),
+        "app.services.athlete_identity.candidate_search.find_athletes_by_name_key",
+        fake_name_key_lookup([athlete]),
     )
 
     resolution = asyncio.run(resolve_source_candidates(make_source(team="СШОР Клин")))
@@ -375,8 +385,8 @@ def test_resolve_source_candidates_populates_conflicts_for_meaningful_club_confl
 def test_resolve_candidates_response_item_uses_normalized_recommended_action(monkeypatch):
     athlete = make_athlete(id=7)
     monkeypatch.setattr(
-        "app.services.athlete_identity.candidate_search.Athlete.filter",
-        lambda **kwargs: FakeAthleteQuery([athlete]),
+        "app.services.athlete_identity.candidate_search.find_athletes_by_name_key",
+        fake_name_key_lookup([athlete]),
     )
 
     resolution = asyncio.run(resolve_source_candidates(make_source(external_id="ext-1", team="Клин")))
@@ -668,8 +678,14 @@ def test_apply_create_new_sets_selected_athlete_id(monkeypatch):
     async def fake_review_decision_create(**kwargs):
         return kwargs
 
+    changed_athletes = []
+
+    async def fake_on_athletes_changed(athlete_ids):
+        changed_athletes.extend(athlete_ids)
+
     monkeypatch.setattr("app.services.athlete_identity.apply.Athlete.create", fake_create)
     monkeypatch.setattr("app.services.athlete_identity.apply.ReviewDecision.create", fake_review_decision_create)
+    monkeypatch.setattr("app.services.athlete_identity.apply.on_athletes_changed", fake_on_athletes_changed)
 
     result = asyncio.run(
         apply_review_decision(
@@ -686,6 +702,7 @@ def test_apply_create_new_sets_selected_athlete_id(monkeypatch):
     assert result.action == "create_new"
     assert result.selected_athlete_id == 77
     assert created_payloads
+    assert changed_athletes == [77]
 
 
 def test_apply_enrich_existing_sets_selected_athlete_id_and_updated_fields(monkeypatch):
@@ -716,8 +733,16 @@ def test_apply_enrich_existing_sets_selected_athlete_id_and_updated_fields(monke
     async def fake_review_decision_create(**kwargs):
         return kwargs
 
+    changed_athletes = []
+    previous_profiles = {}
+
+    async def fake_on_athletes_changed(athlete_ids, previous=None):
+        changed_athletes.extend(athlete_ids)
+        previous_profiles.update(previous or {})
+
     monkeypatch.setattr("app.services.athlete_identity.apply.Athlete.get_or_none", fake_get_or_none)
     monkeypatch.setattr("app.services.athlete_identity.apply.ReviewDecision.create", fake_review_decision_create)
+    monkeypatch.setattr("app.services.athlete_identity.apply.on_athletes_changed", fake_on_athletes_changed)
 
     result = asyncio.run(
         apply_review_decision(
@@ -736,6 +761,8 @@ def test_apply_enrich_existing_sets_selected_athlete_id_and_updated_fields(monke
     assert result.selected_athlete_id == 88
     assert result.updated_fields == ["club", "license"]
     assert result.resolved is True
+    assert changed_athletes == [88]
+    assert previous_profiles == {88: {"id": 88, "gender": athlete.gender, "birth_year": athlete.birth_year}}
 
 
 def test_completed_session_provides_mapping_usable_by_result_upload_gating(monkeypatch):
@@ -788,3 +815,52 @@ def test_manual_review_blocks_completion(monkeypatch):
     assert result.resolved is False
     assert item.selected_athlete_id is None
     assert session.status == "active"
+
+
+def test_resolve_sources_candidates_batches_lookups_and_matches_single_resolution(monkeypatch):
+    athlete = make_athlete(club="-", license=None)
+    monkeypatch.setattr(
+        "app.services.athlete_identity.candidate_search.find_athletes_by_name_key",
+        fake_name_key_lookup([athlete]),
+    )
+    calls = []
+
+    async def find_many(lookups):
+        lookups = list(lookups)
+        calls.append(lookups)
+        return {lookup: [athlete] if lookup[0] == athlete.last_name else [] for lookup in lookups}
+
+    monkeypatch.setattr(
+        "app.services.athlete_identity.candidate_search.find_athletes_by_name_keys",
+        find_many,
+    )
+
+    sources = [
+        make_source(external_id="1", team="СШОР Клин", rank="II"),
+        make_source(external_id="2", last_name="Петрова"),
+        make_source(external_id="3", team="СШОР Клин", rank="II"),
+    ]
+    resolutions = asyncio.run(resolve_sources_candidates(sources))
+
+    assert len(calls) == 1 and len(calls[0]) == 2
+    assert resolutions[0] is resolutions[2]
+    assert resolutions[1].candidates == []
+
+    single = asyncio.run(resolve_source_candidates(sources[0]))
+    assert resolutions[0].candidates == single.candidates
+    assert resolutions[0].decision == single.decision
+
+
+def test_name_key_candidates_are_fetched_for_all_sources_in_one_query():
+    keys = [
+        name_key_lookup_key(("Фёдоров", "Иван", "2009", "M")),
+        name_key_lookup_key(("Петрова", "Анна", "2010", None)),
+    ]
+    sql, params = compile_query_cached(build_name_key_batch_query(keys, 50))
+    assert "FROM (VALUES" in sql and "PARTITION BY lookup.key_no" in sql
+    assert params[:10] == [0, *keys[0], 1, *keys[1]]
+    assert keys[0][0] == name_search_key("Федоров") and keys[1][3] == ""
+
+    # пол есть не у всех источников, но текст запроса тот же
+    other_sql, _ = compile_query_cached(build_name_key_batch_query(keys[::-1], 50))
+    assert other_sql == sql
@@ -0,0 +1,114 @@
+from app.repositories.athlete_index import AthleteNameIndex
+from app.repositories.autocomplete import (athlete_members, collect_suggestions,
+                                           competition_members, normalize_query)
+from app.repositories.sa.search_athlete import build_admin_athlete_search_query
+from app.repositories.sa.search_coach import build_coach_search_query, build_prefix_tsquery
+from app.repositories.sa.utils import compile_query_cached
+from app.repositories.search_athletes import decode_search_cursor
+from app.shared.utils.name_keys import KEY_PREFIX_UPPER, name_search_key, name_search_key_function_sql
+from app.shared.utils.pagination import encode_cursor
+from app.shared.utils.trigrams import similarity, trigrams
+
+
+def _athlete(athlete_id: int, last_name: str, first_name: str) -> dict:
+    return {"id": athlete_id, "last_name": last_name, "first_name": first_name}
+
+
+def test_trigrams_follow_pg_trgm():
+    assert trigrams("Word") == {"  w", " wo", "wor", "ord", "rd "}
+    assert similarity(trigrams("word"), trigrams("two words")) == 0.3636363744735718
+    assert similarity(trigrams("word"), trigrams("")) == 0.0
+
+
+def test_name_index_ranks_like_similarity_query():
+    index = AthleteNameIndex()
+    for row in (
+        _athlete(1, "Иванов", "Иван"),
+        _athlete(2, "Иванова", "Мария"),
+        _athlete(3, "Петров", "Иван"),
+        _athlete(4, "Сидоров", "Пётр"),
+    ):
+        index.upsert(row)
+
+    assert [row["id"] for row in index.search("иванов", None)] == [1, 2, 3]
+    assert [row["id"] for row in index.search("Ivanov", None)] == [1, 2]
+    assert [row["id"] for row in index.search("petrov ivan", 15)] == [3]
+    assert [row["id"] for row in index.search("Иван Петров", 15)] == [3]
+    assert [row["id"] for row in index.search("иван", 1)] == [1]
+    # similarity ровно float4(0.3) проходит "> 0.3" в Postgres
+    assert [row["id"] for row in index.search("оров", None)] == [4]
+    assert index.search("a b c", 15) is None
+
+    index.upsert(_athlete(2, "Смирнова", "Мария"))
+    index.remove(1)
+    assert [row["id"] for row in index.search("иванов", None)] == [3]
+    assert len(index) == 3
+
+
+def test_coach_search_builds_prefix_tsquery_from_words_only():
+    assert build_prefix_tsquery("Пётр  o'Neil!") == "петр:* & o:* & neil:*"
+    assert build_prefix_tsquery(" & | ") is None
+
+    sql, params = compile_query_cached(build_coach_search_query("петр:*", 20))
+    assert "coach.search_vector @@ to_tsquery('simple', $1::VARCHAR)" in sql
+    assert "search_vector," not in sql.split("FROM")[0]
+    assert params == ["петр:*", 20]
+
+
+def test_name_search_key_folds_case_yo_and_transliteration():
+    assert {name_search_key(name) for name in ("Фёдоров", "федоров", "Fyodorov")} == {"fedorov"}
+    assert {name_search_key(name) for name in ("Дмитрий", "Dmitry", "Dmitriy")} == {"dmitri"}
+    assert name_search_key("Анна-Мария") == "anamaria"
+
+    sql = name_search_key_function_sql()
+    assert "IMMUTABLE" in sql
+    assert "replace(lower(value), 'ж', 'zh')" in sql
+
+
+def test_autocomplete_members_are_found_by_lex_range():
+    members = sorted(
+        athlete_members({**_athlete(1, "Фёдоров", "Иван"), "birth_year": "2009"})
+        + athlete_members({**_athlete(2, "Федорова", "Анна"), "birth_year": "2011"})
+        + athlete_members({**_athlete(3, "Иванов", "Пётр"), "birth_year": "2010"})
+    )
+
+    def zrangebylex(user_input: str) -> list[str]:
+        prefix = normalize_query(user_input)
+        return [m for m in members if prefix <= m < prefix + KEY_PREFIX_UPPER]
+
+    assert collect_suggestions(zrangebylex("Fyodor"), 10) == [
+        {"id": 1, "label": "Фёдоров Иван, 2009"},
+        {"id": 2, "label": "Федорова Анна, 2011"},
+    ]
+    assert collect_suggestions(zrangebylex("иван фед"), 10) == [
+        {"id": 1, "label": "Фёдоров Иван, 2009"},
+    ]
+    assert collect_suggestions(zrangebylex("иван"), 10) == [
+        {"id": 1, "label": "Фёдоров Иван, 2009"},
+        {"id": 3, "label": "Иванов Пётр, 2010"},
+    ]
+    assert collect_suggestions(zrangebylex("иван"), 1) == [
+        {"id": 1, "label": "Фёдоров Иван, 2009"},
+    ]
+
+    terms = [m.split("\x00")[0] for m in competition_members(
+        {"id": 7, "name": "Открытое первенство города", "date": "12-14 мая"}
+    )]
+    assert terms == ["goroda", "otkritoe pervenstvo goroda", "pervenstvo goroda"]
+
+
+def test_admin_search_pages_by_score_and_id():
+    sql, params = compile_query_cached(build_admin_athlete_search_query(
+        "Иванов Иван 2008", gender="M", limit=50, after=(1.25, 17)))
+    where = sql.split("AS matches")[0]
+    assert "athletes.last_name % $" in where and "athletes.birth_year = $" in where
+    assert "NUMERIC" not in sql
+    assert "matches.search_score < $" in sql and "matches.id > $" in sql
+    assert "ORDER BY matches.search_score DESC, matches.id" in sql
+    assert params[-3:] == [1.25, 17, 50]
+
+    sql, params = compile_query_cached(build_admin_athlete_search_query(limit=50, after=(None, 17)))
+    assert "similarity" not in sql and "ORDER BY athletes.id" in sql
+    assert params == [17, 50]
+
+    assert decode_search_cursor(encode_cursor(0.6153846383094788, 17)) == (0.6153846383094788, 17)
@@ -0,0 +1,31 @@
+import asyncio
+
+from app.repositories import athlete_stats as athlete_stats_repository
+from app.repositories.sa.athlete_stats import (ATHLETE_STATS_LOCK_SPACE, build_athlete_detail_query,
+                                               build_insert_athlete_stats_query)
+from app.repositories.sa.utils import compile_query_cached
+
+
+def test_athlete_stats_are_refreshed_per_athlete_and_read_with_one_join():
+    insert_sql, insert_params = compile_query_cached(build_insert_athlete_stats_query([1, 2]))
+    detail_sql, _ = compile_query_cached(build_athlete_detail_query(1))
+
+    assert "GROUP BY results.athlete_id" in insert_sql
+    assert insert_params[-1] == [1, 2]
+    assert "FROM athletes LEFT OUTER JOIN athlete_stats" in detail_sql
+
+
+def test_athlete_stats_refresh_locks_athletes_and_rebuild_locks_table(monkeypatch, fake_transaction):
+    transaction = fake_transaction
+    monkeypatch.setattr(athlete_stats_repository, "in_transaction", lambda: transaction)
+
+    asyncio.run(athlete_stats_repository.refresh_athlete_stats([9, 4, 9]))
+    (lock_sql, lock_params), (delete_sql, _), (insert_sql, _) = transaction.statements
+    assert "pg_advisory_xact_lock" in lock_sql and lock_params == [ATHLETE_STATS_LOCK_SPACE, [4, 9]]
+    assert delete_sql.startswith("DELETE FROM athlete_stats")
+    assert insert_sql.startswith("INSERT INTO athlete_stats")
+
+    transaction.statements.clear()
+    asyncio.run(athlete_stats_repository.rebuild_athlete_stats())
+    assert transaction.statements[0] == ("LOCK TABLE athlete_stats IN EXCLUSIVE MODE", None)
+    assert transaction.statements[1][0].startswith("DELETE FROM athlete_stats")
@@ -0,0 +1,15 @@
+import asyncio
+
+from app.repositories import best_results as best_results_repository
+
+
+def test_best_results_refresh_locks_athletes_before_replacing_rows(monkeypatch, fake_transaction):
+    transaction = fake_transaction
+    monkeypatch.setattr(best_results_repository, "in_transaction", lambda: transaction)
+
+    asyncio.run(best_results_repository.refresh_best_results([7, 3, 7]))
+
+    (lock_sql, lock_params), (delete_sql, _), (insert_sql, _) = transaction.statements
+    assert "pg_advisory_xact_lock" in lock_sql and lock_params[-1] == [3, 7]
+    assert delete_sql.startswith("DELETE FROM best_results")
+    assert insert_sql.startswith("INSERT INTO best_results")
@@ -0,0 +1,124 @@
+import asyncio
+import datetime
+import pickle
+import time
+import zlib
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.results.top import TopResponse
+from app.shared.cache.codecs import Codec, default_codec
+from app.shared.cache.local import MISSING, LocalCache
+from app.shared.cache.redis_compressed import RedisCachePickleCompressed
+from app.shared.cache.responses import render_json
+
+
+def test_get_or_compute_runs_single_flight(fake_redis):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"rows": [1, 2, 3]}
+
+    async def main():
+        cache = RedisCachePickleCompressed(fake_redis)
+        return await asyncio.gather(*(
+            cache.get_or_compute("top_results:test", compute, expire_seconds=60)
+            for _ in range(10)
+        ))
+
+    values = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(value == {"rows": [1, 2, 3]} for value in values)
+
+
+def test_get_or_compute_survives_cancelled_leader(fake_redis):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def main():
+        cache = RedisCachePickleCompressed(fake_redis)
+        leader = asyncio.create_task(cache.get_or_compute("top_results:cancel", compute, expire_seconds=60))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("top_results:cancel", compute, expire_seconds=60))
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        return await waiter, leader.cancelled()
+
+    assert asyncio.run(main()) == ("value", True)
+    assert len(calls) == 1
+
+
+def test_get_or_compute_serves_stale_value_while_refreshing(monkeypatch, fake_redis):
+    redis = fake_redis
+    versions = iter(["old", "new"])
+
+    async def compute():
+        return next(versions)
+
+    async def main():
+        cache = RedisCachePickleCompressed(redis)
+        first = await cache.get_or_compute("sitemap", compute, expire_seconds=10, stale_seconds=60)
+
+        now = time.time()
+        monkeypatch.setattr("app.shared.cache.redis_compressed.time.time", lambda: now + 30)
+        stale = await cache.get_or_compute("sitemap", compute, expire_seconds=10, stale_seconds=60)
+        await asyncio.gather(*RedisCachePickleCompressed._refreshing.values())
+        fresh = await cache.get_or_compute("sitemap", compute, expire_seconds=10, stale_seconds=60)
+        return first, stale, fresh
+
+    assert asyncio.run(main()) == ("old", "old", "new")
+
+
+def test_local_cache_drops_entries_by_tag_and_skips_racing_writes():
+    cache = LocalCache(max_entries=2)
+    cache.set("top:1", [1], ["event:SURFACE:50"])
+    cache.set("top:2", [2], ["event:BIFINS:100"])
+
+    versions = cache.versions(["event:BIFINS:100"])
+    cache.invalidate_tags(["event:BIFINS:100"])
+    cache.set("top:2", ["stale"], ["event:BIFINS:100"], versions)
+
+    assert cache.get("top:1") == [1]
+    assert cache.get("top:2") is MISSING
+
+    cache.set("top:3", [3], [])
+    cache.set("top:4", [4], [])
+    assert cache.get("top:1") is MISSING
+
+
+def test_codec_header_round_trip_and_legacy_values():
+    value = {"rows": [1, 2], "time": datetime.time(0, 0, 21, 500000)}
+    encoded = Codec("pickle", "none").encode(value)
+
+    assert encoded[:1] == b"C"
+    assert Codec.decode(encoded) == value
+    assert Codec.decode(zlib.compress(pickle.dumps(value))) == value
+    assert Codec.decode(Codec("raw", "zlib").encode(b'{"a":1}')) == b'{"a":1}'
+
+
+def test_unavailable_codec_is_rejected():
+    with pytest.raises(ValueError, match="serializer 'no-such-serializer'"):
+        Codec("no-such-serializer", "zlib")
+    with pytest.raises(ValueError, match="compression 'no-such-compression'"):
+        Codec("pickle", "no-such-compression")
+
+
+def test_default_codec_follows_settings(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_SERIALIZER", "pickle")
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION", "none")
+
+    assert (default_codec().serializer, default_codec().compression) == ("pickle", "none")
+
+
+def test_render_json_validates_like_response_model():
+    body = render_json(TopResponse, {"results": [], "next_cursor": None})
+
+    assert body == b'{"results":[],"next_cursor":null}'
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import asyncio
+
+import pytest
+
+from app.services import data_changes
+from app.services.data_changes import ResultChangeSet
+
+
+def test_result_change_set_collects_athletes_competitions_and_events():
+    changes = ResultChangeSet.from_results([
+        SimpleNamespace(athlete_id=1, competition_id=10, stroke="SURFACE", distance=50),
+        SimpleNamespace(athlete_id=2, competition_id=10, stroke="BIFINS", distance=100),
+    ])
+
+    assert changes.athlete_ids == {1, 2}
+    assert changes.competition_ids == {10}
+    assert changes.events == {("SURFACE", 50), ("BIFINS", 100)}
+    assert not ResultChangeSet()
+
+
+def test_result_change_set_cache_tags():
+    changes = ResultChangeSet.from_results([
+        SimpleNamespace(athlete_id=1, competition_id=10, stroke="SURFACE", distance=50),
+    ])
+
+    assert changes.cache_tags() == {
+        "athlete:1", "competition:10", "event:SURFACE:50", "event:*", "sitemap",
+        "sitemap:athletes-0", "sitemap:events-0",
+    }
+
+
+@pytest.fixture
+def data_change_calls(monkeypatch):
+    calls = {}
+
+    async def record(name, *args):
+        calls[name] = args
+
+    for name in ("refresh_best_results", "refresh_athlete_stats", "refresh_last_modified",
+                 "invalidate_leaderboards", "bump_tags", "queue_performances_warmup",
+                 "sync_athlete_autocomplete"):
+        monkeypatch.setattr(data_changes, name, lambda *args, name=name: record(name, *args))
+    monkeypatch.setattr(data_changes, "mark_ratings_dirty", lambda *args: record("mark", *args))
+    monkeypatch.setattr(data_changes, "delete_ratings", lambda *args: record("delete", *args))
+    monkeypatch.setattr(data_changes, "schedule_ratings_refresh", lambda: None)
+    monkeypatch.setattr(data_changes, "schedule_performances_warmup", lambda: None)
+    return calls
+
+
+def test_removed_athlete_marks_partitions_from_snapshot_and_drops_ratings(data_change_calls):
+    calls = data_change_calls
+    profile = {"id": 5, "gender": "F", "birth_year": "2010"}
+    changes = ResultChangeSet(
+        athlete_ids={5}, events={("SURFACE", 50)},
+        athletes={5: profile}, removed_athlete_ids={5},
+    )
+    asyncio.run(data_changes.on_results_changed(changes))
+
+    assert list(calls["mark"][1]) == [profile]
+    assert calls["delete"][1] == {5}
+    assert calls["sync_athlete_autocomplete"][1] == {5}
+
+
+def test_athlete_update_marks_previous_and_current_partitions(monkeypatch, data_change_calls):
+    calls = data_change_calls
+    before = {"id": 5, "gender": "F", "birth_year": "2010"}
+    after = {"id": 5, "gender": "M", "birth_year": "2010"}
+
+    async def collect_changes(athlete_ids):
+        return ResultChangeSet(athlete_ids=set(athlete_ids), events={("SURFACE", 50)})
+
+    async def profiles(athlete_ids):
+        return {5: after}
+
+    monkeypatch.setattr(data_changes, "collect_athlete_changes", collect_changes)
+    monkeypatch.setattr(data_changes, "collect_athlete_profiles", profiles)
+    asyncio.run(data_changes.on_athletes_changed([5], {5: before, 6: before}))
+
+    # спортсмен уходит из женской партиции и попадает в мужскую
+    assert list(calls["mark"][1]) == [after, before]
+    assert calls["delete"][1] == set()
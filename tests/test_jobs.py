@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+from app.jobs import manager
+
+
+def test_debounced_jobs_keep_pending_run_and_skip_jobstore(monkeypatch):
+    added = []
+    monkeypatch.setattr(manager.scheduler, "add_job", lambda func, **kwargs: added.append(kwargs))
+    monkeypatch.setattr(manager, "_pending_runs", {})
+
+    manager.schedule_ratings_refresh()
+    manager.schedule_ratings_refresh()
+    manager.schedule_performances_warmup()
+    manager.schedule_performances_warmup()
+
+    # повторные вызовы не двигают запуск и не пишут в jobstore
+    assert [kwargs["id"] for kwargs in added] == ["ratings_delta_task", "performances_warm_task"]
+    first_run = added[0]["run_date"]
+    assert manager._pending_runs["ratings_delta_task"] == first_run
+
+    # после срока запуска следующая запись ставит задачу заново
+    manager._pending_runs["ratings_delta_task"] = datetime.now() - timedelta(seconds=1)
+    manager.schedule_ratings_refresh()
+    assert added[-1]["id"] == "ratings_delta_task" and added[-1]["run_date"] > first_run
@@ -0,0 +1,22 @@
+from datetime import time
+
+from app.repositories.leaderboards import match_leaderboard, time_to_centiseconds
+
+
+def test_leaderboard_snapshot_matches_category_requests():
+    key = match_leaderboard(stroke="SURFACE", distance=50, gender="F", min_age=10, max_age=11)
+
+    assert key is not None
+    assert key.category == "young"
+    assert key.season is None
+    assert key.name == "leaderboard:global:SURFACE:50:F:young"
+
+
+def test_leaderboard_snapshot_is_skipped_for_custom_filters():
+    assert match_leaderboard(stroke="SURFACE", distance=50, gender="F", min_age=10, max_age=12) is None
+    assert match_leaderboard(stroke="SURFACE", distance=50, gender="F", courses=["LCM"]) is None
+    assert match_leaderboard(stroke="SURFACE", distance=50) is None
+
+
+def test_time_to_centiseconds():
+    assert time_to_centiseconds(time(0, 1, 2, 340000)) == 6234
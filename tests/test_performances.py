@@ -0,0 +1,46 @@
+from datetime import time, timezone
+
+import asyncio
+
+from app.repositories import performances
+from app.repositories.performances import build_performances
+from tests.bench_top_rows import make_row
+
+
+def test_performances_group_by_competition_and_mark_bests_once():
+    rows = [make_row(1), make_row(2), make_row(3)]
+    rows[1]["result_resolved_time"] = time(0, 0, 20, 900000, tzinfo=timezone.utc)
+    rows[2].update(competition_id=11, result_competition_id=11)
+
+    document = build_performances(1001, rows)
+
+    assert [item["competition"]["id"] for item in document["results"]] == [10, 11]
+    assert [
+        [performance["best"] for performance in item["performances"]]
+        for item in document["results"]
+    ] == [[False, True], [False]]
+    assert document["results"][0]["performances"][1]["resolved_time"] == "00:20,90"
+    assert build_performances(5, [{"athlete_id": 5, "result_id": None}]) == {"id": 5, "results": []}
+
+
+def test_performances_warmup_is_queued_and_drained_by_background_task(monkeypatch, fake_set_redis):
+    warmed = []
+
+    async def response(redis, athlete_id):
+        warmed.append(athlete_id)
+
+    monkeypatch.setattr(performances, "athlete_performances_response", response)
+    redis = fake_set_redis
+
+    async def scenario():
+        assert not await performances.queue_performances_warmup(redis, range(performances.PERFORMANCES_WARM_LIMIT + 1))
+        assert await performances.queue_performances_warmup(redis, [7, 3])
+        assert await performances.queue_performances_warmup(redis, [3, 9])
+        # запись только ставит в очередь, прогревает фоновая задача
+        assert warmed == []
+        await performances.warm_queued_performances(redis)
+        await performances.warm_queued_performances(redis)
+
+    asyncio.run(scenario())
+    assert warmed == [3, 7, 9]
+    assert performances.PERFORMANCES_WARM_QUEUE_KEY not in redis.sets
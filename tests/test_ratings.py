@@ -0,0 +1,68 @@
+from datetime import date
+
+import asyncio
+
+from app.repositories.ratings import (_pop_dirty, category_for_birth_year, mark_ratings_dirty,
+                                     rating_update)
+from app.repositories.sa.ratings import GLOBAL_SCOPE, SEASON_SCOPE, build_ratings_query
+from app.repositories.sa.utils import compile_query_with_literals
+from tests.bench_top_rows import make_row
+
+
+def test_ratings_query_ranks_both_scopes_in_one_statement():
+    sql = compile_query_with_literals(build_ratings_query(current_year=2025, current_season=2024))
+
+    assert sql.count("UNION ALL") == 1
+    assert "best_results.season = 2024" in sql
+    assert "absolute_row_num" in sql
+    assert "ORDER BY ratings.athlete_id" in sql
+
+
+def test_category_for_birth_year_matches_sql_categories():
+    assert category_for_birth_year("2014", 2025) == "young"
+    assert category_for_birth_year(1950, 2025) == "legends"
+    assert category_for_birth_year("unknown", 2025) is None
+
+
+def test_ratings_query_can_be_limited_to_partitions():
+    sql = compile_query_with_literals(build_ratings_query(
+        current_year=2025, current_season=2024, partitions=[("SURFACE", 50, "F")]))
+
+    assert "athletes.gender = 'F'" in sql
+    assert "best_results.stroke = 'SURFACE'" in sql
+
+
+def _dropped_events(fields: dict, key: str) -> list:
+    expression = fields[f"rankings.{key}"]["$let"]["vars"]["merged"]["$concatArrays"][0]
+    return expression["$filter"]["cond"]["$not"][0]["$in"][1]["$literal"]
+
+
+def test_ratings_delta_keeps_other_events_of_dirty_athlete(fake_set_redis):
+    redis = fake_set_redis
+    current_year = date.today().year
+    athlete_a = {"id": 1, "gender": "M", "birth_year": str(current_year - 14)}
+    athlete_b = {"id": 2, "gender": "F", "birth_year": str(current_year - 30)}
+    # две записи в одном окне: A по SURFACE 50, B по BIFINS 100
+    asyncio.run(mark_ratings_dirty(redis, [athlete_a], [("SURFACE", 50)]))
+    asyncio.run(mark_ratings_dirty(redis, [athlete_b], [("BIFINS", 100)]))
+    partitions, dirty_athletes = asyncio.run(_pop_dirty(redis))
+
+    assert dirty_athletes == {1: {("SURFACE", 50)}, 2: {("BIFINS", 100)}}
+    assert ("SURFACE", 50, "M", "cadet") in partitions
+    assert ("BIFINS", 100, "F", "adult") in partitions
+
+    row = make_row(0) | {
+        "athlete_id": 1, "athlete_birth_year": athlete_a["birth_year"], "scope": SEASON_SCOPE,
+        "absolute_row_num": 3, "category": "cadet", "category_row_num": 1,
+    }
+    fields, has_entries = rating_update(partitions, [row], dirty_athletes[1])
+
+    assert has_entries
+    # BIFINS 100 у A не пересчитывался и остаётся в каждом ключе
+    assert _dropped_events(fields, f"{SEASON_SCOPE}:absolute") == [["SURFACE", 50]]
+    assert _dropped_events(fields, f"{SEASON_SCOPE}:cadet") == [["SURFACE", 50]]
+    assert _dropped_events(fields, f"{GLOBAL_SCOPE}:adult") == [["SURFACE", 50]]
+
+    fields, has_entries = rating_update(partitions, [], dirty_athletes[2])
+    assert not has_entries
+    assert _dropped_events(fields, f"{GLOBAL_SCOPE}:absolute") == [["BIFINS", 100]]
@@ -0,0 +1,31 @@
+from datetime import time, timezone
+
+from app.repositories.sa.result_ingestion import STAGING_COLUMNS, build_ingest_results_query
+from app.repositories.sa.utils import compile_query_cached
+from app.schemas.results.result import BulkCreateResult
+from app.services.result_ingestion import staging_records
+
+
+def test_result_ingestion_stages_rows_for_copy_and_inserts_once():
+    items = [
+        BulkCreateResult(competition_id=10, athlete_id=1, results=[
+            {"stroke": "SURFACE", "distance": 50, "result": "21,50", "metadata": {"lane": 4}},
+            {"stroke": "SURFACE", "distance": 100, "final": "1:01,07"},
+        ]),
+        BulkCreateResult(competition_id=10, athlete_id=2, results=[{"stroke": "APNEA", "distance": 50}]),
+    ]
+
+    records, owners = staging_records(items)
+
+    assert owners == [0, 0, 1]
+    assert [len(record) for record in records] == [len(STAGING_COLUMNS)] * 3
+    first = dict(zip(STAGING_COLUMNS, records[0]))
+    assert first["row_no"] == 0 and first["athlete_id"] == 1
+    assert first["result"] == time(0, 0, 21, 500000, tzinfo=timezone.utc)
+    assert first["metadata"] == '{"lane": 4}'
+    assert dict(zip(STAGING_COLUMNS, records[1]))["final"] == time(0, 1, 1, 70000, tzinfo=timezone.utc)
+
+    sql, params = compile_query_cached(build_ingest_results_query())
+    assert sql.count("INSERT INTO results") == 1
+    assert "LEFT OUTER JOIN inserted ON inserted.id = result_staging.result_id" in sql
+    assert params == []
@@ -0,0 +1,92 @@
+import asyncio
+import datetime
+import xml.etree.ElementTree as ET
+
+from app.repositories.sa.content_last_modified import build_insert_last_modified_query
+from app.repositories.sa.sitemap import build_last_modified_query, build_shard_summary_query
+from app.repositories.sa.utils import compile_query_cached
+from app.shared.cache.local import local_cache
+from app.shared.cache.tags import GENERATIONS_KEY
+from app.shared.utils import sitemap
+
+
+def test_sitemap_shard_is_rebuilt_only_when_fingerprint_changes(monkeypatch, fake_redis):
+    shards = [{"name": "athletes-0", "lastmod": "2026-10-01", "fingerprint": "a"}]
+    renders = []
+
+    async def fake_shards():
+        return shards
+
+    async def fake_items(section, shard, shard_size):
+        renders.append((section, shard))
+        for athlete_id in (1, 2):
+            yield {"id": athlete_id, "last_update": datetime.date(2026, 10, athlete_id)}
+
+    monkeypatch.setattr(sitemap, "client", fake_redis)
+    monkeypatch.setattr(sitemap, "get_sitemap_shards", fake_shards)
+    monkeypatch.setattr(sitemap, "iter_shard_items", fake_items)
+
+    async def main():
+        first = await sitemap.generate_sitemap_shard("athletes-0")
+        again = await sitemap.generate_sitemap_shard("athletes-0")
+        shards[0] = {**shards[0], "fingerprint": "b"}
+        changed = await sitemap.generate_sitemap_shard("athletes-0")
+        missing = await sitemap.generate_sitemap_shard("athletes-1")
+        return first, again, changed, missing
+
+    first, again, changed, missing = asyncio.run(main())
+
+    assert first == again == changed and missing is None
+    assert renders == [("athletes", 0), ("athletes", 0)]
+    ns = {"s": sitemap.SITEMAP_NS}
+    urls = ET.fromstring(first).findall("s:url", ns)
+    assert [url.findtext("s:loc", namespaces=ns) for url in urls] == [
+        "https://fincubes.ru/user/1", "https://fincubes.ru/user/2",
+    ]
+    assert urls[1].findtext("s:lastmod", namespaces=ns) == "2026-10-02"
+
+
+def test_sitemap_reads_last_modified_projection_without_results_join():
+    insert_sql, insert_params = compile_query_cached(
+        build_insert_last_modified_query("competition", [10]))
+    summary_sql, _ = compile_query_cached(
+        build_shard_summary_query(build_last_modified_query("athlete"), 40000))
+    shard_sql, shard_params = compile_query_cached(
+        build_last_modified_query("athlete", (40000, 80000)))
+
+    assert "LEFT OUTER JOIN results ON competitions.id = results.competition_id" in insert_sql
+    assert insert_params == ["competition", [10]]
+    assert "ON CONFLICT (entity_type, entity_id) DO UPDATE" in insert_sql
+    assert "results" not in summary_sql and "results" not in shard_sql
+    assert shard_params == ["athlete", 40000, 80000]
+
+
+def test_sitemap_recomputes_fingerprint_only_for_touched_shard(monkeypatch, fake_redis):
+    redis = fake_redis
+    summaries = []
+
+    async def fake_numbers(section, shard_size):
+        return [0, 1] if section == "athletes" else []
+
+    async def fake_summary(section, shard, shard_size):
+        summaries.append(shard)
+        return {"last_update": datetime.date(2026, 10, 1), "fingerprint": f"{shard}:{len(summaries)}"}
+
+    monkeypatch.setattr(sitemap, "client", redis)
+    monkeypatch.setattr(sitemap, "get_shard_numbers", fake_numbers)
+    monkeypatch.setattr(sitemap, "get_shard_summary", fake_summary)
+    local_cache.clear()
+
+    first = asyncio.run(sitemap._list_shards())
+    asyncio.run(sitemap._list_shards())
+    assert summaries == [0, 1]
+
+    # запись спортсмена 40001 сбрасывает только шард athletes-1
+    tag = sitemap.sitemap_shard_tag("athletes", 40001)
+    redis.data[GENERATIONS_KEY] = {tag: 1}
+    local_cache.invalidate_tags([tag])
+    shards = asyncio.run(sitemap._list_shards())
+
+    assert summaries == [0, 1, 1]
+    assert [shard["name"] for shard in shards] == ["pages", "athletes-0", "athletes-1"]
+    assert shards[1] == first[1] and shards[2]["fingerprint"] == "1:3"
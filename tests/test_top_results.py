@@ -0,0 +1,100 @@
+from datetime import date, time
+
+import asyncio
+
+import pytest
+
+from app.core.errors import APIError
+from app.repositories.get_top_results import get_top_results
+from app.repositories.random_top import build_availability, eligible_combinations
+from app.repositories.sa.top_results import (build_top_results_query, get_current_season,
+                                             supports_top_cursor)
+from app.repositories.sa.utils import compile_query_cached, compile_query_with_literals
+from app.schemas.results.top import (best_full_result_decoder, decode_top_cursor,
+                                     encode_top_cursor, parse_best_full_result)
+from app.shared.utils.flexible_time import FlexibleTime
+from tests.bench_top_rows import make_row
+
+
+def test_current_season_starts_in_september():
+    assert get_current_season(date(2025, 8, 31)) == 2024
+    assert get_current_season(date(2025, 9, 1)) == 2025
+
+
+def test_season_leaderboard_reads_best_results_table():
+    sql = compile_query_with_literals(
+        build_top_results_query(stroke="SURFACE", distance=50, gender="M", season=2024, limit=3)
+    )
+
+    assert "FROM best_results" in sql
+    assert "best_results.season = 2024" in sql
+    assert "GROUP BY" not in sql
+
+
+def test_date_range_leaderboard_falls_back_to_results_aggregation():
+    sql = compile_query_with_literals(
+        build_top_results_query(stroke="SURFACE", distance=50, year=2024)
+    )
+
+    assert "GROUP BY results.athlete_id" in sql
+    assert "best_results.season" not in sql
+
+
+def test_top_cursor_round_trip_and_keyset_query():
+    cursor = encode_top_cursor(
+        {"row_num": 12, "result_resolved_time": time(0, 0, 21, 500000), "result_id": 15})
+    after = decode_top_cursor(cursor)
+    assert after == (12, time(0, 0, 21, 500000), 15)
+
+    sql = compile_query_with_literals(build_top_results_query(
+        stroke="SURFACE", distance=50, gender="M", limit=10, after=after))
+    # отсечение курсором стоит в том же WHERE, что и фильтры, — до оконной функции
+    ranked = sql.split("FROM results")[-1]
+    assert "(results.resolved_time, results.id) > ('00:00:21.500000', 15)" in ranked
+    assert "dense_rank() OVER" in sql and "+ 12) - CASE WHEN" in sql
+    assert "OFFSET" not in sql and "ranked" not in sql
+
+    assert supports_top_cursor("SURFACE", 50, "M")
+    assert not supports_top_cursor("SURFACE", 50, None)
+    with pytest.raises(APIError):
+        asyncio.run(get_top_results(stroke="SURFACE", distance=50, limit=10, after=after))
+
+
+def test_invalid_top_cursor_is_rejected():
+    with pytest.raises(APIError):
+        decode_top_cursor("not-a-cursor")
+
+
+def test_compiled_sql_is_shared_between_filter_values():
+    first_sql, first_params = compile_query_cached(build_top_results_query(
+        stroke="SURFACE", distance=50, gender="M", courses=["LCM"], limit=3))
+    second_sql, second_params = compile_query_cached(build_top_results_query(
+        stroke="BIFINS", distance=100, gender="F", courses=["SCM", "LCM"], limit=10))
+
+    assert first_sql == second_sql
+    assert "ANY ($4::VARCHAR[])" in first_sql
+    assert second_params == ["BIFINS", 100, "F", ["SCM", "LCM"], 10]
+
+
+def test_row_decoder_matches_orm_serialization():
+    rows = [make_row(1), make_row(2)]
+    rows[1]["result_result"] = time(1, 2, 3, 450000)
+
+    assert best_full_result_decoder.decode_many(rows) == [
+        parse_best_full_result(row).model_dump(mode="json") for row in rows
+    ]
+    assert FlexibleTime.validate("1:02:03,45") == time(1, 2, 3, 450000)
+
+
+def test_top_availability_adds_absolute_category():
+    availability = build_availability([
+        {"stroke": "SURFACE", "distance": 50, "gender": "M", "category": "young", "results_count": 2},
+        {"stroke": "SURFACE", "distance": 50, "gender": "M", "category": None, "results_count": 1},
+        {"stroke": "SURFACE", "distance": 50, "gender": "M", "category": "adult", "results_count": 3},
+    ])
+
+    assert availability[("SURFACE", 50, "M", "absolute")] == 6
+    assert {
+        (style["stroke"], style["distance"], gender, category["id"])
+        for style, gender, category in eligible_combinations(availability)
+    } == {("SURFACE", 50, "M", "absolute"), ("SURFACE", 50, "M", "adult")}